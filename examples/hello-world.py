@@ -16,38 +16,13 @@ if __name__ == '__main__':
     text = 'Hello World !'
     fontsize = 48
     face.set_char_size( fontsize*64 )
-    slot = face.glyph
 
-    # First pass to compute bbox
-    width = 0
-    top = -fontsize #The distance from baseline to the top row of the bbox
-    bot = fontsize #The distance from baseline to the bottom row of the bbox (may be negative)
-    previous = 0
-    for i,c in enumerate(text):
-        face.load_char(c)
-        bitmap = slot.bitmap
-        top = max(top, slot.bitmap_top)
-        bot = min(bot, slot.bitmap_top - bitmap.rows)
-        kerning = face.get_kerning(previous, c)
-        width += (slot.advance.x >> 6) + (kerning.x >> 6)
-        previous = c
-
-    height = top - bot
+    # Measure the text to size the image, then render it in place
+    ink, logical = face.measure_text(text)
+    width = (ink.xMax - ink.xMin) >> 6
+    height = (ink.yMax - ink.yMin) >> 6
     Z = numpy.zeros((height,width), dtype=numpy.ubyte)
-
-    # Second pass for actual rendering
-    x, y = 0, 0
-    previous = 0
-    for c in text:
-        face.load_char(c)
-        bitmap = slot.bitmap
-        w,h = bitmap.width, bitmap.rows
-        y = top - slot.bitmap_top
-        kerning = face.get_kerning(previous, c)
-        x += (kerning.x >> 6)
-        Z[y:y+h,x+left:x+left+w] += numpy.array(bitmap.buffer, dtype='ubyte').reshape(h,w)
-        x += (slot.advance.x >> 6)
-        previous = c
+    render_text(face, text, Z, origin=(-ink.xMin >> 6, ink.yMax >> 6))
 
     plt.figure(figsize=(10, 10*Z.shape[0]/float(Z.shape[1])))
     plt.imshow(Z, interpolation='nearest', origin='upper', cmap=plt.cm.gray)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+#
+#  FreeType high-level python API - Copyright 2011-2015 Nicolas P. Rougier
+#  Distributed under the terms of the new BSD license.
+#
+# -----------------------------------------------------------------------------
+'''
+Import time benchmark
+
+Import freetype in fresh interpreters (with -X importtime) and report the
+median import time, as well as the modules that take the most time.
+
+Usage: import-time.py [runs]
+'''
+import os
+import statistics
+import subprocess
+import sys
+
+
+def import_times(statement):
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    output = subprocess.run([sys.executable, '-X', 'importtime', '-c',
+                             statement], env=env, stderr=subprocess.PIPE,
+                            check=True, universal_newlines=True).stderr
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_time, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(self_time), int(cumulative))
+    return times
+
+
+if __name__ == '__main__':
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    statement = 'import freetype'
+
+    import_times(statement)  # warm up, and write bytecode caches
+    samples = [import_times(statement) for i in range(runs)]
+    total = statistics.median(times['freetype'][1] for times in samples)
+    print('%s: %.1f ms (median of %d runs)' % (statement, total/1000., runs))
+
+    print('\nSlowest modules (median self time):')
+    names = set().union(*samples)
+    self_times = dict((name, statistics.median(times.get(name, (0, 0))[0]
+                                               for times in samples))
+                      for name in names)
+    for name in sorted(names, key=self_times.get, reverse=True)[:10]:
+        print('  %6.1f ms  %s' % (self_times[name]/1000., name))
@@ -15,17 +15,16 @@ import math
 import numpy as np
 import OpenGL.GL as gl
 from freetype import *
+from freetype.atlas import SkylinePacker
 
 
 class TextureAtlas:
     '''
     Group multiple small data regions into a larger texture.
 
-    The algorithm is based on the article by Jukka Jylänki : "A Thousand Ways
-    to Pack the Bin - A Practical Approach to Two-Dimensional Rectangle Bin
-    Packing", February 27, 2010. More precisely, this is an implementation of
-    the Skyline Bottom-Left algorithm based on C++ sources provided by Jukka
-    Jylänki at: http://clb.demon.fi/files/RectangleBinPack/
+    Regions are allocated with freetype.atlas.SkylinePacker (Skyline
+    Bottom-Left algorithm). See freetype.atlas.GlyphAtlas for an atlas that
+    does not depend on OpenGL.
 
     Example usage:
     --------------
@@ -55,7 +54,7 @@ class TextureAtlas:
         self.width  = int(math.pow(2, int(math.log(width, 2) + 0.5)))
         self.height = int(math.pow(2, int(math.log(height, 2) + 0.5)))
         self.depth  = depth
-        self.nodes  = [ (0,0,self.width), ]
+        self.packer = SkylinePacker(self.width, self.height)
         self.data   = np.zeros((self.height, self.width, self.depth),
                                dtype=np.ubyte)
         self.texid  = 0
@@ -128,102 +127,11 @@ class TextureAtlas:
             A newly allocated region as (x,y,width,height) or (-1,-1,0,0)
         '''
 
-        best_height = sys.maxsize
-        best_index = -1
-        best_width = sys.maxsize
-        region = 0, 0, width, height
-
-        for i in range(len(self.nodes)):
-            y = self.fit(i, width, height)
-            if y >= 0:
-                node = self.nodes[i]
-                if (y+height < best_height or
-                    (y+height == best_height and node[2] < best_width)):
-                    best_height = y+height
-                    best_index = i
-                    best_width = node[2]
-                    region = node[0], y, width, height
-
-        if best_index == -1:
+        position = self.packer.pack(width, height)
+        if position is None:
             return -1,-1,0,0
-
-        node = region[0], region[1]+height, width
-        self.nodes.insert(best_index, node)
-
-        i = best_index+1
-        while i < len(self.nodes):
-            node = self.nodes[i]
-            prev_node = self.nodes[i-1]
-            if node[0] < prev_node[0]+prev_node[2]:
-                shrink = prev_node[0]+prev_node[2] - node[0]
-                x,y,w = self.nodes[i]
-                self.nodes[i] = x+shrink, y, w-shrink
-                if self.nodes[i][2] <= 0:
-                    del self.nodes[i]
-                    i -= 1
-                else:
-                    break
-            else:
-                break
-            i += 1
-
-        self.merge()
         self.used += width*height
-        return region
-
-
-
-    def fit(self, index, width, height):
-        '''
-        Test if region (width,height) fit into self.nodes[index]
-
-        Parameters
-        ----------
-
-        index : int
-            Index of the internal node to be tested
-
-        width : int
-            Width or the region to be tested
-
-        height : int
-            Height or the region to be tested
-
-        '''
-
-        node = self.nodes[index]
-        x,y = node[0], node[1]
-        width_left = width
-
-        if x+width > self.width:
-            return -1
-
-        i = index
-        while width_left > 0:
-            node = self.nodes[i]
-            y = max(y, node[1])
-            if y+height > self.height:
-                return -1
-            width_left -= node[2]
-            i += 1
-        return y
-
-
-
-    def merge(self):
-        '''
-        Merge nodes
-        '''
-
-        i = 0
-        while i < len(self.nodes)-1:
-            node = self.nodes[i]
-            next_node = self.nodes[i+1]
-            if node[1] == next_node[1]:
-                self.nodes[i] = node[0], node[1], node[2]+next_node[2]
-                del self.nodes[i+1]
-            else:
-                i += 1
+        return position[0], position[1], width, height
 
 
 class TextureFont:
@@ -15,13 +15,27 @@ Note: C Library will be searched using the ctypes.util.find_library. However,
       this search might fail. In such a case (or for other reasons), you may
       have to specify an explicit path below.
 '''
+import copy
 import io
+import mmap
+import os
 import sys
+import threading
+import weakref
+from array import array
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+from operator import attrgetter
 from ctypes import *
-import ctypes.util
+import ctypes
 import struct
 
-from freetype.raw import *
+from freetype import raw
+# Not "from freetype.raw import *", which would import the TT_* tables as
+# well: they are forwarded on first use, see __getattr__ below
+globals().update((name, value) for name, value in vars(raw).items()
+                 if not name.startswith('_'))
+from freetype import ft_enums
 
 # Hack to get unicode class in python3
 PY3 = sys.version_info[0] == 3
@@ -34,7 +48,15 @@ def unmake_tag(i):
     b = struct.pack('>I', i)
     return b.decode('ascii', errors='replace')
 
+def _array_from_pointer(typecode, pointer, count):
+    # Copy 'count' items at 'pointer' into a packed array.array in one go
+    data = array(typecode)
+    if count > 0:
+        data.frombytes(string_at(pointer, count*data.itemsize))
+    return data
+
 _handle = None
+_library = None
 
 
 FT_Library_filename = filename
@@ -48,24 +70,18 @@ class _FT_Library_Wrapper(FT_Library):
     _ft_done_freetype = FT_Done_FreeType
 
     def __del__(self):
-        # call FT_Done_FreeType
-        # This does not work properly (seg fault on sime system (OSX))
-        # self._ft_done_freetype(self)
+        # Calling FT_Done_FreeType here does not work properly (seg fault on
+        # some systems (OSX)), since the handle may be finalized after objects
+        # that still use it. Libraries are destroyed by Library.close instead,
+        # which closes the faces, glyphs, etc. of the library first.
         pass
-    
-
-def _init_freetype():
-    global _handle
 
-    _handle = _FT_Library_Wrapper()
-    error = FT_Init_FreeType( byref(_handle) )
 
-    if error: raise FT_Exception(error)
+def _init_freetype():
+    global _handle, _library
 
-    try:
-        set_lcd_filter( FT_LCD_FILTER_DEFAULT )
-    except:
-        pass
+    _library = Library()
+    _handle = _library._FT_Library
 
 # -----------------------------------------------------------------------------
 # High-level API of FreeType 2
@@ -82,16 +98,147 @@ def get_handle():
 
     return _handle
 
-def version():
+
+def shutdown():
+    '''
+    Destroy the global library (see Library.close), closing all the objects
+    that were created in it. A new global library is created the next time
+    one is needed.
+
+    Libraries created explicitly, including the ones of get_thread_library,
+    are not affected.
+    '''
+    global _handle, _library
+
+    library = _library
+    _handle = _library = None
+    if library is not None:
+        library.close()
+
+
+# Library objects by FT_Library address, to find the library of a glyph
+_libraries = weakref.WeakValueDictionary()
+
+class Library( object ):
+    '''
+    FT_Library wrapper.
+
+    A FreeType library instance. Each library is completely independent from
+    the others; it is the root of a set of objects like faces, sizes, glyph
+    slots, strokers, etc.
+
+    By default, all objects are created within the single library returned by
+    get_handle. FreeType objects of a given library must not be used
+    concurrently by several threads, so threads that create faces and render
+    glyphs in parallel should each use their own library: either create one
+    and pass it to Face, Stroker or CacheManager through their 'library'
+    argument, or use get_thread_library.
+
+    Objects created with a library keep a reference to it, so that the
+    library is only destroyed once all of them are gone. It can also be
+    destroyed explicitly with 'close', or by using the library as a context
+    manager.
+    '''
+
+    def __init__( self ):
+        '''
+        Create and initialize a new library instance.
+        '''
+        self._FT_Library = None
+        handle = _FT_Library_Wrapper()
+        error = FT_Init_FreeType( byref(handle) )
+        if error: raise FT_Exception( error )
+        self._FT_Library = handle
+        self._children = weakref.WeakSet()
+        _libraries[cast(handle, c_void_p).value] = self
+        try:
+            set_lcd_filter( FT_LCD_FILTER_DEFAULT, library=self )
+        except:
+            pass
+
+    def __del__( self ):
+        '''
+        Destroy library.
+        '''
+        # At interpreter exit, finalizers run in no particular order and
+        # FreeType objects may be torn down in an unsafe order (see
+        # _FT_Library_Wrapper): the process exit releases the library then.
+        # Use close() or a with block for deterministic destruction.
+        if FT_Done_FreeType is not None and not sys.is_finalizing():
+            self.close()
+
+    def __enter__( self ):
+        return self
+
+    def __exit__( self, exc_type, exc_value, traceback ):
+        self.close()
+
+    def _add_child( self, child ):
+        # Register an object that must be closed before the library is
+        self._children.add(child)
+
+    def close( self ):
+        '''
+        Destroy the library with FT_Done_FreeType. All the faces, glyphs,
+        strokers and cache managers created in the library are closed first,
+        and must not be used anymore. Closing a library twice is harmless.
+        '''
+        handle = self._FT_Library
+        if handle is None:
+            return
+        # Cache managers own faces of their own, destroy them first
+        children = sorted(list(self._children),
+                          key=lambda child: not isinstance(child, CacheManager))
+        for child in children:
+            child.close()
+        self._FT_Library = None
+        _libraries.pop(cast(handle, c_void_p).value, None)
+        FT_Done_FreeType( handle )
+
+    closed = property( lambda self: self._FT_Library is None,
+       doc = '''Whether the library has been destroyed.''')
+
+
+_thread_libraries = threading.local()
+
+def get_thread_library():
+    '''
+    Get the Library object of the calling thread, creating it on first use.
+    '''
+    library = getattr(_thread_libraries, 'library', None)
+    if library is None or library.closed:
+        library = _thread_libraries.library = Library()
+    return library
+
+
+def _get_library(library):
+    # Library object to create objects in, defaulting to the global one
+    if library is None:
+        get_handle()
+        return _library
+    return library
+
+
+def _get_library_handle(library):
+    # FT_Library handle of a Library object, defaulting to the global one
+    if library is None:
+        return get_handle()
+    return library._FT_Library
+
+
+def version( library=None ):
     '''
     Return the version of the FreeType library being used as a tuple of
     ( major version number, minor version number, patch version number )
+
+    :param library: An optional Library object. Defaults to the global
+                    library.
     '''
     amajor = FT_Int()
     aminor = FT_Int()
     apatch = FT_Int()
 
-    library = get_handle()
+    library = _get_library_handle(library)
     FT_Library_Version(library, byref(amajor), byref(aminor), byref(apatch))
     return (amajor.value, aminor.value, apatch.value)
 
@@ -99,7 +246,7 @@ def version():
 # -----------------------------------------------------------------------------
 #  Stand alone functions
 # -----------------------------------------------------------------------------
-def set_lcd_filter(filt):
+def set_lcd_filter(filt, library=None):
     '''
     This function is used to apply color filtering to LCD decimated bitmaps,
     like the ones used when calling FT_Render_Glyph with FT_RENDER_MODE_LCD or
@@ -130,14 +277,17 @@ def set_lcd_filter(filt):
 
     The bitmap offset values are adjusted correctly, so clients shouldn't need
     to modify their layout and glyph positioning code when enabling the filter.
+
+    The filter is set for the given Library object, or for the global library
+    if 'library' is None.
     '''
-    library = get_handle()
+    library = _get_library_handle(library)
     error = FT_Library_SetLcdFilter(library, filt)
     if error: raise FT_Exception(error)
 
 
 
-def set_lcd_filter_weights(a,b,c,d,e):
+def set_lcd_filter_weights(a,b,c,d,e,library=None):
     '''
     Use this function to override the filter weights selected by
     FT_Library_SetLcdFilter. By default, FreeType uses the quintuple (0x00,
@@ -147,10 +297,13 @@ def set_lcd_filter_weights(a,b,c,d,e):
     **Note**
 
     Only available if version > 2.4.0
+
+    The weights are set for the given Library object, or for the global
+    library if 'library' is None.
     '''
     if version()>=(2,4,0):
-        library = get_handle()
-        weights = FT_Char(5)(a,b,c,d,e)
+        library = _get_library_handle(library)
+        weights = (FT_Byte * 5)(a,b,c,d,e)
         error = FT_Library_SetLcdFilterWeights(library, weights)
         if error: raise FT_Exception(error)
     else:
@@ -158,6 +311,89 @@ def set_lcd_filter_weights(a,b,c,d,e):
               'set_lcd_filter_weights require freetype > 2.4.0')
 
 
+def _property_args(library, module_name, property_name):
+    # FT_Library handle and byte string names for FT_Property_Get/Set
+    if version()<(2,7,0):
+        raise RuntimeError('module properties require freetype >= 2.7.0')
+    if not isinstance(module_name, bytes):
+        module_name = module_name.encode('ascii')
+    if not isinstance(property_name, bytes):
+        property_name = property_name.encode('ascii')
+    return _get_library_handle(library), module_name, property_name
+
+
+def set_property(module_name, property_name, value, library=None):
+    '''
+    Set a property of a FreeType module (driver, renderer, hinter) with
+    FT_Property_Set, e.g. set_property('sdf', 'spread', 16).
+
+    :param module_name: The name of the module ('truetype', 'cff', 'autofitter',
+                        'sdf', 'bsdf', ...).
+
+    :param property_name: The name of the property.
+
+    :param value: An integer, passed as an FT_Int, or any ctypes object, passed
+                  by reference as it is (for properties of another type, such
+                  as the FT_Bool 'overlaps' property of 'sdf').
+
+    **Note**
+
+    Only available if version >= 2.7.0
+
+    The property is set for the given Library object, or for the global
+    library if 'library' is None. It applies to all the faces of that library,
+    including the ones already open.
+    '''
+    library, module_name, property_name = _property_args(library, module_name,
+                                                          property_name)
+    if isinstance(value, int):
+        value = FT_Int(value)
+    error = FT_Property_Set(library, module_name, property_name, byref(value))
+    if error: raise FT_Exception(error)
+
+
+def get_property(module_name, property_name, ctype=FT_Int, library=None):
+    '''
+    Get the value of a property of a FreeType module with FT_Property_Get.
+    See set_property.
+
+    :param ctype: The ctypes type of the property.
+
+    :return: The value of the property, as a Python object for simple ctypes
+             types, or as the ctypes object otherwise.
+    '''
+    library, module_name, property_name = _property_args(library, module_name,
+                                                          property_name)
+    value = ctype()
+    error = FT_Property_Get(library, module_name, property_name, byref(value))
+    if error: raise FT_Exception(error)
+    return getattr(value, 'value', value)
+
+
+def set_sdf_spread(spread, library=None):
+    '''
+    Set the spread of the signed distance fields rendered with
+    FT_RENDER_MODE_SDF: the largest distance to the outline, in pixels, that
+    the field represents, on either side of it. The 256 levels of the field
+    cover -spread to +spread, and SDF bitmaps are larger than the glyph by the
+    spread on each side.
+
+    :param spread: An integer between 2 and 32. FreeType's default is 8.
+
+    **Note**
+
+    Only available if version >= 2.11.0
+
+    Both the 'sdf' (outlines) and 'bsdf' (bitmaps) renderers are configured,
+    for the given Library object, or for the global library if 'library' is
+    None.
+    '''
+    if version()<(2,11,0):
+        raise RuntimeError('signed distance fields require freetype >= 2.11.0')
+    for module_name in ('sdf', 'bsdf'):
+        set_property(module_name, 'spread', spread, library)
+
+
 def _encode_filename(filename):
     encoded = filename.encode(sys.getfilesystemencoding())
     if "?" not in filename and b"?" in encoded:
@@ -168,6 +404,131 @@ def _encode_filename(filename):
 
 
 
+# -----------------------------------------------------------------------------
+#  Shared font data
+# -----------------------------------------------------------------------------
+_font_blobs = weakref.WeakValueDictionary()
+_font_blobs_lock = threading.Lock()
+
+class FontBlob(object):
+    '''
+    Font file contents that can be shared by several faces.
+
+    Faces built on a FontBlob (by passing it to the Face constructor) borrow
+    its memory instead of holding their own copy of the font data, which is
+    useful when opening several faces of a collection, or the same font
+    several times.
+
+    Blobs obtained through 'open' and 'from_bytes' are kept in a process-wide
+    registry, keyed by path, modification time and size (or by content hash):
+    as long as one face (or any other reference) keeps a blob alive, requests
+    for the same font return the very same blob. The blob is released when
+    its last reference goes away.
+    '''
+
+    def __init__(self, data):
+        '''
+        Create a new FontBlob object, outside of the registry.
+
+        :param data: The font file contents, as bytes or as a copy-on-write
+                     mmap.mmap object.
+        '''
+        self.data = data
+        if isinstance(data, mmap.mmap):
+            # FreeType never writes to it, pages stay shared
+            self._buffer = (c_ubyte*len(data)).from_buffer(data)
+        else:
+            self._buffer = data
+        self.size = len(data)
+
+    @classmethod
+    def _lookup(cls, key, loader):
+        with _font_blobs_lock:
+            blob = _font_blobs.get(key)
+            if blob is None:
+                blob = cls(loader())
+                _font_blobs[key] = blob
+            return blob
+
+    @classmethod
+    def open(cls, path, use_mmap=False):
+        '''
+        Return the shared blob of a font file.
+
+        :param path: A path to the font file.
+
+        :param use_mmap: If True, the file is memory mapped instead of being
+                         read, so pages are only loaded when touched and are
+                         shared with other processes through the page cache.
+        '''
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        key = ('mmap' if use_mmap else 'file', path, stat.st_mtime, stat.st_size)
+
+        def load():
+            with open(path, mode="rb") as f:
+                if use_mmap:
+                    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+                return f.read()
+        return cls._lookup(key, load)
+
+    @classmethod
+    def from_bytes(cls, data):
+        '''
+        Return the shared blob holding the given font data. Identical data
+        (as per its SHA-256 hash) always maps to the same blob.
+
+        :param data: The font file contents, as bytes.
+        '''
+        import hashlib
+        key = ('bytes', hashlib.sha256(data).digest(), len(data))
+        return cls._lookup(key, lambda: bytes(data))
+
+    def __repr__(self):
+        return "<FontBlob {} bytes>".format(self.size)
+
+
+
+class _FT_Stream_Wrapper(object):
+    '''Python file object exposed to FreeType as a FT_Stream'''
+
+    def __init__(self, stream, close=False):
+        stream.seek(0, io.SEEK_END)
+        size = stream.tell()
+        stream.seek(0)
+        self._stream = stream
+        self._close = close
+        # Keep references to the callbacks, they are called from C code
+        self._read_func = FT_Stream_IoFunc(self._read)
+        self._close_func = FT_Stream_CloseFunc(self._on_close)
+        self._FT_Stream = FT_StreamRec()
+        self._FT_Stream.size = size
+        self._FT_Stream.read = self._read_func
+        self._FT_Stream.close = self._close_func
+
+    def _read(self, ft_stream, offset, buffer, count):
+        try:
+            self._stream.seek(offset)
+            if not count:
+                return 0
+            return self._stream.readinto(
+                (c_ubyte*count).from_address(buffer)) or 0
+        except Exception:
+            # a non-zero value signals a failed seek, 0 a failed read
+            return 0 if count else 1
+
+    def _on_close(self, ft_stream):
+        if self._close:
+            self._stream.close()
+
+    def open_args(self):
+        args = FT_Open_Args()
+        args.flags = FT_OPEN_STREAM
+        args.stream = addressof(self._FT_Stream)
+        return args
+
+
+
 # -----------------------------------------------------------------------------
 #  Direct wrapper (simple renaming)
 # -----------------------------------------------------------------------------
@@ -175,31 +536,100 @@ Vector = FT_Vector
 Matrix = FT_Matrix
 
 
+# -----------------------------------------------------------------------------
+# The TT_* enum tables are imported on first use, see freetype.ft_enums
+# -----------------------------------------------------------------------------
+def __getattr__(name):
+    if name == '__all__':
+        # "from freetype import *" gets all the enums
+        return [n for n in globals() if not n.startswith('_')] + \
+               ft_enums._load_all()
+    try:
+        return getattr(ft_enums, name)
+    except AttributeError:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(
+            __name__, name))
+
+def __dir__():
+    return sorted(set(globals()) | set(ft_enums._load_all()))
+
+
 # -----------------------------------------------------------------------------
 # Handling for FT_Done_MM_Var, which was added in FreeType 2.9. Prior to that,
 # we need to import libc and use libc free on the memory allocated for the
-# FT_MM_Var data structure. See Face.get_variation_info().
+# FT_MM_Var data structure. See Face.get_variation_info(). The version is only
+# checked on first use, so that importing the module does not initialize
+# FreeType.
 # -----------------------------------------------------------------------------
-if version() < (2,9,1):
-    if platform.system() == "Windows":
-        libcpath = ctypes.util.find_library("msvcrt")
-    else:
-        libcpath = ctypes.util.find_library("c")
-    libc = CDLL(libcpath)
-    libc.free.argtypes = [c_void_p]
-    libc.free.restype = None
-
-    def FT_Done_MM_Var_func(p):
-        libc.free(p)
-else:
-    def FT_Done_MM_Var_func(p):
-        error = FT_Done_MM_Var(get_handle(), p)
+_libc_free = None
+
+def FT_Done_MM_Var_func(p, library=None):
+    global _libc_free
+    if version() >= (2,9,1):
+        error = FT_Done_MM_Var(_get_library_handle(library), p)
         if error:
             raise FT_Exception("Failure calling FT_Done_MM_Var")
+        return
+    if _libc_free is None:
+        import ctypes.util
+        if sys.platform == "win32":
+            libcpath = ctypes.util.find_library("msvcrt")
+        else:
+            libcpath = ctypes.util.find_library("c")
+        libc = CDLL(libcpath)
+        libc.free.argtypes = [c_void_p]
+        libc.free.restype = None
+        _libc_free = libc.free
+    _libc_free(p)
+
+
+# -----------------------------------------------------------------------------
+class _Record( object ):
+    '''
+    Base class of the small, immutable copies of FreeType structures (BBox,
+    GlyphMetrics, SizeMetrics, BitmapSize, Charmap and SfntName).
+
+    The fields named in '_fields' are copied once, in that order, into the
+    '_values' tuple when the record is created, and are exposed as read-only
+    properties. Records of the same type holding the same values compare
+    equal. Records are hashable and can be pickled.
+    '''
+    __slots__ = ( '_values', )
+    _fields = ()
+
+    @classmethod
+    def _from_values( cls, values ):
+        record = cls.__new__( cls )
+        record._values = values
+        return record
+
+    def __eq__( self, other ):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._values == other._values
+
+    def __ne__( self, other ):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._values != other._values
+
+    def __hash__( self ):
+        return hash( (type(self).__name__,) + self._values )
+
+    def __reduce__( self ):
+        return _unpickle_record, ( type(self), self._values )
+
+    def __repr__( self ):
+        return '%s(%s)' % ( type(self).__name__, ', '.join(
+            '%s=%r' % item for item in zip( self._fields, self._values ) ) )
+
+def _unpickle_record( cls, values ):
+    return cls._from_values( values )
+
 
 
 # -----------------------------------------------------------------------------
-class BBox( object ):
+class BBox( _Record ):
     '''
     FT_BBox wrapper.
 
@@ -220,28 +650,34 @@ class BBox( object ):
     edge of the glyph's bounding box. If 'xMin' is negative, the glyph
     extends to the left of the origin.
     '''
+    __slots__ = ()
+    _fields = ( 'xMin', 'yMin', 'xMax', 'yMax' )
+    _values_of = attrgetter( *_fields )
 
     def __init__(self, bbox):
         '''
         Create a new BBox object.
 
-        :param bbox: a FT_BBox or a tuple of 4 values
+        :param bbox: a FT_BBox (which is copied) or a tuple of 4 values
         '''
         if type(bbox) is FT_BBox:
-            self._FT_BBox = bbox
+            self._values = self._values_of( bbox )
         else:
-            self._FT_BBox = FT_BBox(*bbox)
+            xMin, yMin, xMax, yMax = bbox
+            self._values = ( xMin, yMin, xMax, yMax )
+
+    _FT_BBox = property( lambda self: FT_BBox( *self._values ) )
 
-    xMin = property(lambda self: self._FT_BBox.xMin,
+    xMin = property(lambda self: self._values[0],
                     doc = 'The horizontal minimum (left-most).')
 
-    yMin = property(lambda self: self._FT_BBox.yMin,
+    yMin = property(lambda self: self._values[1],
                     doc = 'The vertical minimum (bottom-most).')
 
-    xMax = property(lambda self: self._FT_BBox.xMax,
+    xMax = property(lambda self: self._values[2],
                     doc = 'The horizontal maximum (right-most).')
 
-    yMax = property(lambda self: self._FT_BBox.yMax,
+    yMax = property(lambda self: self._values[3],
                     doc = 'The vertical maximum (top-most).')
 
 
@@ -249,7 +685,7 @@ class BBox( object ):
 
 
 # -----------------------------------------------------------------------------
-class GlyphMetrics( object ):
+class GlyphMetrics( _Record ):
     '''
 
     A structure used to model the metrics of a single glyph. The values are
@@ -267,43 +703,51 @@ class GlyphMetrics( object ):
     added width and height.
     '''
 
+    __slots__ = ()
+    _fields = ( 'width', 'height', 'horiBearingX', 'horiBearingY',
+                'horiAdvance', 'vertBearingX', 'vertBearingY', 'vertAdvance' )
+    _values_of = attrgetter( *_fields )
+
     def __init__(self, metrics ):
         '''
         Create a new GlyphMetrics object.
 
-        :param metrics: a FT_Glyph_Metrics
+        :param metrics: a FT_Glyph_Metrics (which is copied)
         '''
-        self._FT_Glyph_Metrics = metrics
+        self._values = self._values_of( metrics )
+
+    _FT_Glyph_Metrics = property(
+        lambda self: FT_Glyph_Metrics( *self._values ) )
 
-    width = property( lambda self: self._FT_Glyph_Metrics.width,
+    width = property( lambda self: self._values[0],
        doc = '''The glyph's width.''' )
 
-    height = property( lambda self: self._FT_Glyph_Metrics.height,
+    height = property( lambda self: self._values[1],
        doc = '''The glyph's height.''' )
 
-    horiBearingX = property( lambda self: self._FT_Glyph_Metrics.horiBearingX,
+    horiBearingX = property( lambda self: self._values[2],
        doc = '''Left side bearing for horizontal layout.''' )
 
-    horiBearingY = property( lambda self: self._FT_Glyph_Metrics.horiBearingY,
+    horiBearingY = property( lambda self: self._values[3],
        doc = '''Top side bearing for horizontal layout.''' )
 
-    horiAdvance = property( lambda self: self._FT_Glyph_Metrics.horiAdvance,
+    horiAdvance = property( lambda self: self._values[4],
        doc = '''Advance width for horizontal layout.''' )
 
-    vertBearingX = property( lambda self: self._FT_Glyph_Metrics.vertBearingX,
+    vertBearingX = property( lambda self: self._values[5],
        doc = '''Left side bearing for vertical layout.''' )
 
-    vertBearingY = property( lambda self: self._FT_Glyph_Metrics.vertBearingY,
+    vertBearingY = property( lambda self: self._values[6],
        doc = '''Top side bearing for vertical layout. Larger positive values
                 mean further below the vertical glyph origin.''' )
 
-    vertAdvance = property( lambda self: self._FT_Glyph_Metrics.vertAdvance,
+    vertAdvance = property( lambda self: self._values[7],
        doc = '''Advance height for vertical layout. Positive values mean the
                 glyph has a positive advance downward.''' )
 
 
 # -----------------------------------------------------------------------------
-class SizeMetrics( object ):
+class SizeMetrics( _Record ):
     '''
     The size metrics structure gives the metrics of a size object.
 
@@ -325,53 +769,61 @@ class SizeMetrics( object ):
     The SizeMetrics structure is valid for bitmap fonts also.
     '''
 
+    __slots__ = ()
+    _fields = ( 'x_ppem', 'y_ppem', 'x_scale', 'y_scale', 'ascender',
+                'descender', 'height', 'max_advance' )
+    _values_of = attrgetter( *_fields )
+
     def __init__(self, metrics ):
         '''
         Create a new SizeMetrics object.
 
-        :param metrics: a FT_SizeMetrics
+        :param metrics: a FT_SizeMetrics (which is copied)
         '''
-        self._FT_Size_Metrics = metrics
+        self._values = self._values_of( metrics )
+
+    _FT_Size_Metrics = property(
+        lambda self: FT_Size_Metrics( *self._values ) )
 
-    x_ppem = property( lambda self: self._FT_Size_Metrics.x_ppem,
+    x_ppem = property( lambda self: self._values[0],
        doc = '''The width of the scaled EM square in pixels, hence the term
                 'ppem' (pixels per EM). It is also referred to as 'nominal
                 width'.''' )
 
-    y_ppem = property( lambda self: self._FT_Size_Metrics.y_ppem,
+    y_ppem = property( lambda self: self._values[1],
        doc = '''The height of the scaled EM square in pixels, hence the term
                 'ppem' (pixels per EM). It is also referred to as 'nominal
                 height'.''' )
 
-    x_scale = property( lambda self: self._FT_Size_Metrics.x_scale,
+    x_scale = property( lambda self: self._values[2],
         doc = '''A 16.16 fractional scaling value used to convert horizontal
                  metrics from font units to 26.6 fractional pixels. Only
                  relevant for scalable font formats.''' )
 
-    y_scale = property( lambda self: self._FT_Size_Metrics.y_scale,
+    y_scale = property( lambda self: self._values[3],
         doc = '''A 16.16 fractional scaling value used to convert vertical
                  metrics from font units to 26.6 fractional pixels. Only
                  relevant for scalable font formats.''' )
 
-    ascender = property( lambda self: self._FT_Size_Metrics.ascender,
+    ascender = property( lambda self: self._values[4],
          doc = '''The ascender in 26.6 fractional pixels. See Face for the
                   details.''' )
 
-    descender = property( lambda self: self._FT_Size_Metrics.descender,
+    descender = property( lambda self: self._values[5],
           doc = '''The descender in 26.6 fractional pixels. See Face for the
                     details.''' )
 
-    height = property( lambda self: self._FT_Size_Metrics.height,
+    height = property( lambda self: self._values[6],
        doc = '''The height in 26.6 fractional pixels. See Face for the details.''' )
 
-    max_advance = property(lambda self: self._FT_Size_Metrics.max_advance,
+    max_advance = property(lambda self: self._values[7],
             doc = '''The maximal advance width in 26.6 fractional pixels. See
                       Face for the details.''' )
 
 
 
 # -----------------------------------------------------------------------------
-class BitmapSize( object ):
+class BitmapSize( _Record ):
     '''
     FT_Bitmap_Size wrapper
 
@@ -390,30 +842,37 @@ class BitmapSize( object ):
     contained in the bitmap strike itself. They are computed from the global
     font parameters.
     '''
+    __slots__ = ()
+    _fields = ( 'height', 'width', 'size', 'x_ppem', 'y_ppem' )
+    _values_of = attrgetter( *_fields )
+
     def __init__(self, size ):
         '''
-        Create a new SizeMetrics object.
+        Create a new BitmapSize object.
 
-        :param size: a FT_Bitmap_Size
+        :param size: a FT_Bitmap_Size (which is copied)
         '''
-        self._FT_Bitmap_Size = size
+        self._values = self._values_of( size )
 
-    height = property( lambda self: self._FT_Bitmap_Size.height,
+    _FT_Bitmap_Size = property(
+        lambda self: FT_Bitmap_Size( *self._values ) )
+
+    height = property( lambda self: self._values[0],
        doc = '''The vertical distance, in pixels, between two consecutive
                 baselines. It is always positive.''')
 
-    width = property( lambda self: self._FT_Bitmap_Size.width,
+    width = property( lambda self: self._values[1],
       doc = '''The average width, in pixels, of all glyphs in the strike.''')
 
-    size = property( lambda self: self._FT_Bitmap_Size.size,
+    size = property( lambda self: self._values[2],
      doc = '''The nominal size of the strike in 26.6 fractional points. This
               field is not very useful.''')
 
-    x_ppem = property( lambda self: self._FT_Bitmap_Size.x_ppem,
+    x_ppem = property( lambda self: self._values[3],
        doc = '''The horizontal ppem (nominal width) in 26.6 fractional
                 pixels.''')
 
-    y_ppem = property( lambda self: self._FT_Bitmap_Size.y_ppem,
+    y_ppem = property( lambda self: self._values[4],
        doc = '''The vertical ppem (nominal width) in 26.6 fractional
                 pixels.''')
 
@@ -465,7 +924,11 @@ class Bitmap(object):
                the file 'example2.py' in the tutorial for a demonstration.''')
 
     def _get_buffer(self):
-        data = [self._FT_Bitmap.buffer[i] for i in range(self.rows*self.pitch)]
+        n = self.rows*self.pitch
+        if n <= 0:
+            return []
+        # Slicing the pointer converts the whole range in a single call
+        data = self._FT_Bitmap.buffer[:n]
         return data
     buffer = property(_get_buffer,
        doc = '''A typeless pointer to the bitmap buffer. This value should be
@@ -487,11 +950,103 @@ class Bitmap(object):
         doc = '''A typeless pointer to the bitmap palette; this field is
                  intended for paletted pixel modes. Not used currently.''')
 
+    def _get_raw_array(self):
+        size = self._FT_Bitmap.rows*abs(self._FT_Bitmap.pitch)
+        if size <= 0 or not self._FT_Bitmap.buffer:
+            return (c_ubyte*0)()
+        return (c_ubyte*size).from_address(
+            addressof(self._FT_Bitmap.buffer.contents))
+
+    def to_memoryview(self, copy=False):
+        '''
+        Return the bitmap buffer as a 2-dimensional memoryview of unsigned
+        bytes, with shape (rows, abs(pitch)).
+
+        :param copy: If False (the default), the memoryview directly
+                     references the memory owned by FreeType and no data is
+                     copied. If True, the bytes are copied first.
+
+        **Note**:
+
+          Rows are given in memory order. When 'pitch' is negative (an 'up'
+          flow bitmap), the first row in memory is the bottom-most one.
+
+          A zero-copy view is only valid as long as the memory it references
+          is. For a glyph slot bitmap, this means until the next call to
+          load_glyph, load_char, render or until the face is discarded. Use
+          copy=True if the slot will be overwritten while the view is still
+          in use.
+
+          An empty bitmap gives an empty, 1-dimensional view.
+        '''
+        rows, pitch = self._FT_Bitmap.rows, abs(self._FT_Bitmap.pitch)
+        data = self._get_raw_array()
+        if copy:
+            data = bytearray(data)
+        view = memoryview(data).cast('B')
+        if not rows or not pitch:
+            return view
+        return view.cast('B', (rows, pitch))
+
+    def to_numpy(self, copy=False):
+        '''
+        Return the bitmap as a NumPy array. This requires NumPy to be
+        installed.
+
+        :param copy: If False (the default), the array is a view on the memory
+                     owned by FreeType (see to_memoryview). If True, the array
+                     owns a copy of the data.
+
+        :return: An array whose shape depends on 'pixel_mode':
+
+                 - FT_PIXEL_MODE_GRAY: (rows, width) of uint8.
+
+                 - FT_PIXEL_MODE_MONO: (rows, width) of uint8, with 0 or 1
+                   values. The bits are unpacked, hence this is always a copy.
+
+                 - FT_PIXEL_MODE_LCD: (rows, width/3, 3) of uint8.
+
+                 - FT_PIXEL_MODE_LCD_V: (rows/3, width, 3) of uint8.
+
+                 - FT_PIXEL_MODE_BGRA: (rows, width, 4) of uint8, in BGRA
+                   order.
+
+                 - Other modes: (rows, abs(pitch)) of uint8, the raw bytes.
+
+        **Note**:
+
+          Rows are always returned top to bottom; for bitmaps with a negative
+          pitch, the returned view is flipped accordingly.
+        '''
+        import numpy as np
+
+        rows, width = self._FT_Bitmap.rows, self._FT_Bitmap.width
+        pitch = self._FT_Bitmap.pitch
+        mode = self._FT_Bitmap.pixel_mode
+        data = np.frombuffer(self._get_raw_array(), dtype=np.uint8)
+        data = data.reshape((rows, abs(pitch)))
+        if pitch < 0:
+            data = data[::-1]
+        if mode == FT_PIXEL_MODE_GRAY:
+            data = data[:, :width]
+        elif mode == FT_PIXEL_MODE_MONO:
+            return np.unpackbits(data, axis=1)[:, :width]
+        elif mode == FT_PIXEL_MODE_LCD:
+            data = data[:, :width].reshape((rows, width//3, 3))
+        elif mode == FT_PIXEL_MODE_LCD_V:
+            data = data[:, :width].reshape((rows//3, 3, width))
+            data = data.transpose((0, 2, 1))
+        elif mode == FT_PIXEL_MODE_BGRA:
+            data = data[:, :width*4].reshape((rows, width, 4))
+        if copy:
+            data = data.copy()
+        return data
+
 
 
 
 # -----------------------------------------------------------------------------
-class Charmap( object ):
+class Charmap( _Record ):
     '''
     FT_Charmap wrapper.
 
@@ -518,7 +1073,15 @@ class Charmap( object ):
 
       See FT_CharMapRec for the publicly accessible fields of a given character
       map.
+
+      'encoding', 'platform_id' and 'encoding_id' are copied when the object
+      is created, and are what charmaps are compared (and pickled) by. The
+      handle is kept for Face.set_charmap and the 'index', 'cmap_language_id'
+      and 'cmap_format' queries; it is not pickled.
     '''
+    __slots__ = ( '_FT_Charmap', )
+    _fields = ( 'encoding', 'platform_id', 'encoding_id' )
+    _values_of = attrgetter( *_fields )
 
     def __init__( self, charmap ):
         '''
@@ -529,18 +1092,28 @@ class Charmap( object ):
         charmap : a FT_Charmap
         '''
         self._FT_Charmap = charmap
+        if charmap:
+            self._values = self._values_of( charmap.contents )
+        else:
+            self._values = ( None, None, None )
+
+    @classmethod
+    def _from_values( cls, values ):
+        charmap = super( Charmap, cls )._from_values( values )
+        charmap._FT_Charmap = None
+        return charmap
 
-    encoding = property( lambda self: self._FT_Charmap.contents.encoding,
+    encoding = property( lambda self: self._values[0],
          doc = '''An FT_Encoding tag identifying the charmap. Use this with
                   FT_Select_Charmap.''')
 
-    platform_id = property( lambda self: self._FT_Charmap.contents.platform_id,
+    platform_id = property( lambda self: self._values[1],
             doc = '''An ID number describing the platform for the following
                      encoding ID. This comes directly from the TrueType
                      specification and should be emulated for other
                      formats.''')
 
-    encoding_id = property( lambda self: self._FT_Charmap.contents.encoding_id,
+    encoding_id = property( lambda self: self._values[2],
             doc = '''A platform specific encoding number. This also comes from
                      the TrueType specification and should be emulated
                      similarly.''')
@@ -595,8 +1168,9 @@ class Outline( object ):
     n_contours = property(lambda self: self._FT_Outline.n_contours)
     def _get_contours(self):
         n = self._FT_Outline.n_contours
-        data = [self._FT_Outline.contours[i] for i in range(n)]
-        return data
+        if n <= 0:
+            return []
+        return self._FT_Outline.contours[:n]
     contours = property(_get_contours,
          doc = '''The number of contours in the outline.''')
 
@@ -613,8 +1187,9 @@ class Outline( object ):
 
     def _get_tags(self):
         n = self._FT_Outline.n_points
-        data = [self._FT_Outline.tags[i] for i in range(n)]
-        return data
+        if n <= 0:
+            return []
+        return self._FT_Outline.tags[:n]
     tags = property(_get_tags,
      doc = '''A list of 'n_points' chars, giving each outline point's type.
 
@@ -656,6 +1231,36 @@ class Outline( object ):
         '''
         return FT_Outline_GetOutsideBorder( byref(self._FT_Outline) )
 
+    def as_arrays(self):
+        '''
+        Return the outline geometry as packed arrays. Each array is built
+        with a single copy of the underlying C array, which is much faster
+        than the 'points', 'tags' and 'contours' properties for large
+        outlines.
+
+        :return: A (points, tags, contours) tuple of array.array objects:
+
+                 - points: 2*n_points signed longs holding the interleaved
+                   x and y coordinates (x0, y0, x1, y1, ...).
+
+                 - tags: n_points unsigned bytes (see 'tags').
+
+                 - contours: n_contours signed shorts giving the end point of
+                   each contour (see 'contours').
+
+        **Note**:
+
+          The arrays support the buffer protocol. With NumPy, the points can
+          be seen as a (n_points, 2) array without copying with
+          numpy.asarray(points).reshape(-1, 2).
+        '''
+        outline = self._FT_Outline
+        points = _array_from_pointer('l', outline.points, 2*outline.n_points)
+        tags = _array_from_pointer('B', outline.tags, outline.n_points)
+        contours = _array_from_pointer('h', outline.contours,
+                                       outline.n_contours)
+        return points, tags, contours
+
     def get_bbox(self):
         '''
         Compute the exact bounding box of an outline. This is slower than
@@ -782,12 +1387,37 @@ class Glyph( object ):
         :param glyph: valid FT_Glyph object
         '''
         self._FT_Glyph = glyph
+        # The glyph is allocated by its library, which must outlive it
+        library = cast(glyph.contents.library, c_void_p).value
+        self._library = _libraries.get(library)
+        if self._library is not None:
+            self._library._add_child(self)
 
     def __del__( self ):
         '''
         Destroy glyph.
         '''
-        FT_Done_Glyph( self._FT_Glyph )
+        if FT_Done_Glyph is not None:
+            self.close()
+
+    def __enter__( self ):
+        return self
+
+    def __exit__( self, exc_type, exc_value, traceback ):
+        self.close()
+
+    def close( self ):
+        '''
+        Destroy the glyph with FT_Done_Glyph. The glyph, and any BitmapGlyph
+        obtained from it, must not be used anymore. Closing a glyph twice is
+        harmless.
+        '''
+        glyph = self._FT_Glyph
+        if glyph is None:
+            return
+        self._FT_Glyph = None
+        if self._library is None or not self._library.closed:
+            FT_Done_Glyph( glyph )
 
     def _get_format( self ):
         return self._FT_Glyph.contents.format
@@ -844,8 +1474,9 @@ class Glyph( object ):
             error = FT_Glyph_To_Bitmap( byref(self._FT_Glyph),
                                         mode, byref(origin), destroy )
         else:
+            # 0 is accepted for "no translation"
             error = FT_Glyph_To_Bitmap( byref(self._FT_Glyph),
-                                        mode, origin, destroy )
+                                        mode, origin or None, destroy )
 
         if error: raise FT_Exception( error )
         return BitmapGlyph( self._FT_Glyph )
@@ -1063,6 +1694,15 @@ class GlyphSlot( object ):
           difference to gray linear blending is that subpixel-rendered linear
           blending is done 3 times per pixel: red foreground subpixel to red
           background subpixel and so on for green and blue.
+
+          FT_RENDER_MODE_SDF (FreeType 2.11+) produces a signed distance field
+          instead of a coverage map: an FT_PIXEL_MODE_GRAY bitmap, larger than
+          the glyph by the spread on each side, where 128 lies on the
+          outline and a value v is at (v - 128) * spread / 128 pixels from it
+          (positive inside). The spread (8 pixels by default) is set with
+          set_sdf_spread. Outlines are handled by the 'sdf' module and
+          bitmaps (e.g. glyphs loaded with FT_LOAD_RENDER) by the 'bsdf' one;
+          load glyphs without hinting for fields meant to be scaled.
         '''
         error = FT_Render_Glyph( self._FT_GlyphSlot, render_mode )
         if error: raise FT_Exception( error )
@@ -1077,6 +1717,20 @@ class GlyphSlot( object ):
         if error: raise FT_Exception( error )
         return Glyph( aglyph )
 
+    def snapshot( self, glyph_index = None ):
+        '''
+        Copy the contents of the slot (bitmap bytes, bearings, advances, linear
+        advances and metrics) in a single pass.
+
+        :param glyph_index: The index stored in the snapshot. Defaults to the
+                            index of the glyph last loaded in the slot
+                            (FreeType 2.10 and later; 0 with older versions).
+
+        :return: A GlyphSnapshot. It stays valid (and unchanged) when other
+                 glyphs are loaded in the slot, or when the face is closed.
+        '''
+        return _snapshot_glyph_slot( self._FT_GlyphSlot, glyph_index )
+
     def _get_bitmap( self ):
         return Bitmap( self._FT_GlyphSlot.contents.bitmap )
     bitmap = property( _get_bitmap,
@@ -1153,6 +1807,142 @@ class GlyphSlot( object ):
                            WYSIWYG layout. Only relevant for outline glyphs.''')
 
 
+# -----------------------------------------------------------------------------
+GlyphSnapshot = namedtuple('GlyphSnapshot', [
+    'glyph_index', 'buffer', 'width', 'rows', 'pitch', 'pixel_mode',
+    'bitmap_left', 'bitmap_top', 'advance', 'linearHoriAdvance',
+    'linearVertAdvance', 'metrics'])
+GlyphSnapshot.__doc__ = '''
+    Immutable copy of the contents of a glyph slot.
+
+    The attributes follow the names used by GlyphSlot and Bitmap: 'buffer'
+    holds the bitmap bytes (rows*abs(pitch) of them), 'width', 'rows', 'pitch'
+    and 'pixel_mode' describe the bitmap, 'advance' is an (x, y) tuple in 26.6
+    pixels and 'metrics' is a GlyphMetrics object owning its own copy of the
+    metrics.
+
+    Snapshots are returned by GlyphSlot.snapshot, Face.load_and_snapshot and
+    GlyphCache.
+    '''
+
+def _snapshot_glyph_slot( slot, glyph_index = None ):
+    # Copy everything needed out of a FT_GlyphSlot in a single pass
+    rec = slot.contents
+    if glyph_index is None:
+        glyph_index = rec.glyph_index
+    bitmap = rec.bitmap
+    size = bitmap.rows*abs(bitmap.pitch)
+    if size > 0 and bitmap.buffer:
+        buffer = string_at(bitmap.buffer, size)
+    else:
+        buffer = b''
+    advance = rec.advance
+    return GlyphSnapshot(
+        glyph_index, buffer, bitmap.width, bitmap.rows, bitmap.pitch,
+        bitmap.pixel_mode, rec.bitmap_left, rec.bitmap_top,
+        (advance.x, advance.y), rec.linearHoriAdvance, rec.linearVertAdvance,
+        GlyphMetrics(rec.metrics))
+
+
+
+# -----------------------------------------------------------------------------
+class Size( object ):
+    '''
+    FT_Size wrapper.
+
+    A size object models a face object at a given size. A face can have
+    several size objects; the active one is used when glyphs are loaded.
+    Switching between sizes with 'activate' is cheap since the scaled (and
+    hinted) state of every size is kept.
+
+    A Size can be used as a context manager: it is activated on entry and the
+    previously active size is restored on exit.
+    '''
+
+    def __init__( self, face ):
+        '''
+        Create a new size object for a face. See Face.new_size.
+
+        :param face: The parent Face object.
+        '''
+        self._FT_Size = None
+        size = FT_Size( )
+        error = FT_New_Size( face._FT_Face, byref(size) )
+        if error: raise FT_Exception( error )
+        # Keep the face alive, FT_Done_Face destroys its sizes
+        self._face = face
+        self._FT_Size = size
+        self._kerning_cache = dict()
+        self._cbox_cache = dict()
+        self._previous = []
+
+    def __del__( self ):
+        '''
+        Discard size object.
+        '''
+        # The garbage collector may finalize the face (or the library) first,
+        # and this size was destroyed along with it then
+        if FT_Done_Size is not None and self._FT_Size is not None \
+           and not self._face.closed and not self._face._library.closed:
+            face = self._face
+            if face._kerning_cache is self._kerning_cache:
+                # FreeType falls back to another size of the face, whose
+                # kerning pairs and glyph boxes are not cached here
+                face._kerning_cache = dict()
+                face._cbox_cache = dict()
+            FT_Done_Size( self._FT_Size )
+        self._FT_Size = None
+
+    def __enter__( self ):
+        face = self._face
+        # Store the address: the size field is a view on the face record
+        size = cast(face._FT_Face.contents.size, c_void_p).value
+        self._previous.append( (size, face._kerning_cache, face._cbox_cache) )
+        self.activate()
+        return self
+
+    def __exit__( self, exc_type, exc_value, traceback ):
+        size, kerning_cache, cbox_cache = self._previous.pop()
+        error = FT_Activate_Size( cast(size, FT_Size) )
+        if error: raise FT_Exception( error )
+        self._face._kerning_cache = kerning_cache
+        self._face._cbox_cache = cbox_cache
+
+    def activate( self ):
+        '''
+        Make this size the active size of its parent face.
+        '''
+        error = FT_Activate_Size( self._FT_Size )
+        if error: raise FT_Exception( error )
+        self._face._kerning_cache = self._kerning_cache
+        self._face._cbox_cache = self._cbox_cache
+
+    def set_char_size( self, width=0, height=0, hres=72, vres=72 ):
+        '''
+        Request the nominal size (in points) of this size object. See
+        Face.set_char_size. The active size of the face is left unchanged.
+        '''
+        with self:
+            self._face.set_char_size( width, height, hres, vres )
+
+    def set_pixel_sizes( self, width, height ):
+        '''
+        Request the nominal size (in pixels) of this size object. See
+        Face.set_pixel_sizes. The active size of the face is left unchanged.
+        '''
+        with self:
+            self._face.set_pixel_sizes( width, height )
+
+    def _get_metrics( self ):
+        return SizeMetrics( self._FT_Size.contents.metrics )
+    metrics = property( _get_metrics,
+       doc = '''The metrics of this size object.''')
+
+    face = property( lambda self: self._face,
+       doc = '''The parent face object.''')
+
+
+
 # -----------------------------------------------------------------------------
 #  Face wrapper
 # -----------------------------------------------------------------------------
@@ -1163,7 +1953,7 @@ class Face( object ):
     FreeType root face class structure. A face object models a typeface in a
     font file.
     '''
-    def __init__( self, path_or_stream, index = 0 ):
+    def __init__( self, path_or_stream, index = 0, library = None ):
         '''
         Build a new Face
 
@@ -1173,13 +1963,31 @@ class Face( object ):
         :param int index:
                The index of the face within the font.
                The first face has index 0.
+
+        :param Library library:
+               The library the face is created in. Defaults to the global
+               library.
         '''
-        library = get_handle( )
+        self._library = _get_library( library )
+        library = self._library._FT_Library
         face = FT_Face( )
         self._FT_Face = None
+        self._transform = None
+        self._char_index_memo = dict()
+        self._kerning_cache = dict()
+        self._cbox_cache = dict()
+        self._kerning_vector = FT_Vector(0,0)
+        self._advance_memo = dict()
+        self._variation_info = None
         #error = FT_New_Face( library, path_or_stream, 0, byref(face) )
         self._filebodys = []
-        if hasattr(path_or_stream, "read"):
+        if isinstance(path_or_stream, FontBlob):
+            error = self._init_from_blob(library, face, index, path_or_stream)
+        elif isinstance(path_or_stream, bytes):
+            error = self._init_from_memory(library, face, index, path_or_stream)
+        elif isinstance(path_or_stream, _FT_Stream_Wrapper):
+            error = self._init_from_stream(library, face, index, path_or_stream)
+        elif hasattr(path_or_stream, "read"):
             error = self._init_from_memory(library, face, index, path_or_stream.read())
         else:
             try:
@@ -1193,6 +2001,7 @@ class Face( object ):
         self._index = index
         self._FT_Face = face
         self._name_strings = dict()
+        self._library._add_child(self)
 
     def _init_from_file(self, library, face, index, path):
         u_filename = c_char_p(_encode_filename(path))
@@ -1206,6 +2015,18 @@ class Face( object ):
         self._filebodys.append(byte_stream)  # prevent gc
         return error
 
+    def _init_from_blob(self, library, face, index, blob):
+        error = FT_New_Memory_Face(library, blob._buffer, blob.size, index,
+                                   byref(face))
+        self._filebodys.append(blob)  # prevent gc
+        return error
+
+    def _init_from_stream(self, library, face, index, stream):
+        args = stream.open_args()
+        error = FT_Open_Face(library, byref(args), index, byref(face))
+        self._filebodys.append(stream)  # prevent gc
+        return error
+
     def _init_name_string_map(self):
         # build map of (nID, pID, eID, lID) keys to name string bytes
         self._name_strings = dict()
@@ -1220,25 +2041,121 @@ class Face( object ):
             self._name_strings[nk] = namerec.string
 
     @classmethod
-    def from_bytes(cls, bytes_, index=0):
-         return cls(io.BytesIO(bytes_), index)
+    def from_bytes(cls, bytes_, index=0, library=None):
+         if isinstance(bytes_, bytes):
+             # No need to go through a stream (and a copy of the data)
+             return cls(bytes_, index, library)
+         return cls(io.BytesIO(bytes_), index, library)
 
-    def __del__( self ):
-        '''
-        Discard  face object, as well as all of its child slots and sizes.
+    @classmethod
+    def from_stream(cls, path_or_stream, index=0, library=None):
         '''
-        # We check FT_Done_Face because by the time we're called it
-        # may already be gone (see #44 and discussion in #169)
-        if FT_Done_Face is not None and self._FT_Face is not None:
-            FT_Done_Face( self._FT_Face )
+        Build a new Face reading the font through a FreeType stream backed by
+        a Python file object. Only the parts of the font FreeType actually
+        needs are read, instead of loading the whole file in memory.
 
+        :param path_or_stream: A path to the font file, or a seekable binary
+                               file object. A file opened from a path is closed
+                               with the face; a file object given by the caller
+                               is not closed.
 
-    def attach_file( self, filename ):
-        '''
-        Attach data to a face object. Normally, this is used to read
-        additional information for the face object. For example, you can attach
-        an AFM file that comes with a Type 1 font to get the kerning values and
-        other metrics.
+        :param int index: The index of the face within the font.
+
+        **Note**:
+
+          The file object is used by FreeType for as long as the face is
+          alive, and must not be used elsewhere in the meantime.
+        '''
+        if hasattr(path_or_stream, "read"):
+            stream = _FT_Stream_Wrapper(path_or_stream)
+        else:
+            stream = _FT_Stream_Wrapper(open(path_or_stream, mode="rb"),
+                                        close=True)
+        return cls(stream, index, library)
+
+    @classmethod
+    def from_mmap(cls, path, index=0, library=None):
+        '''
+        Build a new Face on a memory mapping of a font file. Pages of the file
+        are only loaded when FreeType touches them, and are shared through the
+        page cache between all the faces and processes mapping the same file.
+
+        :param path: A path to the font file.
+
+        :param int index: The index of the face within the font.
+        '''
+        return cls(FontBlob.open(path, use_mmap=True), index, library)
+
+    def reference(self):
+        '''
+        Return a new Face object for the very same FreeType face, using
+        FT_Reference_Face. This is much cheaper than opening the font again,
+        but the two objects share everything: glyph slot, active size,
+        charmap, transform, etc.
+
+        The underlying FT_Face is only destroyed when all the Face objects
+        referencing it are gone.
+        '''
+        error = FT_Reference_Face( self._FT_Face )
+        if error: raise FT_Exception( error )
+        face = object.__new__(type(self))
+        face.__dict__.update(self.__dict__)
+        face._filebodys = list(self._filebodys)
+        self._library._add_child(face)
+        return face
+
+    def __del__( self ):
+        '''
+        Discard  face object, as well as all of its child slots and sizes.
+        '''
+        # We check FT_Done_Face because by the time we're called it
+        # may already be gone (see #44 and discussion in #169)
+        if FT_Done_Face is not None:
+            self.close()
+
+    def __enter__( self ):
+        return self
+
+    def __exit__( self, exc_type, exc_value, traceback ):
+        self.close()
+
+    def close( self ):
+        '''
+        Discard the face object with FT_Done_Face, as well as all of its child
+        slots and sizes, and release the font data it holds. The face, and
+        any glyph slot, size or charmap obtained from it, must not be used
+        anymore. Closing a face twice is harmless.
+
+        **Note**:
+
+          With Face.reference, the FreeType face is only destroyed once all
+          the Face objects referencing it are closed.
+        '''
+        face = self._FT_Face
+        if face is None:
+            return
+        self._FT_Face = None
+        # FT_Done_FreeType already destroyed the face if the library is gone
+        if not self._library.closed:
+            FT_Done_Face( face )
+        self._filebodys = []
+        self._char_index_memo = dict()
+        self._kerning_cache = dict()
+        self._cbox_cache = dict()
+        self._advance_memo = dict()
+        self._variation_info = None
+        self._name_strings = dict()
+
+    closed = property( lambda self: self._FT_Face is None,
+       doc = '''Whether the face has been closed.''')
+
+
+    def attach_file( self, filename ):
+        '''
+        Attach data to a face object. Normally, this is used to read
+        additional information for the face object. For example, you can attach
+        an AFM file that comes with a Type 1 font to get the kerning values and
+        other metrics.
 
         :param filename: Filename to attach
 
@@ -1267,6 +2184,11 @@ class Face( object ):
             error = FT_Attach_Stream( self._FT_Face, parameters )
             self._filebodys.append(filebody)  # prevent gc
         if error: raise FT_Exception( error)
+        # Attached data (e.g. metrics files) may change what the face reports
+        self._variation_info = None
+        self._kerning_cache.clear()
+        self._cbox_cache.clear()
+        self._advance_memo.clear()
 
 
     def set_char_size( self, width=0, height=0, hres=72, vres=72 ):
@@ -1297,6 +2219,8 @@ class Face( object ):
         '''
         error = FT_Set_Char_Size( self._FT_Face, width, height, hres, vres )
         if error: raise FT_Exception( error)
+        self._kerning_cache.clear()
+        self._cbox_cache.clear()
 
     def set_pixel_sizes( self, width, height ):
         '''
@@ -1309,6 +2233,8 @@ class Face( object ):
         '''
         error = FT_Set_Pixel_Sizes( self._FT_Face, width, height )
         if error: raise FT_Exception(error)
+        self._kerning_cache.clear()
+        self._cbox_cache.clear()
 
     def select_charmap( self, encoding ):
         '''
@@ -1361,6 +2287,56 @@ class Face( object ):
             charcode = ord(charcode)
         return FT_Get_Char_Index( self._FT_Face, charcode )
 
+    def get_char_indices( self, text ):
+        '''
+        Return the glyph indices of all the characters of a string, using the
+        current charmap.
+
+        :param text: A string, or an iterable of integer character codes.
+
+        :return: An array.array of unsigned ints holding the glyph indices.
+
+        **Note**:
+
+          Results are memoized per face and per charmap (a dense table for the
+          Basic Multilingual Plane and a dict for other planes), so that
+          characters seen before are mapped without calling FreeType.
+
+          The BMP table takes 256 KB, allocated on the first call for each
+          charmap and kept until the face is closed: call get_char_index
+          instead for a few characters of many faces.
+
+          A negative character code raises ValueError.
+        '''
+        if isinstance(text, (str,unicode)):
+            codes = array('I')
+            codes.frombytes(text.encode('utf-32-le' if sys.byteorder == 'little'
+                                        else 'utf-32-be'))
+        else:
+            codes = text
+        charmap = cast(self._FT_Face.contents.charmap, c_void_p).value
+        memo = self._char_index_memo.get(charmap)
+        if memo is None:
+            memo = (array('I', [0xFFFFFFFF])*0x10000, dict())
+            self._char_index_memo[charmap] = memo
+        bmp, other = memo
+        face = self._FT_Face
+        indices = array('I')
+        append = indices.append
+        for code in codes:
+            if 0 <= code < 0x10000:
+                gindex = bmp[code]
+                if gindex == 0xFFFFFFFF:
+                    gindex = bmp[code] = FT_Get_Char_Index( face, code )
+            else:
+                gindex = other.get(code)
+                if gindex is None:
+                    if code < 0:
+                        raise ValueError( 'negative character code %d' % code )
+                    gindex = other[code] = FT_Get_Char_Index( face, code )
+            append(gindex)
+        return indices
+
     def get_glyph_name(self, agindex, buffer_max=64):
         '''
         This function is used to return the glyph name for the given charcode.
@@ -1477,6 +2453,9 @@ class Face( object ):
         '''
         FT_Set_Transform( self._FT_Face,
                           byref(matrix), byref(delta) )
+        # Remembered so that caches can tell transformed glyphs apart
+        self._transform = (matrix.xx, matrix.xy, matrix.yx, matrix.yy,
+                           delta.x, delta.y)
 
     def select_size( self, strike_index ):
         '''
@@ -1487,6 +2466,8 @@ class Face( object ):
         '''
         error = FT_Select_Size( self._FT_Face, strike_index )
         if error: raise FT_Exception( error )
+        self._kerning_cache.clear()
+        self._cbox_cache.clear()
 
     def load_glyph( self, index, flags = FT_LOAD_RENDER ):
         '''
@@ -1515,6 +2496,22 @@ class Face( object ):
         error = FT_Load_Glyph( self._FT_Face, index, flags )
         if error: raise FT_Exception( error )
 
+    def load_and_snapshot( self, index, flags = FT_LOAD_RENDER ):
+        '''
+        Load a glyph (see load_glyph) and return a copy of the glyph slot
+        contents (see GlyphSlot.snapshot).
+
+        :param index: The index of the glyph in the font file.
+
+        :param flags: The load flags, as in load_glyph.
+
+        :return: A GlyphSnapshot.
+        '''
+        face = self._FT_Face
+        error = FT_Load_Glyph( face, index, flags )
+        if error: raise FT_Exception( error )
+        return _snapshot_glyph_slot( face.contents.glyph, index )
+
     def load_char( self, char, flags = FT_LOAD_RENDER ):
         '''
         A function used to load a single glyph into the glyph slot of a face
@@ -1571,6 +2568,53 @@ class Face( object ):
         if error: raise FT_Exception( error )
         return padvance.value
 
+    def get_advances( self, gindices, flags, count=None ):
+        '''
+        Retrieve the advance values of several glyph outlines in an FT_Face.
+        By default, the unhinted advances are returned in font units.
+
+        :param gindices: Either the first glyph index of a contiguous range
+                         (in which case 'count' must be given), or a sequence
+                         of glyph indices. A range object with a step of 1 is
+                         handled as a contiguous range.
+
+        :param flags: A set of bit flags similar to those used when calling
+                      FT_Load_Glyph, used to determine what kind of advances
+                      you need.
+
+        :param count: The number of glyphs of the contiguous range starting at
+                      'gindices'.
+
+        :return: An array.array of signed longs holding the advance values,
+                 in either font units or 16.16 format (see get_advance).
+
+        **Note**:
+
+          Contiguous ranges are measured with a single FT_Get_Advances call,
+          when the FreeType build provides it.
+        '''
+        if isinstance(gindices, range) and gindices.step == 1:
+            gindices, count = gindices.start, len(gindices)
+        if count is not None and FT_Get_Advances is None:
+            gindices, count = range(gindices, gindices + count), None
+        if count is not None:
+            advances = array('l', bytes(count*array('l').itemsize))
+            if count:
+                error = FT_Get_Advances( self._FT_Face, gindices, count, flags,
+                                         (FT_Fixed*count).from_buffer(advances) )
+                if error: raise FT_Exception( error )
+            return advances
+        advances = array('l')
+        append = advances.append
+        face = self._FT_Face
+        padvance = FT_Fixed(0)
+        ref = byref(padvance)
+        for gindex in gindices:
+            error = FT_Get_Advance( face, gindex, flags, ref )
+            if error: raise FT_Exception( error )
+            append(padvance.value)
+        return advances
+
 
 
     def get_kerning( self, left, right, mode = FT_KERNING_DEFAULT ):
@@ -1593,12 +2637,243 @@ class Face( object ):
         '''
         left_glyph = self.get_char_index( left )
         right_glyph = self.get_char_index( right )
-        kerning = FT_Vector(0,0)
-        error = FT_Get_Kerning( self._FT_Face,
-                                left_glyph, right_glyph, mode, byref(kerning) )
-        if error: raise FT_Exception( error )
+        return FT_Vector( *self.get_glyph_kerning( left_glyph, right_glyph,
+                                                   mode ) )
+
+    def get_glyph_kerning( self, left, right, mode = FT_KERNING_DEFAULT ):
+        '''
+        Return the kerning vector between two glyphs of a same face, given
+        their glyph indices.
+
+        :param left: The glyph index of the left glyph in the kern pair.
+
+        :param right: The glyph index of the right glyph in the kern pair.
+
+        :param mode: See FT_Kerning_Mode for more information. Determines the
+                     scale and dimension of the returned kerning vector.
+
+        :return: The kerning vector as a (x, y) tuple.
+
+        **Note**:
+
+          Kerning pairs are cached per face. The cache is cleared whenever the
+          size changes through set_char_size, set_pixel_sizes or select_size.
+        '''
+        key = (left, right, mode)
+        kerning = self._kerning_cache.get(key)
+        if kerning is None:
+            vector = self._kerning_vector
+            error = FT_Get_Kerning( self._FT_Face, left, right, mode,
+                                    byref(vector) )
+            if error: raise FT_Exception( error )
+            kerning = self._kerning_cache[key] = (vector.x, vector.y)
         return kerning
 
+    def get_kerning_pairs( self, gindices, mode = FT_KERNING_DEFAULT ):
+        '''
+        Return the horizontal kerning of every consecutive pair of glyphs of a
+        run.
+
+        :param gindices: A sequence of glyph indices.
+
+        :param mode: See FT_Kerning_Mode for more information.
+
+        :return: An array.array of signed longs, of the same length as
+                 'gindices'. Item i is the horizontal kerning to apply between
+                 glyphs i-1 and i; item 0 is always 0.
+        '''
+        deltas = array('l', bytes(len(gindices)*array('l').itemsize))
+        if not self.has_kerning:
+            return deltas
+        get = self._kerning_cache.get
+        kern = self.get_glyph_kerning
+        for i in range(1, len(gindices)):
+            key = (gindices[i-1], gindices[i], mode)
+            kerning = get(key)
+            if kerning is None:
+                kerning = kern( *key )
+            deltas[i] = kerning[0]
+        return deltas
+
+    def measure_text( self, text, flags = FT_LOAD_DEFAULT ):
+        '''
+        Measure a string of text at the current size, without rendering it.
+
+        :param text: A string. Newline characters start a new line.
+
+        :param flags: The load flags used to get the glyph metrics (hinting
+                      options, etc.). FT_LOAD_RENDER is ignored, and
+                      FT_LOAD_NO_BITMAP is added for scalable faces: no glyph
+                      is ever rasterized.
+
+        :return: An (ink, logical) tuple of BBox objects, in 26.6 fractional
+                 pixels, relative to the origin of the first glyph (y grows
+                 upwards). 'ink' bounds the glyph outlines (grid-fitted when
+                 hinting); 'logical' spans the advance widths horizontally,
+                 and goes from the descender of the last line to the ascender
+                 of the first one vertically.
+
+        **Note**:
+
+          Glyph boxes and advances are cached per size and load flags, and
+          kerning pairs as in get_glyph_kerning, so that measuring strings of
+          characters seen before does not call FreeType at all. Otherwise,
+          the glyph slot is overwritten.
+        '''
+        return self.measure_texts( [text], flags )[0]
+
+    def measure_texts( self, texts, flags = FT_LOAD_DEFAULT ):
+        '''
+        Measure several strings of text at the current size. See
+        measure_text.
+
+        :param texts: An iterable of strings.
+
+        :param flags: The load flags used to get the glyph metrics.
+
+        :return: A list of (ink, logical) tuples of BBox objects.
+        '''
+        flags &= ~FT_LOAD_RENDER
+        if self.is_scalable:
+            flags |= FT_LOAD_NO_BITMAP
+        face = self._FT_Face
+        slot = face.contents.glyph
+        metrics = face.contents.size.contents.metrics
+        ascender, descender = metrics.ascender, metrics.descender
+        line_height = metrics.height
+        cboxes = self._cbox_cache
+        kerning = self._kerning_cache
+        kern = self.has_kerning
+        get_kerning = self.get_glyph_kerning
+        get_char_indices = self.get_char_indices
+        results = []
+        for text in texts:
+            # ink bounds, with xMin > xMax as long as nothing was inked
+            xMin = yMin = sys.maxsize
+            xMax = yMax = -sys.maxsize
+            x = y = width = 0
+            previous = None
+            for char, gindex in zip( text, get_char_indices(text) ):
+                if char == '\n':
+                    width = max(width, x)
+                    x = 0
+                    y -= line_height
+                    previous = None
+                    continue
+                if kern and previous is not None:
+                    key = (previous, gindex, FT_KERNING_DEFAULT)
+                    pair = kerning.get(key)
+                    if pair is None:
+                        pair = get_kerning( *key )
+                    x += pair[0]
+                key = (gindex, flags)
+                cbox = cboxes.get(key)
+                if cbox is None:
+                    error = FT_Load_Glyph( face, gindex, flags )
+                    if error: raise FT_Exception( error )
+                    m = slot.contents.metrics
+                    cbox = cboxes[key] = (
+                        m.horiBearingX, m.horiBearingY - m.height,
+                        m.horiBearingX + m.width, m.horiBearingY,
+                        m.horiAdvance)
+                left, bottom, right, top, advance = cbox
+                # Blank glyphs (spaces) have no ink
+                if left != right and bottom != top:
+                    if x + left < xMin: xMin = x + left
+                    if x + right > xMax: xMax = x + right
+                    if y + bottom < yMin: yMin = y + bottom
+                    if y + top > yMax: yMax = y + top
+                x += advance
+                previous = gindex
+            width = max(width, x)
+            if xMin > xMax:
+                xMin = yMin = xMax = yMax = 0
+            results.append( (BBox( (xMin, yMin, xMax, yMax) ),
+                             BBox( (0, y + descender, width, ascender) )) )
+        return results
+
+    def _get_kern_table_pairs( self ):
+        # Candidate pairs listed in the format 0 subtables of the SFNT 'kern'
+        # table, which is where FT_Get_Kerning reads TrueType kerning from.
+        # None means that the table could not be used.
+        if not self.is_sfnt:
+            return None
+        tag = FT_ULong(struct.unpack('>I', b'kern')[0])
+        length = FT_ULong(0)
+        error = FT_Load_Sfnt_Table( self._FT_Face, tag, FT_Long(0), None,
+                                    byref(length) )
+        if error or length.value < 4:
+            return None
+        buff = create_string_buffer(length.value)
+        error = FT_Load_Sfnt_Table( self._FT_Face, tag, FT_Long(0), buff,
+                                    byref(length) )
+        if error: return None
+        data = buff.raw
+        version, num_tables = struct.unpack_from('>HH', data, 0)
+        if version != 0:
+            return None
+        pairs = []
+        offset = 4
+        for i in range(num_tables):
+            if offset + 6 > len(data):
+                break
+            _, sublength, coverage = struct.unpack_from('>HHH', data, offset)
+            if coverage >> 8 == 0 and offset + 14 <= len(data):
+                num_pairs = struct.unpack_from('>H', data, offset + 6)[0]
+                start = offset + 14
+                # The 16-bit subtable length overflows for large tables
+                num_pairs = min(num_pairs, (len(data) - start)//6)
+                for j in range(num_pairs):
+                    pairs.append(struct.unpack_from('>HH', data, start + 6*j))
+                sublength = max(sublength, 14 + 6*num_pairs)
+            if sublength <= 0:
+                break
+            offset += sublength
+        return pairs
+
+    def build_kerning_table( self, glyph_set = None,
+                             mode = FT_KERNING_DEFAULT ):
+        '''
+        Compute the horizontal kerning of all the pairs of a set of glyphs.
+
+        :param glyph_set: An iterable of glyph indices. Defaults to all the
+                          glyphs of the face.
+
+        :param mode: See FT_Kerning_Mode for more information. Determines the
+                     scale of the returned kerning values.
+
+        :return: A KerningTable holding the non-zero pairs only.
+
+        **Note**:
+
+          For SFNT fonts, only the pairs listed in the 'kern' table are queried,
+          instead of all the n*n combinations of the glyph set.
+        '''
+        if glyph_set is None:
+            glyphs = range(self.num_glyphs)
+        else:
+            glyphs = sorted(set(glyph_set))
+        table = KerningTable( mode = mode )
+        if not self.has_kerning:
+            return table
+        candidates = self._get_kern_table_pairs()
+        if candidates is None:
+            candidates = ((left, right) for left in glyphs for right in glyphs)
+        else:
+            wanted = set(glyphs)
+            candidates = [(left, right) for left, right in candidates
+                          if left in wanted and right in wanted]
+        face = self._FT_Face
+        vector = FT_Vector(0,0)
+        ref = byref(vector)
+        pairs = table.pairs
+        for left, right in candidates:
+            error = FT_Get_Kerning( face, left, right, mode, ref )
+            if error: raise FT_Exception( error )
+            if vector.x:
+                pairs[(left, right)] = vector.x
+        return table
+
     def get_format(self):
         '''
         Return a string describing the format of a given face, using values
@@ -1707,7 +2982,19 @@ class Face( object ):
     def get_variation_info(self):
         '''
         Retrieves variation space information for the current face.
+
+        The information is only queried from FreeType on the first call and
+        then cached with the face, since the axes and named instances of a
+        face do not change when its coordinates do. Each call returns a copy
+        of it, that callers are free to modify.
         '''
+        return copy.deepcopy(self._get_variation_info())
+
+    def _get_variation_info(self):
+        # The cached VariationSpaceInfo object itself, for internal use
+        if self._variation_info is not None:
+            return self._variation_info
+
         if version() < (2, 8, 1):
             raise NotImplementedError("freetype-py VF support requires FreeType 2.8.1 or later")
 
@@ -1719,18 +3006,19 @@ class Face( object ):
 
         vsi = VariationSpaceInfo(self, p_amaster)
 
-        FT_Done_MM_Var_func(p_amaster)
+        FT_Done_MM_Var_func(p_amaster, self._library)
 
+        self._variation_info = vsi
         return vsi
 
     def get_var_blend_coords(self):
         '''
         Get the current blend coordinates (-1.0..+1.0)
         '''
-        vsi = self.get_variation_info()
+        vsi = self._get_variation_info()
         num_coords = len(vsi.axes)
         ft_coords = (FT_Fixed * num_coords)()
-        error = FT_Get_Var_Blend_Coordinates(self._FT_Face, num_coords, byref(ft_coords))
+        error = FT_Get_Var_Blend_Coordinates(self._FT_Face, num_coords, ft_coords)
 
         if error:
             raise FT_Exception(error)
@@ -1745,24 +3033,26 @@ class Face( object ):
         their default coordinates.
         '''
         if reset:
-            error = FT_Set_Var_Blend_Coordinates(self._FT_Face, 0, 0)
+            error = FT_Set_Var_Blend_Coordinates(self._FT_Face, 0, None)
         else:
             num_coords = len(coords)
             ft_coords = [int(round(c * 65536.0)) for c in coords]
             coords_array = (FT_Fixed * num_coords)(*ft_coords)
-            error = FT_Set_Var_Blend_Coordinates(self._FT_Face, num_coords, byref(coords_array))
+            error = FT_Set_Var_Blend_Coordinates(self._FT_Face, num_coords, coords_array)
 
         if error:
             raise FT_Exception(error)
+        self._advance_memo.clear()
+        self._cbox_cache.clear()
 
     def get_var_design_coords(self):
         '''
         Get the current design coordinates
         '''
-        vsi = self.get_variation_info()
+        vsi = self._get_variation_info()
         num_coords = len(vsi.axes)
         ft_coords = (FT_Fixed * num_coords)()
-        error = FT_Get_Var_Design_Coordinates(self._FT_Face, num_coords, byref(ft_coords))
+        error = FT_Get_Var_Design_Coordinates(self._FT_Face, num_coords, ft_coords)
 
         if error:
             raise FT_Exception(error)
@@ -1777,16 +3067,18 @@ class Face( object ):
         their default coordinates.
         '''
         if reset:
-            error = FT_Set_Var_Design_Coordinates(self._FT_Face, 0, 0)
+            error = FT_Set_Var_Design_Coordinates(self._FT_Face, 0, None)
         
         else:
             num_coords = len(coords)
             ft_coords = [int(round(c * 65536.0)) for c in coords]
             coords_array = (FT_Fixed * num_coords)(*ft_coords)
-            error = FT_Set_Var_Design_Coordinates(self._FT_Face, num_coords, byref(coords_array))
+            error = FT_Set_Var_Design_Coordinates(self._FT_Face, num_coords, coords_array)
 
         if error:
             raise FT_Exception(error)
+        self._advance_memo.clear()
+        self._cbox_cache.clear()
 
     def set_var_named_instance(self, instance_name):
         '''
@@ -1797,7 +3089,7 @@ class Face( object ):
         of the named instance (if found) and call self.set_var_design_coords.
         '''
         have_func = freetype.version() >= (2, 9, 1)
-        vsi = self.get_variation_info()
+        vsi = self._get_variation_info()
 
         for inst_idx, inst in enumerate(vsi.instances, start=1):
             if inst.name == instance_name:
@@ -1808,6 +3100,8 @@ class Face( object ):
 
                 if error:
                     raise FT_Exception(error)
+                self._advance_memo.clear()
+                self._cbox_cache.clear()
 
                 break
 
@@ -2032,6 +3326,28 @@ class Face( object ):
     glyph = property( _get_glyph,
       doc = '''The face's associated glyph slot(s).''')
 
+    def new_size( self, width=0, height=0, hres=72, vres=72 ):
+        '''
+        Create a new size object for this face. The active size of the face is
+        left unchanged.
+
+        :param width: The nominal width, in 26.6 fractional points. If both
+                      width and height are 0, no size is requested.
+
+        :param height: The nominal height, in 26.6 fractional points.
+
+        :param hres: The horizontal resolution in dpi.
+
+        :param vres: The vertical resolution in dpi.
+
+        :return: A Size object. Use its 'activate' method (or use it as a
+                 context manager) to load glyphs at that size.
+        '''
+        size = Size( self )
+        if width or height:
+            size.set_char_size( width, height, hres, vres )
+        return size
+
     def _get_size( self ):
         size = self._FT_Face.contents.size
         metrics = size.contents.metrics
@@ -2049,48 +3365,44 @@ class Face( object ):
 # -----------------------------------------------------------------------------
 #  SfntName wrapper
 # -----------------------------------------------------------------------------
-class SfntName( object ):
+class SfntName( _Record ):
     '''
     SfntName wrapper
 
     A structure used to model an SFNT 'name' table entry.
     '''
+    __slots__ = ()
+    _fields = ( 'platform_id', 'encoding_id', 'language_id', 'name_id',
+                'string', 'string_len' )
+
     def __init__(self, name):
         '''
         Create a new SfntName object.
 
-        :param name : SFNT 'name' table entry.
+        :param name : SFNT 'name' table entry (a FT_SfntName, which is copied,
+                      string included).
 
         '''
-        self._FT_SfntName = name
+        self._values = ( name.platform_id, name.encoding_id, name.language_id,
+                         name.name_id, string_at(name.string, name.string_len),
+                         name.string_len )
 
-    platform_id = property(lambda self: self._FT_SfntName.platform_id,
+    platform_id = property(lambda self: self._values[0],
             doc = '''The platform ID for 'string'.''')
 
-    encoding_id = property(lambda self: self._FT_SfntName.encoding_id,
+    encoding_id = property(lambda self: self._values[1],
             doc = '''The encoding ID for 'string'.''')
 
-    language_id = property(lambda self: self._FT_SfntName.language_id,
+    language_id = property(lambda self: self._values[2],
             doc = '''The language ID for 'string'.''')
 
-    name_id = property(lambda self: self._FT_SfntName.name_id,
+    name_id = property(lambda self: self._values[3],
         doc = '''An identifier for 'string'.''')
 
-    #string      = property(lambda self: self._FT_SfntName.string)
-
-    string_len = property(lambda self: self._FT_SfntName.string_len,
+    string_len = property(lambda self: self._values[5],
            doc = '''The length of 'string' in bytes.''')
 
-    def _get_string(self):
-    #     #s = self._FT_SfntName
-         s = string_at(self._FT_SfntName.string, self._FT_SfntName.string_len)
-         return s
-    #     #return s.decode('utf-16be', 'ignore')
-    #     return s.decode('utf-8', 'ignore')
-    #     #n = s.string_len
-    #     #data = [s.string[i] for i in range(n)]
-    #     #return data
-    string = property(_get_string,
+    string = property(lambda self: self._values[4],
        doc = '''The 'name' string. Note that its format differs depending on
                 the (platform,encoding) pair. It can be a Pascal String, a
                 UTF-16 one, etc.
@@ -2113,22 +3425,46 @@ class Stroker( object ):
     with a coloured (and anti-aliased) border around their shape.
     '''
 
-    def __init__( self ):
+    def __init__( self, library = None ):
         '''
         Create a new Stroker object.
+
+        :param library: The Library object the stroker is created in. Defaults
+                        to the global library.
         '''
-        library = get_handle( )
+        self._FT_Stroker = None
+        self._library = _get_library( library )
         stroker = FT_Stroker( )
-        error = FT_Stroker_New( library, byref(stroker) )
+        error = FT_Stroker_New( self._library._FT_Library, byref(stroker) )
         if error: raise FT_Exception( error )
         self._FT_Stroker = stroker
+        self._library._add_child(self)
 
 
     def __del__( self ):
         '''
         Destroy object.
         '''
-        FT_Stroker_Done( self._FT_Stroker )
+        if FT_Stroker_Done is not None:
+            self.close()
+
+    def __enter__( self ):
+        return self
+
+    def __exit__( self, exc_type, exc_value, traceback ):
+        self.close()
+
+    def close( self ):
+        '''
+        Destroy the stroker with FT_Stroker_Done. The stroker must not be used
+        anymore. Closing a stroker twice is harmless.
+        '''
+        stroker = self._FT_Stroker
+        if stroker is None:
+            return
+        self._FT_Stroker = None
+        if not self._library.closed:
+            FT_Stroker_Done( stroker )
 
 
     def set( self, radius, line_cap, line_join, miter_limit ):
@@ -2351,6 +3687,792 @@ class Stroker( object ):
         FT_Stroker_Export( self._FT_Stroker, byref(outline._FT_Outline) )
 
 
+# -----------------------------------------------------------------------------
+class SBit( object ):
+    '''
+    FTC_SBit wrapper.
+
+    A compact snapshot of a small glyph bitmap returned by the cache
+    sub-system. The bitmap bytes are copied out of the cache, hence a SBit
+    stays valid after the cache is flushed.
+    '''
+    def __init__( self, sbit ):
+        '''
+        Create a new SBit object.
+
+        :param sbit: a FTC_SBitRec
+        '''
+        self.width = sbit.width
+        self.height = sbit.height
+        self.left = sbit.left
+        self.top = sbit.top
+        self.format = sbit.format
+        self.max_grays = sbit.max_grays
+        self.pitch = sbit.pitch
+        self.xadvance = sbit.xadvance
+        self.yadvance = sbit.yadvance
+        if sbit.buffer:
+            self.buffer = string_at(sbit.buffer, abs(sbit.pitch)*sbit.height)
+        else:
+            self.buffer = None
+
+    def __repr__(self):
+        return "<SBit {}x{} left={} top={} xadvance={}>".format(
+            self.width, self.height, self.left, self.top, self.xadvance)
+
+
+
+# -----------------------------------------------------------------------------
+class KerningTable( object ):
+    '''
+    Sparse table of the horizontal kerning between pairs of glyphs, as built
+    by Face.build_kerning_table.
+
+    The table only depends on plain Python data, so it can be pickled, or
+    saved with 'to_bytes' and restored with 'from_bytes' without the font.
+    '''
+
+    _header = struct.Struct('<4sHHI')
+    _magic = b'FTKN'
+
+    def __init__( self, pairs = None, mode = FT_KERNING_DEFAULT ):
+        '''
+        Create a new KerningTable object.
+
+        :param pairs: A dict mapping (left, right) glyph index tuples to their
+                      horizontal kerning.
+
+        :param mode: The FT_Kerning_Mode the values are expressed in.
+        '''
+        self.pairs = dict(pairs or ())
+        self.mode = mode
+
+    def __len__( self ):
+        return len(self.pairs)
+
+    def get( self, left, right ):
+        '''
+        Return the horizontal kerning between two glyphs, 0 if the pair is not
+        kerned.
+        '''
+        return self.pairs.get((left, right), 0)
+
+    def to_arrays( self ):
+        '''
+        Return the table as three array.array objects (left glyph indices,
+        right glyph indices and kerning values), sorted by (left, right).
+        '''
+        keys = sorted(self.pairs)
+        left = array('I', [k[0] for k in keys])
+        right = array('I', [k[1] for k in keys])
+        values = array('i', [self.pairs[k] for k in keys])
+        return left, right, values
+
+    def to_bytes( self ):
+        '''
+        Serialize the table to a compact, little-endian binary string.
+        '''
+        arrays = self.to_arrays()
+        if sys.byteorder != 'little':
+            for a in arrays:
+                a.byteswap()
+        return (self._header.pack(self._magic, 1, self.mode, len(self.pairs))
+                + b''.join(a.tobytes() for a in arrays))
+
+    @classmethod
+    def from_bytes( cls, data ):
+        '''
+        Restore a table serialized with 'to_bytes'.
+        '''
+        magic, version, mode, count = cls._header.unpack_from(data, 0)
+        if magic != cls._magic or version != 1:
+            raise ValueError('Not a serialized KerningTable')
+        offset = cls._header.size
+        arrays = []
+        for typecode in 'IIi':
+            a = array(typecode)
+            size = count*a.itemsize
+            a.frombytes(data[offset:offset+size])
+            if sys.byteorder != 'little':
+                a.byteswap()
+            arrays.append(a)
+            offset += size
+        left, right, values = arrays
+        return cls(zip(zip(left, right), values), mode)
+
+
+
+# -----------------------------------------------------------------------------
+class CacheManager( object ):
+    '''
+    FTC_Manager wrapper.
+
+    The cache manager owns the faces and sizes it opens and keeps them (as well
+    as the glyph images, small bitmaps and charmap lookups of its caches) in an
+    LRU list bounded by 'max_faces', 'max_sizes' and 'max_bytes'.
+
+    Fonts are registered with 'register_face', which returns a face ID to be
+    used with the lookup methods. The actual FT_Face is only opened when it is
+    first needed and may be closed and reopened transparently by the manager.
+    '''
+
+    def __init__( self, max_faces=0, max_sizes=0, max_bytes=0,
+                  library=None ):
+        '''
+        Create a new CacheManager object.
+
+        :param max_faces: Maximum number of opened FT_Face objects managed by
+                          this cache instance. Use 0 for defaults.
+
+        :param max_sizes: Maximum number of opened FT_Size objects managed by
+                          this cache instance. Use 0 for defaults.
+
+        :param max_bytes: Maximum number of bytes to use for cached data nodes.
+                          Use 0 for defaults. Note that this value does not
+                          account for managed FT_Face and FT_Size objects.
+
+        :param library: The Library object the managed faces are created in.
+                        Defaults to the global library.
+        '''
+        self._FTC_Manager = None
+        self._library = _get_library( library )
+        self._sources = dict()
+        self._next_face_id = 1
+        # Keep a reference to the callback, it is called from C code
+        self._requester = FTC_Face_Requester(self._request_face)
+        manager = FTC_Manager( )
+        error = FTC_Manager_New( self._library._FT_Library, max_faces,
+                                 max_sizes, max_bytes, self._requester, None,
+                                 byref(manager) )
+        if error: raise FT_Exception( error )
+        self._FTC_Manager = manager
+        self._library._add_child(self)
+
+        self._FTC_CMapCache = FTC_CMapCache( )
+        error = FTC_CMapCache_New( manager, byref(self._FTC_CMapCache) )
+        if error: raise FT_Exception( error )
+        self._FTC_ImageCache = FTC_ImageCache( )
+        error = FTC_ImageCache_New( manager, byref(self._FTC_ImageCache) )
+        if error: raise FT_Exception( error )
+        self._FTC_SBitCache = FTC_SBitCache( )
+        error = FTC_SBitCache_New( manager, byref(self._FTC_SBitCache) )
+        if error: raise FT_Exception( error )
+
+    def __del__( self ):
+        '''
+        Destroy the cache manager, as well as all the faces and sizes it
+        manages.
+        '''
+        if FTC_Manager_Done is not None:
+            self.close()
+
+    def __enter__( self ):
+        return self
+
+    def __exit__( self, exc_type, exc_value, traceback ):
+        self.close()
+
+    def close( self ):
+        '''
+        Destroy the cache manager with FTC_Manager_Done, as well as all the
+        faces and sizes it manages. The cache manager must not be used
+        anymore; glyphs returned by lookup_glyph remain valid. Closing a cache
+        manager twice is harmless.
+        '''
+        manager = self._FTC_Manager
+        if manager is None:
+            return
+        self._FTC_Manager = None
+        if not self._library.closed:
+            FTC_Manager_Done( manager )
+
+    def _request_face( self, face_id, library, req_data, aface ):
+        try:
+            source, index = self._sources[face_id]
+        except KeyError:
+            return 0x06  # invalid argument
+        if isinstance(source, bytes):
+            return FT_New_Memory_Face( library, source, len(source),
+                                       index, aface )
+        try:
+            u_filename = c_char_p(_encode_filename(source))
+        except UnicodeError:
+            with open(source, mode="rb") as f:
+                source = f.read()
+            self._sources[face_id] = (source, index)  # prevent gc
+            return FT_New_Memory_Face( library, source, len(source),
+                                       index, aface )
+        return FT_New_Face( library, u_filename, index, aface )
+
+    def _image_type( self, face_id, size, flags ):
+        if isinstance(size, (tuple, list)):
+            width, height = size
+        else:
+            width = height = size
+        return FTC_ImageTypeRec( face_id, width, height, flags )
+
+    def register_face( self, path_or_stream, index=0 ):
+        '''
+        Register a font with the cache manager.
+
+        :param path_or_stream: A path to the font file, the font file contents
+                               as bytes, or a binary stream to read them from.
+
+        :param index: The index of the face within the font.
+
+        :return: The face ID (a strictly positive integer) to pass to the
+                 lookup methods.
+        '''
+        if hasattr(path_or_stream, "read"):
+            path_or_stream = path_or_stream.read()
+        face_id = self._next_face_id
+        self._next_face_id += 1
+        self._sources[face_id] = (path_or_stream, index)
+        return face_id
+
+    def remove_face( self, face_id ):
+        '''
+        Flush all cached data related to a given face ID and forget about it.
+
+        :param face_id: The face ID returned by 'register_face'.
+        '''
+        FTC_Manager_RemoveFaceID( self._FTC_Manager, face_id )
+        del self._sources[face_id]
+
+    def reset( self ):
+        '''
+        Empty the cache manager's internal lists: close all the managed faces
+        and sizes and flush all cached glyph images, small bitmaps and charmap
+        lookups. Registered face IDs remain valid.
+        '''
+        FTC_Manager_Reset( self._FTC_Manager )
+
+    def get_char_index( self, face_id, charcode, cmap_index=-1 ):
+        '''
+        Translate a character code into a glyph index, using the charmap
+        cache.
+
+        :param face_id: The face ID returned by 'register_face'.
+
+        :param charcode: The character code, or a single character string.
+
+        :param cmap_index: The index of the charmap in the face's charmaps
+                           list. Use -1 for the face's default charmap.
+
+        :return: The glyph index. 0 means 'no glyph'.
+        '''
+        if isinstance(charcode, (str,unicode)):
+            charcode = ord(charcode)
+        return FTC_CMapCache_Lookup( self._FTC_CMapCache, face_id,
+                                     cmap_index, charcode )
+
+    def lookup_glyph( self, face_id, glyph_index, size,
+                      flags=FT_LOAD_DEFAULT ):
+        '''
+        Retrieve a given glyph image from the image cache.
+
+        :param face_id: The face ID returned by 'register_face'.
+
+        :param glyph_index: The glyph index.
+
+        :param size: The character size in pixels, either as a single value or
+                     as a (width, height) tuple.
+
+        :param flags: The load flags, as in Face.load_glyph.
+
+        :return: A Glyph object holding a copy of the cached glyph image.
+        '''
+        image_type = self._image_type( face_id, size, flags )
+        aglyph = FT_Glyph( )
+        error = FTC_ImageCache_Lookup( self._FTC_ImageCache, byref(image_type),
+                                       glyph_index, byref(aglyph), None )
+        if error: raise FT_Exception( error )
+        # The cached glyph is owned by the cache, hand out a copy
+        glyph = FT_Glyph( )
+        error = FT_Glyph_Copy( aglyph, byref(glyph) )
+        if error: raise FT_Exception( error )
+        return Glyph( glyph )
+
+    def lookup_sbit( self, face_id, glyph_index, size,
+                     flags=FT_LOAD_DEFAULT ):
+        '''
+        Retrieve a given small glyph bitmap from the small bitmap cache.
+
+        :param face_id: The face ID returned by 'register_face'.
+
+        :param glyph_index: The glyph index.
+
+        :param size: The character size in pixels, either as a single value or
+                     as a (width, height) tuple.
+
+        :param flags: The load flags, as in Face.load_glyph. FT_LOAD_RENDER is
+                      implied.
+
+        :return: A SBit object.
+
+        **Note**:
+
+          Glyphs whose bitmap or metrics do not fit in a small bitmap (as is
+          typical for sizes above 255 pixels) come back with a 'buffer' of
+          None; use 'lookup_glyph' for those.
+        '''
+        image_type = self._image_type( face_id, size, flags )
+        asbit = FTC_SBit( )
+        error = FTC_SBitCache_Lookup( self._FTC_SBitCache, byref(image_type),
+                                      glyph_index, byref(asbit), None )
+        if error: raise FT_Exception( error )
+        return SBit( asbit.contents )
+
+
+
+# -----------------------------------------------------------------------------
+def _glyph_key( face, index, flags ):
+    # What a loaded glyph depends on: face, size, transform, index and flags
+    metrics = face._FT_Face.contents.size.contents.metrics
+    return (face, metrics.x_scale, metrics.y_scale, metrics.x_ppem,
+            metrics.y_ppem, face._transform, index, flags)
+
+class GlyphCache( object ):
+    '''
+    LRU cache of loaded glyphs.
+
+    A glyph cache sits in front of Face.load_glyph: glyphs are loaded once and
+    stored as immutable GlyphSnapshot objects, keyed by face, current size,
+    current transform, glyph index and load flags. Subsequent requests for the
+    same glyph are served from the cache without calling FreeType at all.
+
+    The cache is bounded by an (approximate) number of bytes; the least
+    recently used glyphs are evicted first.
+
+    **Note**:
+
+      The cache holds references to the faces it has seen until their glyphs
+      are evicted or the cache is cleared.
+
+      Variable font coordinates are not part of the key. Clear the cache (or
+      use one cache per instance) when changing them.
+    '''
+
+    # Estimated cost of a cache entry, on top of its bitmap bytes
+    entry_overhead = 512
+
+    def __init__( self, max_bytes=16*1024*1024 ):
+        '''
+        Create a new GlyphCache object.
+
+        :param max_bytes: The maximum number of bytes (bitmap bytes plus a
+                          fixed per glyph overhead) held by the cache.
+        '''
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__( self ):
+        return len(self._entries)
+
+    nbytes = property(lambda self: self._bytes,
+      doc = '''The estimated number of bytes currently held by the
+               cache.''')
+
+    def load_glyph( self, face, index, flags = FT_LOAD_RENDER ):
+        '''
+        Return the snapshot of a glyph, loading it with Face.load_glyph on a
+        cache miss.
+
+        :param face: The Face object.
+
+        :param index: The glyph index.
+
+        :param flags: The load flags, as in Face.load_glyph.
+
+        :return: A GlyphSnapshot.
+
+        **Note**:
+
+          On a cache hit, the face glyph slot is left untouched.
+        '''
+        key = _glyph_key( face, index, flags )
+        entries = self._entries
+        entry = entries.get(key)
+        if entry is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        self.misses += 1
+        entry = face.load_and_snapshot( index, flags )
+        entries[key] = entry
+        self._bytes += len(entry.buffer) + self.entry_overhead
+        while self._bytes > self.max_bytes and len(entries) > 1:
+            _, evicted = entries.popitem(last=False)
+            self._bytes -= len(evicted.buffer) + self.entry_overhead
+            self.evictions += 1
+        return entry
+
+    def load_char( self, face, char, flags = FT_LOAD_RENDER ):
+        '''
+        Return the snapshot of a glyph given its character code. See
+        load_glyph.
+
+        :param face: The Face object.
+
+        :param char: The character code, or a single character string.
+
+        :param flags: The load flags, as in Face.load_glyph.
+        '''
+        return self.load_glyph( face, face.get_char_index(char), flags )
+
+    def clear( self ):
+        '''
+        Drop all cached glyphs. Statistics are kept.
+        '''
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats( self ):
+        '''
+        Return a dict of the cache statistics: 'hits', 'misses', 'evictions',
+        'entries' and 'bytes'.
+        '''
+        return dict(hits=self.hits, misses=self.misses,
+                    evictions=self.evictions, entries=len(self._entries),
+                    bytes=self._bytes)
+
+
+
+class FacePool( object ):
+    '''
+    LRU pool of open faces.
+
+    A face pool keeps Face objects, keyed by font path and face index, open
+    across requests so that fonts are not reopened (with FT_New_Face) every
+    time they are needed, while bounding the number of open faces (and thus
+    of file descriptors) and their estimated memory usage. The least recently
+    used faces are closed first.
+
+    Faces are leased, for the exclusive use of one thread at a time:
+
+      with pool.lease(path) as face:
+          face.set_char_size(48*64)
+          face.load_char('S')
+
+    **Note**:
+
+      A face must not be used after it has been returned to the pool, since
+      it may be closed at any time afterwards.
+
+      Leasing a face that is already leased blocks until it is returned, so a
+      thread must not lease the same face twice.
+
+      Leased faces are never closed. The pool may exceed its budgets while
+      they are all leased, and is trimmed when they are returned.
+    '''
+
+    # Estimated cost of an open face, on top of its font file size
+    entry_overhead = 64*1024
+
+    def __init__( self, max_faces=64, max_bytes=256*1024*1024,
+                  library=None ):
+        '''
+        Create a new FacePool object.
+
+        :param max_faces: The maximum number of open faces.
+
+        :param max_bytes: The maximum number of bytes (font file sizes plus a
+                          fixed per face overhead) of the open faces.
+
+        :param library: The Library object the faces are created in.
+                        Defaults to the global library.
+        '''
+        self.max_faces = max_faces
+        self.max_bytes = max_bytes
+        self._library = library
+        # (path, index) -> [face, nbytes, leased]; face is None while the
+        # face is being opened, by the thread that leases it
+        self._entries = OrderedDict()
+        # id(face) -> (path, index) of the open faces, for release
+        self._keys = dict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._returned = threading.Condition(self._lock)
+        # Opening and closing faces of a library must be serialized, but not
+        # with the pool bookkeeping: a miss does not hold up other threads
+        self._library_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__( self ):
+        return len(self._entries)
+
+    nbytes = property(lambda self: self._bytes,
+      doc = '''The estimated number of bytes of the open faces.''')
+
+    def acquire( self, path, index = 0 ):
+        '''
+        Lease a face, opening it on a pool miss. The face must be returned
+        with 'release'; see also 'lease'.
+
+        :param path: A path to the font file.
+
+        :param index: The index of the face within the font.
+
+        :return: A Face object.
+        '''
+        key = (os.path.abspath(path), index)
+        with self._lock:
+            entry = self._entries.get(key)
+            while entry is not None and entry[2]:
+                self._returned.wait()
+                entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                entry[2] = True
+                return entry[0]
+            self.misses += 1
+            # Placeholder, leased until the face is open and returned
+            entry = self._entries[key] = [None, 0, True]
+        try:
+            with self._library_lock:
+                face = Face( key[0], index, self._library )
+            nbytes = os.path.getsize(key[0]) + self.entry_overhead
+        except:
+            with self._lock:
+                del self._entries[key]
+                self._returned.notify_all()
+            raise
+        with self._lock:
+            entry[0], entry[1] = face, nbytes
+            self._keys[id(face)] = key
+            self._bytes += nbytes
+            evicted = self._trim()
+        self._close( evicted )
+        return face
+
+    def release( self, face ):
+        '''
+        Return a face obtained with 'acquire' to the pool.
+
+        :param face: The Face object.
+        '''
+        with self._lock:
+            entry = self._entries.get( self._keys.get( id(face) ) )
+            if entry is None or entry[0] is not face:
+                raise ValueError( 'face does not belong to the pool' )
+            entry[2] = False
+            evicted = self._trim()
+            self._returned.notify_all()
+        self._close( evicted )
+
+    @contextmanager
+    def lease( self, path, index = 0 ):
+        '''
+        Context manager leasing a face for the duration of a with block. See
+        acquire.
+
+        :param path: A path to the font file.
+
+        :param index: The index of the face within the font.
+        '''
+        face = self.acquire( path, index )
+        try:
+            yield face
+        finally:
+            self.release( face )
+
+    def _trim( self ):
+        # Remove least recently used faces that are not leased, until the pool
+        # fits its budgets, and return them to be closed (called with the lock
+        # held)
+        entries = self._entries
+        evicted = []
+        if len(entries) <= self.max_faces and self._bytes <= self.max_bytes:
+            return evicted
+        for key in list(entries):
+            if len(entries) <= self.max_faces and \
+               self._bytes <= self.max_bytes:
+                break
+            entry = entries[key]
+            if entry[2]:
+                continue
+            del entries[key]
+            del self._keys[id(entry[0])]
+            self._bytes -= entry[1]
+            evicted.append( entry[0] )
+            self.evictions += 1
+        return evicted
+
+    def _close( self, faces ):
+        # Close faces removed from the pool (called without the lock held)
+        if faces:
+            with self._library_lock:
+                for face in faces:
+                    face.close()
+
+    def clear( self ):
+        '''
+        Close all the faces that are not leased. Statistics are kept.
+        '''
+        evicted = []
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if not entry[2]:
+                    del self._entries[key]
+                    del self._keys[id(entry[0])]
+                    self._bytes -= entry[1]
+                    evicted.append( entry[0] )
+        self._close( evicted )
+
+    def stats( self ):
+        '''
+        Return a dict of the pool statistics: 'hits', 'misses', 'evictions',
+        'entries', 'leased' and 'bytes'.
+        '''
+        with self._lock:
+            leased = sum(1 for entry in self._entries.values() if entry[2])
+            return dict(hits=self.hits, misses=self.misses,
+                        evictions=self.evictions, entries=len(self._entries),
+                        leased=leased, bytes=self._bytes)
+
+
+
+# -----------------------------------------------------------------------------
+def render_text( face, text, out, origin = (0, 0), blend_mode = 'max',
+                 color = 255, flags = FT_LOAD_RENDER, cache = None ):
+    '''
+    Render a string of text into a canvas. This requires NumPy to be
+    installed.
+
+    Glyphs are placed as in Face.measure_text (current size, advances of the
+    loaded glyphs, kerning, newlines): with ink, _ = face.measure_text(text),
+    the text covers columns origin[0] + ink.xMin/64 to origin[0] + ink.xMax/64
+    and rows origin[1] - ink.yMax/64 to origin[1] - ink.yMin/64 (end
+    excluded), which tells how large the canvas needs to be.
+
+    :param face: The Face object, set to the wanted size.
+
+    :param text: A string. Newline characters start a new line.
+
+    :param out: The canvas: a writable NumPy array (or any object exporting a
+                writable buffer with the same shape) of uint8, either 2D
+                (rows, columns) for coverage/gray levels, or 3D (rows,
+                columns, 4) for RGBA pixels with straight (not premultiplied)
+                alpha. Glyphs are clipped to the canvas.
+
+    :param origin: The (x, y) position in pixels, in the canvas, of the pen on
+                   the baseline of the first line. y grows downwards.
+
+    :param blend_mode: How glyph coverage is combined with the canvas:
+
+                       - 'max': keep the maximum of the canvas and the glyph
+                         coverage (scaled by the color, or its alpha for RGBA
+                         canvases, whose covered pixels take the color).
+                         Overlapping glyphs do not darken each other.
+
+                       - 'over': composite the color over the canvas, with the
+                         glyph coverage as alpha.
+
+    :param color: The gray level (2D canvas) or the (r, g, b, a) color (RGBA
+                  canvas) of the text.
+
+    :param flags: The load flags. Glyphs must come out as FT_PIXEL_MODE_GRAY
+                  or FT_PIXEL_MODE_MONO bitmaps.
+
+    :param cache: An optional GlyphCache to get the glyphs from.
+
+    :return: The canvas, as a NumPy array sharing memory with 'out'.
+    '''
+    import numpy as np
+
+    if blend_mode not in ('max', 'over'):
+        raise ValueError("blend_mode must be 'max' or 'over'")
+    canvas = out if isinstance(out, np.ndarray) else np.asarray(memoryview(out))
+    if canvas.dtype != np.uint8 or not canvas.flags.writeable:
+        raise ValueError('out must be a writable array of uint8')
+    if canvas.ndim == 3 and canvas.shape[2] == 4:
+        color = np.array(color, dtype=np.uint16).reshape(4)
+    elif canvas.ndim == 2:
+        color = int(color)
+    else:
+        raise ValueError('out must be a 2D or a (rows, columns, 4) array')
+    rows, columns = canvas.shape[:2]
+    origin_x, origin_y = origin
+
+    face_rec = face._FT_Face.contents
+    line_height = face_rec.size.contents.metrics.height
+    kern = face.has_kerning
+    get_kerning = face.get_glyph_kerning
+    if cache is not None:
+        load = lambda gindex: cache.load_glyph( face, gindex, flags )
+    else:
+        load = lambda gindex: face.load_and_snapshot( gindex, flags )
+    x = y = 0
+    previous = None
+    for char, gindex in zip( text, face.get_char_indices(text) ):
+        if char == '\n':
+            x = 0
+            y += line_height
+            previous = None
+            continue
+        if kern and previous is not None:
+            x += get_kerning( previous, gindex )[0]
+        glyph = load( gindex )
+        previous = gindex
+        left = origin_x + ((x + 32) >> 6) + glyph.bitmap_left
+        top = origin_y + ((y + 32) >> 6) - glyph.bitmap_top
+        x += glyph.metrics.horiAdvance
+        # Clip the glyph box to the canvas
+        x0, y0 = max(left, 0), max(top, 0)
+        x1 = min(left + glyph.width, columns)
+        y1 = min(top + glyph.rows, rows)
+        if x0 >= x1 or y0 >= y1:
+            continue
+        pitch = abs(glyph.pitch)
+        bitmap = np.frombuffer(glyph.buffer, dtype=np.uint8)
+        bitmap = bitmap.reshape((glyph.rows, pitch))
+        if glyph.pitch < 0:
+            bitmap = bitmap[::-1]
+        if glyph.pixel_mode == FT_PIXEL_MODE_MONO:
+            bitmap = np.unpackbits(bitmap, axis=1)*np.uint8(255)
+        elif glyph.pixel_mode != FT_PIXEL_MODE_GRAY:
+            raise ValueError('unsupported pixel mode %d' % glyph.pixel_mode)
+        coverage = bitmap[y0-top:y1-top, x0-left:x1-left]
+        _blend( canvas[y0:y1, x0:x1], coverage, blend_mode, color )
+    return canvas
+
+def _blend( dst, coverage, blend_mode, color ):
+    # Combine a region of the canvas with glyph coverage, in place
+    import numpy as np
+
+    # Widen first: with NumPy 1.x, uint8 array * Python int stays uint8
+    coverage = coverage.astype(np.uint16)
+    if dst.ndim == 2:
+        if blend_mode == 'max':
+            if color != 255:
+                coverage = (coverage*color + 127)//255
+            np.maximum( dst, coverage, out=dst, casting='unsafe' )
+        else:
+            dst[...] = (color*coverage + dst*(255 - coverage) + 127)//255
+        return
+    alpha = (coverage*color[3] + 127)//255
+    if blend_mode == 'max':
+        covered = alpha > dst[..., 3]
+        dst[..., :3][covered] = color[:3]
+        dst[..., 3][covered] = alpha[covered]
+    else:
+        alpha = alpha.astype(np.float32)/255
+        dst_alpha = dst[..., 3]/np.float32(255)
+        out_alpha = alpha + dst_alpha*(1 - alpha)
+        weight = np.divide( alpha, out_alpha, out=np.zeros_like(alpha),
+                            where=out_alpha > 0 )[..., None]
+        rgb = color[:3]*weight + dst[..., :3]*(1 - weight)
+        dst[..., :3] = np.rint(rgb)
+        dst[..., 3] = np.rint(out_alpha*255)
+
+
 # -----------------------------------------------------------------------------
 # Classes related to Variable Font support
 #
@@ -0,0 +1,535 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+#
+#  FreeType high-level python API - Copyright 2011-2015 Nicolas P. Rougier
+#  Distributed under the terms of the new BSD license.
+#
+# -----------------------------------------------------------------------------
+'''
+Glyph texture atlas
+
+Pack glyph bitmaps into one or more texture pages, for GPU text rendering.
+Nothing here depends on a graphics API (nor on NumPy): pages are plain
+bytearrays, each with a dirty rectangle telling which part changed since the
+last upload, and the glyph positions, metrics and texture coordinates can be
+exported as packed arrays. generate_sdf_atlas fills an atlas with signed
+distance fields, which can be drawn at any text size.
+
+Rectangles are packed with the Skyline Bottom-Left algorithm, as described by
+Jukka Jylänki in "A Thousand Ways to Pack the Bin - A Practical Approach to
+Two-Dimensional Rectangle Bin Packing" (2010).
+'''
+import os
+from array import array
+from collections import OrderedDict, namedtuple
+
+import freetype
+import freetype.parallel
+
+# Bytes per pixel of the bitmaps of each pixel mode
+_PIXEL_MODE_DEPTHS = {
+    freetype.FT_PIXEL_MODE_MONO: 1,
+    freetype.FT_PIXEL_MODE_GRAY: 1,
+    freetype.FT_PIXEL_MODE_LCD:  3,
+    freetype.FT_PIXEL_MODE_BGRA: 4,
+}
+
+# Expansion of the bits of a byte to 8 bytes of 0 or 255
+_MONO_BYTES = [bytes(255 if byte & (0x80 >> bit) else 0 for bit in range(8))
+               for byte in range(256)]
+
+
+class SkylinePacker(object):
+    '''
+    Skyline Bottom-Left rectangle packer.
+
+    The packer keeps the skyline of the packed rectangles (the top edge of the
+    highest rectangle at each column, y growing downwards) as a list of
+    segments. A new rectangle is put where its bottom edge ends up closest to
+    the top of the area, on the narrowest segment in case of a tie. Each
+    insertion is linear in the number of segments, which stays small.
+    '''
+
+    def __init__( self, width, height ):
+        '''
+        Create a new packer for an area of the given size.
+
+        :param width: The width of the area.
+
+        :param height: The height of the area.
+        '''
+        self.width = width
+        self.height = height
+        self.used = 0
+        # [x, y, width] segments, sorted by x and covering the whole width
+        self._skyline = [[0, 0, width]]
+
+    occupancy = property(lambda self: self.used/float(self.width*self.height),
+       doc = '''The fraction of the area covered by packed rectangles.''')
+
+    def pack( self, width, height ):
+        '''
+        Allocate a rectangle.
+
+        :param width: The width of the rectangle.
+
+        :param height: The height of the rectangle.
+
+        :return: The (x, y) position of the top-left corner of the rectangle,
+                 or None if it does not fit.
+        '''
+        skyline = self._skyline
+        best = None
+        for i, (x, _, segment_width) in enumerate(skyline):
+            if x + width > self.width:
+                break
+            y = self._fit( i, width )
+            if y + height > self.height:
+                continue
+            score = (y + height, segment_width)
+            if best is None or score < best[0]:
+                best = (score, i, x, y)
+        if best is None:
+            return None
+        _, i, x, y = best
+        self._add_segment( i, x, y + height, width )
+        self.used += width*height
+        return x, y
+
+    def _fit( self, index, width ):
+        # Lowest y where a rectangle of this width starting at segment
+        # 'index' rests on the skyline
+        skyline = self._skyline
+        y = 0
+        while width > 0:
+            _, top, segment_width = skyline[index]
+            y = max(y, top)
+            width -= segment_width
+            index += 1
+        return y
+
+    def _add_segment( self, index, x, y, width ):
+        skyline = self._skyline
+        skyline.insert( index, [x, y, width] )
+        right = x + width
+        # Shorten or drop the segments now covered by the new one
+        i = index + 1
+        while i < len(skyline):
+            segment = skyline[i]
+            shrink = right - segment[0]
+            if shrink <= 0:
+                break
+            if segment[2] <= shrink:
+                del skyline[i]
+                continue
+            segment[0] += shrink
+            segment[2] -= shrink
+            break
+        # Merge neighbours at the same height
+        i = 0
+        while i < len(skyline) - 1:
+            if skyline[i][1] == skyline[i+1][1]:
+                skyline[i][2] += skyline[i+1][2]
+                del skyline[i+1]
+            else:
+                i += 1
+
+
+class AtlasPage(object):
+    '''
+    A texture page of an atlas.
+
+    Pixels are stored row by row, top to bottom, in the 'data' bytearray
+    ('depth' bytes per pixel). The page starts blank, and only ever gets new
+    glyphs written to it.
+    '''
+
+    def __init__( self, width, height, depth ):
+        '''
+        Create a new blank page.
+
+        :param width: The width of the page in pixels.
+
+        :param height: The height of the page in pixels.
+
+        :param depth: The number of bytes per pixel.
+        '''
+        self.width = width
+        self.height = height
+        self.depth = depth
+        self.data = bytearray(width*height*depth)
+        self.packer = SkylinePacker( width, height )
+        self.dirty = None
+
+    def to_memoryview( self ):
+        '''
+        Return a (height, width) or (height, width, depth) view of the page
+        pixels.
+        '''
+        shape = (self.height, self.width)
+        if self.depth > 1:
+            shape += (self.depth,)
+        return memoryview(self.data).cast('B', shape)
+
+    def take_dirty( self ):
+        '''
+        Return the (x, y, width, height) rectangle written to since the last
+        call (None if nothing was), and mark the page clean. This is the part
+        of the page to upload again.
+        '''
+        dirty, self.dirty = self.dirty, None
+        return dirty
+
+    def write( self, x, y, width, rows ):
+        '''
+        Copy pixel rows to the page.
+
+        :param x: The column of the left-most pixel.
+
+        :param y: The row of the top-most pixel.
+
+        :param width: The number of pixels per row.
+
+        :param rows: A sequence of bytes-like rows, of width*depth bytes each.
+        '''
+        data = self.data
+        row_bytes = width*self.depth
+        offset = (y*self.width + x)*self.depth
+        stride = self.width*self.depth
+        for row in rows:
+            data[offset:offset+row_bytes] = row
+            offset += stride
+        if width and rows:
+            self._add_dirty( x, y, width, len(rows) )
+
+    def _add_dirty( self, x, y, width, height ):
+        if self.dirty is not None:
+            x0, y0, w0, h0 = self.dirty
+            right = max(x + width, x0 + w0)
+            bottom = max(y + height, y0 + h0)
+            x, y = min(x, x0), min(y, y0)
+            width, height = right - x, bottom - y
+        self.dirty = (x, y, width, height)
+
+
+AtlasGlyph = namedtuple('AtlasGlyph', [
+    'index', 'page', 'x', 'y', 'width', 'height', 'bitmap_left',
+    'bitmap_top', 'advance', 'u0', 'v0', 'u1', 'v1'])
+AtlasGlyph.__doc__ = '''
+    Placement of a glyph in an atlas.
+
+    'index' is the position of the glyph in the tables of the atlas. 'page' is
+    the index of the page holding the glyph bitmap, whose top-left corner is
+    at ('x', 'y') and whose size is 'width' x 'height' pixels (padding
+    excluded). Glyphs without a bitmap (spaces) have a page of -1 and a null
+    size. 'bitmap_left', 'bitmap_top' and 'advance' (an (x, y) tuple, in 26.6
+    pixels) are the glyph slot values. (u0, v0) and (u1, v1) are the texture
+    coordinates of the top-left and bottom-right corners of the bitmap, v
+    growing downwards like y.
+    '''
+
+
+class GlyphAtlas(object):
+    '''
+    Texture atlas of glyph bitmaps.
+
+    Glyphs are added incrementally, with add_glyph/add_text (or insert, given
+    a GlyphSnapshot). Each one is packed, with some padding around it, in the
+    first page it fits in; a new page is started when none has room left.
+
+    Whenever glyphs are added, take_dirty tells which parts of which pages
+    need to be uploaded again, and uv_table/metrics_table export the
+    placement of all the glyphs as packed arrays, ready to be copied to a
+    GPU buffer.
+    '''
+
+    def __init__( self, width=512, height=512, depth=1, padding=1, bleed=0,
+                  max_pages=None ):
+        '''
+        Create a new, empty atlas.
+
+        :param width: The width of the pages in pixels.
+
+        :param height: The height of the pages in pixels.
+
+        :param depth: The number of bytes per pixel: 1 for gray (or mono)
+                      bitmaps, 3 for LCD ones and 4 for BGRA (color) ones.
+
+        :param padding: The number of pixels kept around each glyph, so that
+                        texture filtering does not pick up its neighbours.
+
+        :param bleed: The number of padding pixels (at most 'padding') filled
+                      by repeating the edge pixels of the glyph bitmap, instead
+                      of being left blank.
+
+        :param max_pages: The maximum number of pages, or None for no limit.
+        '''
+        if not 0 <= bleed <= padding:
+            raise ValueError('bleed must be between 0 and padding')
+        self.width = width
+        self.height = height
+        self.depth = depth
+        self.padding = padding
+        self.bleed = bleed
+        self.max_pages = max_pages
+        self.pages = []
+        self._glyphs = OrderedDict()
+
+    def __len__( self ):
+        return len(self._glyphs)
+
+    def __contains__( self, key ):
+        return key in self._glyphs
+
+    def __getitem__( self, key ):
+        return self._glyphs[key]
+
+    def keys( self ):
+        '''
+        Return the keys of the glyphs, in table order.
+        '''
+        return list(self._glyphs)
+
+    def add_glyph( self, face, index, flags = freetype.FT_LOAD_RENDER ):
+        '''
+        Return the placement of a glyph, loading and inserting it first if it
+        is not in the atlas yet.
+
+        :param face: The Face object, set to the wanted size.
+
+        :param index: The glyph index.
+
+        :param flags: The load flags, as in Face.load_glyph. FT_LOAD_RENDER
+                      (or a render mode) is needed to get a bitmap.
+
+        :return: An AtlasGlyph. Glyphs are keyed as in GlyphCache (face, size,
+                 transform, glyph index and load flags).
+        '''
+        key = freetype._glyph_key( face, index, flags )
+        glyph = self._glyphs.get(key)
+        if glyph is None:
+            glyph = self.insert( key, face.load_and_snapshot( index, flags ) )
+        return glyph
+
+    def add_text( self, face, text, flags = freetype.FT_LOAD_RENDER ):
+        '''
+        Add the glyphs of all the characters of a string. See add_glyph.
+
+        :return: The list of the AtlasGlyph of the characters.
+        '''
+        return [self.add_glyph( face, index, flags )
+                for index in face.get_char_indices(text)]
+
+    def insert( self, key, snapshot ):
+        '''
+        Insert the bitmap of a glyph.
+
+        :param key: Any hashable key identifying the glyph in the atlas.
+
+        :param snapshot: A GlyphSnapshot (see Face.load_and_snapshot).
+
+        :return: An AtlasGlyph.
+        '''
+        if key in self._glyphs:
+            raise ValueError('glyph %r is already in the atlas' % (key,))
+        depth = _PIXEL_MODE_DEPTHS.get(snapshot.pixel_mode)
+        if snapshot.buffer and depth != self.depth:
+            raise ValueError('pixel mode %d does not match an atlas depth of %d'
+                             % (snapshot.pixel_mode, self.depth))
+        width = snapshot.width
+        if snapshot.pixel_mode == freetype.FT_PIXEL_MODE_LCD:
+            width //= 3
+        height = snapshot.rows
+        if not snapshot.buffer or not width or not height:
+            page = -1
+            x = y = width = height = 0
+            u0 = v0 = u1 = v1 = 0.0
+        else:
+            page, x, y = self._allocate( width, height )
+            self._write( self.pages[page], x, y, width, height, snapshot )
+            u0, v0 = x/float(self.width), y/float(self.height)
+            u1 = (x + width)/float(self.width)
+            v1 = (y + height)/float(self.height)
+        glyph = AtlasGlyph( len(self._glyphs), page, x, y, width, height,
+                            snapshot.bitmap_left, snapshot.bitmap_top,
+                            snapshot.advance, u0, v0, u1, v1 )
+        self._glyphs[key] = glyph
+        return glyph
+
+    def _allocate( self, width, height ):
+        # Position of the bitmap (padding excluded) in a page with room left
+        padding = self.padding
+        outer_width, outer_height = width + 2*padding, height + 2*padding
+        if outer_width > self.width or outer_height > self.height:
+            raise ValueError('a %dx%d glyph does not fit in a %dx%d page'
+                             % (width, height, self.width, self.height))
+        for index, page in enumerate(self.pages):
+            position = page.packer.pack( outer_width, outer_height )
+            if position is not None:
+                break
+        else:
+            if self.max_pages is not None and len(self.pages) >= self.max_pages:
+                raise ValueError('the atlas is full')
+            page = AtlasPage( self.width, self.height, self.depth )
+            self.pages.append( page )
+            index = len(self.pages) - 1
+            position = page.packer.pack( outer_width, outer_height )
+        return index, position[0] + padding, position[1] + padding
+
+    def _write( self, page, x, y, width, height, snapshot ):
+        pitch, buffer = abs(snapshot.pitch), snapshot.buffer
+        if snapshot.pixel_mode == freetype.FT_PIXEL_MODE_MONO:
+            size = (width + 7)//8
+            rows = [b''.join([_MONO_BYTES[byte] for byte in
+                              bytearray(buffer[i*pitch:i*pitch+size])])[:width]
+                    for i in range(height)]
+        else:
+            size = width*self.depth
+            rows = [buffer[i*pitch:i*pitch+size] for i in range(height)]
+        if snapshot.pitch < 0:
+            rows.reverse()
+        bleed = self.bleed
+        if bleed:
+            depth = self.depth
+            rows = [row[:depth]*bleed + row + row[-depth:]*bleed
+                    for row in rows]
+            rows = [rows[0]]*bleed + rows + [rows[-1]]*bleed
+            x, y, width = x - bleed, y - bleed, width + 2*bleed
+        page.write( x, y, width, rows )
+
+    def take_dirty( self ):
+        '''
+        Return the list of the (page index, (x, y, width, height)) rectangles
+        written to since the last call, one per modified page, and mark all the
+        pages clean.
+        '''
+        dirty = []
+        for index, page in enumerate(self.pages):
+            rectangle = page.take_dirty()
+            if rectangle is not None:
+                dirty.append( (index, rectangle) )
+        return dirty
+
+    def uv_table( self ):
+        '''
+        Return the texture coordinates of all the glyphs, in table order, as
+        an array.array of floats holding (u0, v0, u1, v1) for each glyph.
+        '''
+        table = array('f')
+        for glyph in self._glyphs.values():
+            table.extend( glyph[-4:] )
+        return table
+
+    def metrics_table( self ):
+        '''
+        Return the placement of all the glyphs, in table order, as an
+        array.array of signed longs holding (page, x, y, width, height,
+        bitmap_left, bitmap_top, advance x, advance y) for each glyph.
+        '''
+        table = array('l')
+        for glyph in self._glyphs.values():
+            table.extend( glyph[1:8] )
+            table.extend( glyph.advance )
+        return table
+
+
+def _sdf_glyphs( face, charset ):
+    # Load flags and distinct glyph indices of a charset for generate_sdf_atlas
+    flags = (freetype.FT_LOAD_RENDER | freetype.FT_LOAD_NO_HINTING
+             | freetype.FT_RENDER_MODE_SDF << 16)
+    if face.is_scalable:
+        flags |= freetype.FT_LOAD_NO_BITMAP
+    return flags, list(OrderedDict.fromkeys(face.get_char_indices(charset)))
+
+
+def generate_sdf_atlas( face, charset, size, spread=8, width=512, height=512,
+                        padding=1, max_pages=None, workers=None,
+                        executor='process', index=0 ):
+    '''
+    Render the signed distance fields (FT_RENDER_MODE_SDF, FreeType 2.11+) of
+    a set of characters into a new atlas.
+
+    A distance field can be drawn at any size, by scaling its quad and
+    thresholding the sampled distance at 128 in a shader, so a single atlas
+    rendered at a moderate size replaces one bitmap atlas per text size.
+
+    :param face: A Face object, or the path to a font file. The glyphs of a
+                 Face are rendered in the calling thread (the active size of
+                 the face is left untouched). The glyphs of a font file are
+                 rendered with freetype.parallel.render_glyphs, over 'workers'
+                 workers.
+
+    :param charset: A string holding the characters to render.
+
+    :param size: The pixel size at which the fields are rendered (as in
+                 Face.set_pixel_sizes(0, size)).
+
+    :param spread: The spread of the fields, in pixels (see
+                   freetype.set_sdf_spread). Bitmaps grow by that much on each
+                   side, and must be scaled along with the quad.
+
+    :param width: The width of the pages in pixels.
+
+    :param height: The height of the pages in pixels.
+
+    :param padding: The number of pixels kept around each glyph.
+
+    :param max_pages: The maximum number of pages, or None for no limit.
+
+    :param workers: The number of workers, when 'face' is a path. Defaults to
+                    the number of CPUs.
+
+    :param executor: 'process' or 'thread', when 'face' is a path.
+
+    :param index: The index of the face within the font, when 'face' is a
+                  path.
+
+    :return: A GlyphAtlas of depth 1, with the glyphs keyed by glyph index (as
+             in the runs of freetype.layout.layout_text). Placement metrics
+             are in pixels at 'size'; multiply them by text size/'size' to
+             draw at another size.
+
+    **Note**:
+
+      Glyphs are loaded without hinting, since hinting for 'size' would
+      distort them at other sizes, and the field of outline glyphs is
+      computed from the outline (embedded bitmaps are skipped). Each glyph is
+      stored once, however many characters map to it.
+    '''
+    if freetype.version() < (2, 11, 0):
+        raise RuntimeError('signed distance fields require freetype >= 2.11.0')
+    if not isinstance(face, freetype.Face):
+        path = face
+        # Only opened for the charmap: glyphs are rendered by the workers
+        with freetype.Face(path, index) as face:
+            flags, glyph_ids = _sdf_glyphs(face, charset)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        # Fields are slow to compute, hand out a few chunks per worker
+        chunk_size = max(1, len(glyph_ids)//(4*workers))
+        properties = (('sdf', 'spread', spread), ('bsdf', 'spread', spread))
+        snapshots = [snapshot for _, snapshot in freetype.parallel.render_glyphs(
+            path, glyph_ids, [size], flags, workers, index, executor,
+            chunk_size, properties)]
+    else:
+        flags, glyph_ids = _sdf_glyphs(face, charset)
+        library = face._library
+        previous = [(module_name, freetype.get_property(module_name, 'spread',
+                                                        library=library))
+                    for module_name in ('sdf', 'bsdf')]
+        face_size = face.new_size()
+        face_size.set_pixel_sizes(0, size)
+        freetype.set_sdf_spread(spread, library)
+        try:
+            with face_size:
+                snapshots = [face.load_and_snapshot(glyph_id, flags)
+                             for glyph_id in glyph_ids]
+        finally:
+            for module_name, value in previous:
+                freetype.set_property(module_name, 'spread', value, library)
+    # Tallest first, which packs tighter with a skyline
+    snapshots.sort(key=lambda snapshot: snapshot.rows, reverse=True)
+    atlas = GlyphAtlas( width, height, 1, padding, 0, max_pages )
+    for snapshot in snapshots:
+        atlas.insert( snapshot.glyph_index, snapshot )
+    return atlas
@@ -97,6 +97,8 @@ TT_NAME_IDS: Possible values of the `name' identifier field in the name
              records of the TTF `name' table.  These values are platform
              independent.
 '''
+from importlib import import_module as _import_module
+
 from freetype.ft_enums.ft_color_root_transform import *
 from freetype.ft_enums.ft_curve_tags import *
 from freetype.ft_enums.ft_fstypes import *
@@ -116,11 +118,51 @@ from freetype.ft_enums.ft_stroker_borders import *
 from freetype.ft_enums.ft_stroker_linecaps import *
 from freetype.ft_enums.ft_stroker_linejoins import *
 from freetype.ft_enums.ft_style_flags import *
-from freetype.ft_enums.tt_adobe_ids import *
-from freetype.ft_enums.tt_apple_ids import *
-from freetype.ft_enums.tt_mac_ids import *
-from freetype.ft_enums.tt_ms_ids import *
-from freetype.ft_enums.tt_ms_langids import *
-from freetype.ft_enums.tt_mac_langids import *
-from freetype.ft_enums.tt_name_ids import *
-from freetype.ft_enums.tt_platforms import *
+
+# Names of the enums imported above. "from freetype.ft_enums import *" also
+# gets the TT_* tables below, through __getattr__('__all__'), while
+# freetype.raw only copies these ones.
+_eager_names = [name for name in globals() if not name.startswith('_')]
+
+# The TT_* tables (platform, encoding, language and name IDs) are only needed
+# to interpret names and charmaps, and are imported on first use: modules by
+# name prefix
+_lazy_modules = {
+    'TT_ADOBE_ID'   : 'tt_adobe_ids',
+    'TT_APPLE_ID'   : 'tt_apple_ids',
+    'TT_MAC_ID'     : 'tt_mac_ids',
+    'TT_MS_ID'      : 'tt_ms_ids',
+    'TT_MS_LANGID'  : 'tt_ms_langids',
+    'TT_MAC_LANGID' : 'tt_mac_langids',
+    'TT_NAME_ID'    : 'tt_name_ids',
+    'TT_PLATFORM'   : 'tt_platforms',
+}
+
+def _load(module):
+    # Import a lazy module and add its names to the package, return them
+    module = _import_module(__name__ + '.' + module)
+    names = dict((name, value) for name, value in vars(module).items()
+                 if not name.startswith('_'))
+    globals().update(names)
+    return list(names)
+
+def _load_all():
+    # Import all the lazy modules, return the names they define
+    names = []
+    for module in _lazy_modules.values():
+        names.extend(_load(module))
+    return names
+
+def __getattr__(name):
+    if name == '__all__':
+        return _eager_names + _load_all()
+    for prefix, module in _lazy_modules.items():
+        if name.startswith(prefix) or name == module:
+            _load(module)
+            if name in globals():
+                return globals()[name]
+    raise AttributeError('module {!r} has no attribute {!r}'.format(
+        __name__, name))
+
+def __dir__():
+    return sorted(set(globals()) | set(_load_all()))
@@ -56,6 +56,11 @@ FT_RENDER_MODE_SDF
   the pixel and are positive if they are filled by the outline (i.e., inside
   the outline) and negative otherwise. Check the note below on how to convert
   the output values to usable data.
+
+  Note: the output is stored as unsigned bytes, where 128 lies on the outline:
+  a value v is at (v - 128) * spread / 128 pixels from it, where 'spread' (8 by
+  default, see set_sdf_spread) is also the number of pixels added on each side
+  of the glyph bitmap. Requires FreeType 2.11 or later.
 """
 FT_RENDER_MODES = { 'FT_RENDER_MODE_NORMAL' : 0,
                     'FT_RENDER_MODE_LIGHT'  : 1,
@@ -52,11 +52,21 @@ FT_Parameter: A simple structure used to pass more or less generic parameters
 FT_Open_Args: A structure used to indicate how to open a new font file or
               stream.
 
+FT_Stream: A handle to an input stream.
+
 FT_SfntName: A structure used to model an SFNT 'name' table entry.
 
 FT_Stroker: Opaque handler to a path stroker object.
 
 FT_BitmapGlyph: A structure used for bitmap glyph images.
+
+FTC_Manager: Opaque handle to a cache manager object.
+
+FTC_ImageType: A structure used to model the type of images in a glyph cache.
+
+FTC_Scaler: A structure used to describe a given character size.
+
+FTC_SBit: A structure used to describe a small glyph bitmap.
 '''
 from freetype.ft_types import *
 
@@ -889,6 +899,74 @@ FT_Parameter_p = POINTER(FT_Parameter)
 
 
 
+# -----------------------------------------------------------------------------
+# A union type used to store either a long or a pointer. This is used to store
+# a file descriptor or a 'FILE*' in an input stream.
+class FT_StreamDesc(Union):
+    '''
+    A union type used to store either a long or a pointer. This is used to
+    store a file descriptor or a 'FILE*' in an input stream.
+    '''
+    _fields_ = [
+        ('value',   c_long),
+        ('pointer', c_void_p) ]
+
+
+
+# -----------------------------------------------------------------------------
+# A structure used to describe an input stream. When 'base' is NULL, FreeType
+# calls the 'read' function to access the stream data.
+class FT_StreamRec(Structure):
+    '''
+    A structure used to describe an input stream.
+
+    base: For memory-based streams, this is the address of the first stream
+          byte in memory. This field should always be set to NULL for
+          disk-based streams.
+
+    size: The stream size in bytes.
+
+    pos: The current position within the stream.
+
+    descriptor: This field is a union that can hold an integer or a pointer. It
+                is used by stream implementations to store file descriptors or
+                'FILE*' pointers.
+
+    pathname: This field is completely ignored by FreeType. However, it is
+              often useful during debugging to use it to store the stream's
+              filename (where available).
+
+    read: The stream's input function.
+
+    close: The stream's close function.
+
+    memory: The memory manager to use to preload frames. This is set
+            internally by FreeType and shouldn't be touched by stream
+            implementations.
+    '''
+FT_Stream = POINTER(FT_StreamRec)
+
+# A function used to seek and read data from a given input stream. A 'count'
+# of 0 means a seek operation, which returns 0 in case of success.
+FT_Stream_IoFunc = CFUNCTYPE(c_ulong, FT_Stream, c_ulong, c_void_p, c_ulong)
+
+# A function used to close a given input stream.
+FT_Stream_CloseFunc = CFUNCTYPE(None, FT_Stream)
+
+FT_StreamRec._fields_ = [
+    ('base',       POINTER(c_ubyte)),
+    ('size',       c_ulong),
+    ('pos',        c_ulong),
+    ('descriptor', FT_StreamDesc),
+    ('pathname',   FT_StreamDesc),
+    ('read',       FT_Stream_IoFunc),
+    ('close',      FT_Stream_CloseFunc),
+    ('memory',     c_void_p),
+    ('cursor',     POINTER(c_ubyte)),
+    ('limit',      POINTER(c_ubyte)) ]
+
+
+
 # -----------------------------------------------------------------------------
 # A structure used to indicate how to open a new font file or stream. A pointer
 # to such a structure can be used as a parameter for the functions FT_Open_Face
@@ -1069,3 +1147,149 @@ class FT_LayerIterator(Structure):
     _fields_ = [('num_layers',            FT_UInt),
                 ('layer',                 FT_UInt),
                 ('p',                     POINTER(FT_Byte))]
+
+
+
+# -----------------------------------------------------------------------------
+# Structures related to the cache sub-system. See "freetype/ftcache.h".
+#
+# An opaque pointer type that is used to identity face objects. The contents
+# of such objects is application-dependent.
+FTC_FaceID = c_void_p
+
+# A callback function provided by client applications. It is used by the cache
+# manager to translate a given FTC_FaceID into a new valid FT_Face object, on
+# demand.
+FTC_Face_Requester = CFUNCTYPE(FT_Error, FTC_FaceID, FT_Library, FT_Pointer,
+                               POINTER(FT_Face))
+
+class FTC_ManagerRec(Structure):
+    '''
+    Opaque handle to a cache manager object. The cache manager controls the
+    lifetime of the faces and sizes it creates, as well as the caches built on
+    top of it.
+    '''
+    _fields_ = [ ]
+FTC_Manager = POINTER(FTC_ManagerRec)
+
+class FTC_NodeRec(Structure):
+    '''
+    Opaque handle to a cache node object.
+    '''
+    _fields_ = [ ]
+FTC_Node = POINTER(FTC_NodeRec)
+
+class FTC_CMapCacheRec(Structure):
+    '''
+    Opaque handle to a charmap cache, used to cache character code to glyph
+    index mappings.
+    '''
+    _fields_ = [ ]
+FTC_CMapCache = POINTER(FTC_CMapCacheRec)
+
+class FTC_ImageCacheRec(Structure):
+    '''
+    Opaque handle to a glyph image cache.
+    '''
+    _fields_ = [ ]
+FTC_ImageCache = POINTER(FTC_ImageCacheRec)
+
+class FTC_SBitCacheRec(Structure):
+    '''
+    Opaque handle to a small bitmap cache.
+    '''
+    _fields_ = [ ]
+FTC_SBitCache = POINTER(FTC_SBitCacheRec)
+
+
+class FTC_ImageTypeRec(Structure):
+    '''
+    A structure used to model the type of images in a glyph cache.
+
+    face_id: The face ID.
+
+    width: The width in pixels.
+
+    height: The height in pixels.
+
+    flags: The load flags, as in FT_Load_Glyph.
+    '''
+    _fields_ = [
+        ('face_id', FTC_FaceID),
+        ('width',   FT_UInt),
+        ('height',  FT_UInt),
+        ('flags',   FT_Int32) ]
+FTC_ImageType = POINTER(FTC_ImageTypeRec)
+
+
+class FTC_ScalerRec(Structure):
+    '''
+    A structure used to describe a given character size in either pixels or
+    points to the cache manager.
+
+    face_id: The source face ID.
+
+    width: The character width.
+
+    height: The character height.
+
+    pixel: A Boolean. If 1, the 'width' and 'height' fields are interpreted as
+           integer pixel character sizes. Otherwise, they are expressed as
+           1/64th of points.
+
+    x_res: Only used when 'pixel' is value 0 to indicate the horizontal
+           resolution in dpi.
+
+    y_res: Only used when 'pixel' is value 0 to indicate the vertical
+           resolution in dpi.
+    '''
+    _fields_ = [
+        ('face_id', FTC_FaceID),
+        ('width',   FT_UInt),
+        ('height',  FT_UInt),
+        ('pixel',   FT_Int),
+        ('x_res',   FT_UInt),
+        ('y_res',   FT_UInt) ]
+FTC_Scaler = POINTER(FTC_ScalerRec)
+
+
+class FTC_SBitRec(Structure):
+    '''
+    A very compact structure used to describe a small glyph bitmap.
+
+    width: The bitmap width in pixels.
+
+    height: The bitmap height in pixels.
+
+    left: The horizontal distance from the pen position to the left bitmap
+          border (a.k.a. 'left side bearing', or 'lsb').
+
+    top: The vertical distance from the pen position (on the baseline) to the
+         upper bitmap border (a.k.a. 'top side bearing'). The distance is
+         positive for upwards y coordinates.
+
+    format: The format of the glyph bitmap (monochrome or gray).
+
+    max_grays: Maximum gray level value (in the range 1 to 255).
+
+    pitch: The number of bytes per bitmap line. May be positive or negative.
+
+    xadvance: The horizontal advance width in pixels.
+
+    yadvance: The vertical advance height in pixels.
+
+    buffer: A pointer to the bitmap pixels.
+    '''
+    # FT_Char fields are declared as c_byte so that they read as integers
+    _fields_ = [
+        ('width',     FT_Byte),
+        ('height',    FT_Byte),
+        ('left',      c_byte),
+        ('top',       c_byte),
+        ('format',    FT_Byte),
+        ('max_grays', FT_Byte),
+        ('pitch',     FT_Short),
+        ('xadvance',  c_byte),
+        ('yadvance',  c_byte),
+        ('buffer',    POINTER(FT_Byte)) ]
+FTC_SBit = POINTER(FTC_SBitRec)
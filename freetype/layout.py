@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+#
+#  FreeType high-level python API - Copyright 2011-2015 Nicolas P. Rougier
+#  Distributed under the terms of the new BSD license.
+#
+# -----------------------------------------------------------------------------
+'''
+Text layout
+
+Turn a string into a run of positioned glyphs: character codes are mapped to
+glyph indices, and glyphs are placed one after the other using their advance
+widths and the pair kerning of the face. There is no shaping (no ligatures,
+no contextual forms, no bidi): one character gives one glyph.
+
+Layout is done in font units, with the (unhinted) advances and kerning of the
+font, and only scaled to the requested size at the end, so that rounding
+errors do not accumulate along a line. No glyph is loaded, let alone
+rendered, and the active size of the face is left untouched.
+'''
+from array import array
+
+import freetype
+
+# Number of items per glyph in the arrays returned by layout_text
+GLYPH_STRIDE = 4
+
+
+def layout_text(face, text, size, features=('kern',)):
+    '''
+    Lay out a string of text.
+
+    :param face: A scalable Face.
+
+    :param text: A string. Newline characters start a new line.
+
+    :param size: The size in pixels (the ppem, as in Face.set_pixel_sizes). It
+                 does not need to be an integer.
+
+    :param features: A collection of OpenType feature tags. Only 'kern' (pair
+                     kerning, from the 'kern' table) is supported; other tags
+                     are ignored. Pass an empty tuple to disable kerning.
+
+    :return: An array.array of signed longs holding GLYPH_STRIDE (4) items per
+             glyph: the glyph index, the x and y position of its origin and its
+             advance width. Positions and advances are in 26.6 fractional
+             pixels; y grows upwards, so that lines after the first have
+             negative y positions. Use
+             numpy.frombuffer(run, dtype=run.typecode).reshape(-1, 4) for a 2D
+             view.
+
+    **Note**:
+
+      Positions are not rounded to whole pixels. Round them (add 32 and shift
+      right by 6) to place hinted bitmaps, or use them as they are for
+      subpixel positioning.
+    '''
+    if not face.is_scalable:
+        raise ValueError('layout_text requires a scalable face')
+    scale = size*64.0/face.units_per_EM
+    kern = 'kern' in features and face.has_kerning
+    advances = face._advance_memo
+    kerning = face._kerning_cache
+    get_advance = face.get_advance
+    get_kerning = face.get_glyph_kerning
+    flags = freetype.FT_LOAD_NO_SCALE
+    mode = freetype.FT_KERNING_UNSCALED
+    line_height = face.height*scale
+    run = array('l')
+    append = run.append
+    for line, chars in enumerate(text.split('\n')):
+        y = int(round(-line*line_height))
+        x = 0
+        previous = None
+        for gindex in face.get_char_indices(chars):
+            if kern and previous is not None:
+                key = (previous, gindex, mode)
+                pair = kerning.get(key)
+                if pair is None:
+                    pair = get_kerning(*key)
+                x += pair[0]
+            advance = advances.get(gindex)
+            if advance is None:
+                advance = advances[gindex] = get_advance(gindex, flags)
+            append(gindex)
+            append(int(round(x*scale)))
+            append(y)
+            append(int(round(advance*scale)))
+            x += advance
+            previous = gindex
+    return run
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+#
+#  FreeType high-level python API - Copyright 2011-2015 Nicolas P. Rougier
+#  Distributed under the terms of the new BSD license.
+#
+# -----------------------------------------------------------------------------
+'''
+Parallel glyph rasterization
+
+Render large glyph sets (full charmaps, several sizes) over a pool of worker
+processes or threads. Each worker opens its own Face, in its own FT_Library,
+and keeps it (with one Size object per requested size) for the lifetime of
+the pool. With a single worker, glyphs are rendered in the calling thread,
+and its faces are closed when the call returns.
+
+Note: with the 'process' executor on platforms that spawn new interpreters
+      (Windows, macOS), render_glyphs must be called from code protected by
+      an "if __name__ == '__main__':" guard.
+'''
+import functools
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+
+import freetype
+
+# Faces of a pool process, kept for the lifetime of the process. Faces opened
+# in the calling thread or in pool threads are only kept for one call, in a
+# dictionary of their own, so that they are closed when the call returns
+_process_faces = dict()
+
+
+def _get_worker_size(faces, font_path, index, size):
+    # Face (in the library of the calling thread) and Size objects of the
+    # calling worker
+    key = (threading.get_ident(), font_path, index)
+    entry = faces.get(key)
+    if entry is None:
+        library = freetype.get_thread_library()
+        entry = faces[key] = (freetype.Face(font_path, index, library), {})
+    face, sizes = entry
+    face_size = sizes.get(size)
+    if face_size is None:
+        face_size = sizes[size] = face.new_size()
+        face_size.set_pixel_sizes(0, size)
+    return face, face_size
+
+
+def _render_chunk(task, faces=_process_faces):
+    font_path, index, size, flags, properties, glyph_ids = task
+    face, face_size = _get_worker_size(faces, font_path, index, size)
+    # The library may be the one of the calling thread: properties are only
+    # set for this chunk
+    library = face._library
+    previous = []
+    for module_name, property_name, value in properties:
+        ctype = freetype.FT_Int if isinstance(value, int) else type(value)
+        old = freetype.get_property(module_name, property_name, ctype, library)
+        if not isinstance(old, ctype):
+            old = ctype(old)
+        previous.append((module_name, property_name, old))
+        freetype.set_property(module_name, property_name, value, library)
+    try:
+        face_size.activate()
+        load_and_snapshot = face.load_and_snapshot
+        return [load_and_snapshot(glyph_id, flags) for glyph_id in glyph_ids]
+    finally:
+        for module_name, property_name, old in reversed(previous):
+            freetype.set_property(module_name, property_name, old, library)
+
+
+def render_glyphs(font_path, glyph_ids, sizes, flags=freetype.FT_LOAD_RENDER,
+                  workers=None, index=0, executor='process', chunk_size=64,
+                  properties=()):
+    '''
+    Render a set of glyphs at several sizes in parallel.
+
+    :param font_path: A path to the font file.
+
+    :param glyph_ids: A sequence of glyph indices.
+
+    :param sizes: A sequence of pixel sizes (as in Face.set_pixel_sizes(0,
+                  size)).
+
+    :param flags: The load flags, as in Face.load_glyph.
+
+    :param workers: The number of workers. Defaults to the number of CPUs. With
+                    1 worker, glyphs are rendered in the calling thread.
+
+    :param index: The index of the face within the font.
+
+    :param executor: 'process' (the default) to render in worker processes,
+                     which scales across cores, or 'thread' to render in
+                     worker threads, each with its own FT_Library.
+
+    :param chunk_size: The number of glyphs handed to a worker at once.
+
+    :param properties: A sequence of (module name, property name, value)
+                       tuples, set (see freetype.set_property) on the library
+                       of each worker before it renders, e.g. (('sdf',
+                       'spread', 16),) along with FT_RENDER_MODE_SDF as load
+                       target. Their previous values are restored after each
+                       chunk, since with 1 worker (or the 'thread' executor)
+                       that library is the one of a thread that outlives the
+                       call, such as the calling thread.
+
+    :return: An iterator of (size, GlyphSnapshot) tuples, in order: all the
+             glyphs at the first size, then all the glyphs at the second size,
+             etc. Results are streamed as soon as they are available in that
+             order.
+    '''
+    if executor not in ('process', 'thread'):
+        raise ValueError("executor must be 'process' or 'thread'")
+    font_path = os.path.abspath(font_path)
+    glyph_ids = list(glyph_ids)
+    properties = tuple(properties)
+    tasks = []
+    for size in sizes:
+        for i in range(0, len(glyph_ids), chunk_size):
+            tasks.append((font_path, index, size, flags, properties,
+                          glyph_ids[i:i+chunk_size]))
+    if workers is None:
+        workers = os.cpu_count() or 1
+    return _iter_results(tasks, workers, executor)
+
+
+def _iter_results(tasks, workers, executor):
+    faces = dict()
+    render_chunk = functools.partial(_render_chunk, faces=faces)
+    pool = None
+    pending = deque()
+    try:
+        if workers <= 1:
+            for task in tasks:
+                for record in render_chunk(task):
+                    yield task[2], record
+            return
+        if executor == 'process':
+            pool = ProcessPoolExecutor(workers)
+            function = _render_chunk
+        else:
+            pool = ThreadPoolExecutor(workers)
+            function = render_chunk
+        # Only a few chunks per worker are submitted ahead of the results
+        # consumed, so that a caller stopping early does not wait for the
+        # whole job to be rendered
+        queue = iter(tasks)
+        for task in islice(queue, 2*workers):
+            pending.append((task, pool.submit(function, task)))
+        while pending:
+            task, future = pending.popleft()
+            records = future.result()
+            for next_task in islice(queue, 1):
+                pending.append((next_task, pool.submit(function, next_task)))
+            for record in records:
+                yield task[2], record
+    finally:
+        for task, future in pending:
+            future.cancel()
+        if pool is not None:
+            pool.shutdown()
+        for face, sizes in faces.values():
+            face.close()
@@ -9,47 +9,63 @@ Freetype raw API
 This is the raw ctypes freetype binding.
 '''
 import os
-import platform
+import sys
 from ctypes import *
-import ctypes.util
+import ctypes
 
 import freetype
 from freetype.ft_types import *
-from freetype.ft_enums import *
+from freetype import ft_enums as _ft_enums
+# Not "from freetype.ft_enums import *", which would import the TT_* tables as
+# well: they are forwarded on first use, see __getattr__ below
+globals().update((name, getattr(_ft_enums, name))
+                 for name in _ft_enums._eager_names)
 from freetype.ft_errors import *
 from freetype.ft_structs import *
 
 # First, look for a bundled FreeType shared object on the top-level of the
 # installed freetype-py module.
-system = platform.system()
-if system == 'Windows':
+if sys.platform == 'win32':
     library_name = 'libfreetype.dll'
-elif system == 'Darwin':
+elif sys.platform == 'darwin':
     library_name = 'libfreetype.dylib'
 else:
     library_name = 'libfreetype.so'
 
 filename = os.path.join(os.path.dirname(freetype.__file__), library_name)
+_lib = None
 
 # If no bundled shared object is found, look for a system-wide installed one.
-if not os.path.exists(filename):
+if not os.path.exists(filename) and sys.platform.startswith('linux'):
+    # Try the usual soname first: ctypes.util.find_library is slow to import
+    # and runs ldconfig, which is a significant part of the import time
+    try:
+        _lib = ctypes.CDLL('libfreetype.so.6')
+        filename = 'libfreetype.so.6'
+    except OSError:
+        pass
+
+if _lib is None and not os.path.exists(filename):
+    import ctypes.util
+
     # on windows all ctypes does when checking for the library
     # is to append .dll to the end and look for an exact match
     # within any entry in PATH.
     filename = ctypes.util.find_library('freetype')
 
     if filename is None:
-        if platform.system() == 'Windows':
+        if sys.platform == 'win32':
             # Check current working directory for dll as ctypes fails to do so
             filename = os.path.join(os.path.realpath('.'), "freetype.dll")
         else:
             filename = library_name
 
-try:
-    _lib = ctypes.CDLL(filename)
-except (OSError, TypeError):
-    _lib = None
-    raise RuntimeError('Freetype library not found')
+if _lib is None:
+    try:
+        _lib = ctypes.CDLL(filename)
+    except (OSError, TypeError):
+        _lib = None
+        raise RuntimeError('Freetype library not found')
 
 FT_Init_FreeType       = _lib.FT_Init_FreeType
 FT_Done_FreeType       = _lib.FT_Done_FreeType
@@ -126,6 +142,11 @@ try:
     FT_Get_Advance         = _lib.FT_Get_Advance
 except AttributeError:
     pass
+try:
+    FT_Get_Advances        = _lib.FT_Get_Advances
+except AttributeError:
+    # Face.get_advances falls back to FT_Get_Advance
+    FT_Get_Advances        = None
 
 
 FT_Outline_GetInsideBorder  = _lib.FT_Outline_GetInsideBorder
@@ -212,6 +233,29 @@ FTC_Node_Unref                 = _lib.FTC_Node_Unref
 FTC_SBitCache_Lookup           = _lib.FTC_SBitCache_Lookup
 FTC_SBitCache_New              = _lib.FTC_SBitCache_New
 
+FTC_CMapCache_Lookup.argtypes     = [FTC_CMapCache, FTC_FaceID, FT_Int, FT_UInt32]
+FTC_CMapCache_Lookup.restype      = FT_UInt
+FTC_CMapCache_New.argtypes        = [FTC_Manager, POINTER(FTC_CMapCache)]
+FTC_ImageCache_Lookup.argtypes    = [FTC_ImageCache, FTC_ImageType, FT_UInt,
+                                     POINTER(FT_Glyph), POINTER(FTC_Node)]
+FTC_ImageCache_New.argtypes       = [FTC_Manager, POINTER(FTC_ImageCache)]
+FTC_Manager_Done.argtypes         = [FTC_Manager]
+FTC_Manager_Done.restype          = None
+FTC_Manager_LookupFace.argtypes   = [FTC_Manager, FTC_FaceID, POINTER(FT_Face)]
+FTC_Manager_LookupSize.argtypes   = [FTC_Manager, FTC_Scaler, POINTER(FT_Size)]
+FTC_Manager_New.argtypes          = [FT_Library, FT_UInt, FT_UInt, FT_ULong,
+                                     FTC_Face_Requester, FT_Pointer,
+                                     POINTER(FTC_Manager)]
+FTC_Manager_RemoveFaceID.argtypes = [FTC_Manager, FTC_FaceID]
+FTC_Manager_RemoveFaceID.restype  = None
+FTC_Manager_Reset.argtypes        = [FTC_Manager]
+FTC_Manager_Reset.restype         = None
+FTC_Node_Unref.argtypes           = [FTC_Node, FTC_Manager]
+FTC_Node_Unref.restype            = None
+FTC_SBitCache_Lookup.argtypes     = [FTC_SBitCache, FTC_ImageType, FT_UInt,
+                                     POINTER(FTC_SBit), POINTER(FTC_Node)]
+FTC_SBitCache_New.argtypes        = [FTC_Manager, POINTER(FTC_SBitCache)]
+
 FT_Activate_Size               = _lib.FT_Activate_Size
 FT_Add_Default_Modules         = _lib.FT_Add_Default_Modules
 FT_Add_Module                  = _lib.FT_Add_Module
@@ -265,7 +309,7 @@ try:
     FT_Face_GetVariantsOfChar.restype  = POINTER(FT_UInt32)
 
     FT_Face_GetCharsOfVariant          = _lib.FT_Face_GetCharsOfVariant
-    FT_Face_GetVariantsOfChar.argtypes = [FT_Face, FT_ULong]
+    FT_Face_GetCharsOfVariant.argtypes = [FT_Face, FT_ULong]
     FT_Face_GetCharsOfVariant.restype  = POINTER(FT_UInt32)
 except AttributeError:
     pass
@@ -336,3 +380,278 @@ FT_Vector_Transform            = _lib.FT_Vector_Transform
 FT_Vector_Unit                 = _lib.FT_Vector_Unit
 
 # Wholesale import ends
+
+
+# Prototypes of the functions above, from the FreeType headers. With
+# argtypes/restype set, ctypes checks and converts arguments to their C types,
+# and FT_Long/FT_Fixed/pointer results are not truncated to a C int. Types
+# that are not wrapped by this module are passed as c_void_p, untyped byte
+# buffers as c_void_p (so that bytes and ctypes arrays can be given), and
+# FT_Bool as an unsigned char (FT_Bool is a c_char in ft_types). Functions
+# missing from the FreeType build are skipped.
+_FT_Bool_Arg = c_ubyte
+
+# Functions called once per glyph (or glyph pair) by the Face methods: argument
+# conversion through argtypes costs 0.4-1 us per call, more than the call
+# itself for some of them, so only their restype is set. Their callers pass
+# plain Python ints and FT_Face pointers, which ctypes converts correctly
+# without prototypes.
+_per_glyph_functions = ('FT_Get_Advance', 'FT_Get_Char_Index',
+                        'FT_Get_Kerning', 'FT_Load_Char', 'FT_Load_Glyph')
+_prototypes = {
+    # name                           : (restype, argtypes)
+    'FT_Init_FreeType'               : (FT_Error, [POINTER(FT_Library)]),
+    'FT_Done_FreeType'               : (FT_Error, [FT_Library]),
+    'FT_Library_Version'             : (None, [FT_Library, POINTER(FT_Int),
+                                               POINTER(FT_Int), POINTER(FT_Int)]),
+    'FT_Library_SetLcdFilter'        : (FT_Error, [FT_Library, c_int]),
+    'FT_Library_SetLcdFilterWeights' : (FT_Error, [FT_Library, c_void_p]),
+    'FT_New_Face'                    : (FT_Error, [FT_Library, c_char_p, FT_Long,
+                                                   POINTER(FT_Face)]),
+    'FT_New_Memory_Face'             : (FT_Error, [FT_Library, c_void_p, FT_Long,
+                                                   FT_Long, POINTER(FT_Face)]),
+    'FT_Open_Face'                   : (FT_Error, [FT_Library, POINTER(FT_Open_Args),
+                                                   FT_Long, POINTER(FT_Face)]),
+    'FT_Attach_File'                 : (FT_Error, [FT_Face, c_char_p]),
+    'FT_Attach_Stream'               : (FT_Error, [FT_Face, POINTER(FT_Open_Args)]),
+    'FT_Reference_Face'              : (FT_Error, [FT_Face]),
+    'FT_Done_Face'                   : (FT_Error, [FT_Face]),
+    'FT_Done_Glyph'                  : (None, [FT_Glyph]),
+    'FT_Select_Size'                 : (FT_Error, [FT_Face, FT_Int]),
+    'FT_Request_Size'                : (FT_Error, [FT_Face, c_void_p]),
+    'FT_Set_Char_Size'               : (FT_Error, [FT_Face, FT_F26Dot6, FT_F26Dot6,
+                                                   FT_UInt, FT_UInt]),
+    'FT_Set_Pixel_Sizes'             : (FT_Error, [FT_Face, FT_UInt, FT_UInt]),
+    'FT_Load_Glyph'                  : (FT_Error, [FT_Face, FT_UInt, FT_Int32]),
+    'FT_Load_Char'                   : (FT_Error, [FT_Face, FT_ULong, FT_Int32]),
+    'FT_Set_Transform'               : (None, [FT_Face, POINTER(FT_Matrix),
+                                               POINTER(FT_Vector)]),
+    'FT_Render_Glyph'                : (FT_Error, [FT_GlyphSlot, c_int]),
+    'FT_Get_Kerning'                 : (FT_Error, [FT_Face, FT_UInt, FT_UInt, FT_UInt,
+                                                   POINTER(FT_Vector)]),
+    'FT_Get_Track_Kerning'           : (FT_Error, [FT_Face, FT_Fixed, FT_Int,
+                                                   POINTER(FT_Fixed)]),
+    'FT_Get_Glyph_Name'              : (FT_Error, [FT_Face, FT_UInt, FT_Pointer,
+                                                   FT_UInt]),
+    'FT_Get_Glyph'                   : (FT_Error, [FT_GlyphSlot, POINTER(FT_Glyph)]),
+    'FT_Glyph_Get_CBox'              : (None, [FT_Glyph, FT_UInt, POINTER(FT_BBox)]),
+    'FT_Get_Postscript_Name'         : (c_char_p, [FT_Face]),
+    'FT_Select_Charmap'              : (FT_Error, [FT_Face, FT_Encoding]),
+    'FT_Set_Charmap'                 : (FT_Error, [FT_Face, FT_Charmap]),
+    'FT_Get_Charmap_Index'           : (FT_Int, [FT_Charmap]),
+    'FT_Get_CMap_Language_ID'        : (FT_ULong, [FT_Charmap]),
+    'FT_Get_CMap_Format'             : (FT_Long, [FT_Charmap]),
+    'FT_Get_Char_Index'              : (FT_UInt, [FT_Face, FT_ULong]),
+    'FT_Get_First_Char'              : (FT_ULong, [FT_Face, POINTER(FT_UInt)]),
+    'FT_Get_Next_Char'               : (FT_ULong, [FT_Face, FT_ULong,
+                                                   POINTER(FT_UInt)]),
+    'FT_Get_Name_Index'              : (FT_UInt, [FT_Face, FT_String_p]),
+    'FT_Get_SubGlyph_Info'           : (FT_Error, [FT_GlyphSlot, FT_UInt,
+                                                   POINTER(FT_Int), POINTER(FT_UInt),
+                                                   POINTER(FT_Int), POINTER(FT_Int),
+                                                   POINTER(FT_Matrix)]),
+    'FT_Get_FSType_Flags'            : (FT_UShort, [FT_Face]),
+    'FT_Get_X11_Font_Format'         : (c_char_p, [FT_Face]),
+    'FT_Get_Sfnt_Name_Count'         : (FT_UInt, [FT_Face]),
+    'FT_Get_Sfnt_Name'               : (FT_Error, [FT_Face, FT_UInt,
+                                                   POINTER(FT_SfntName)]),
+    'FT_Get_Advance'                 : (FT_Error, [FT_Face, FT_UInt, FT_Int32,
+                                                   POINTER(FT_Fixed)]),
+    'FT_Get_Advances'                : (FT_Error, [FT_Face, FT_UInt, FT_UInt,
+                                                   FT_Int32, POINTER(FT_Fixed)]),
+
+    'FT_Outline_GetInsideBorder'     : (c_int, [POINTER(FT_Outline)]),
+    'FT_Outline_GetOutsideBorder'    : (c_int, [POINTER(FT_Outline)]),
+    'FT_Outline_Get_BBox'            : (FT_Error, [POINTER(FT_Outline),
+                                                   POINTER(FT_BBox)]),
+    'FT_Outline_Get_CBox'            : (None, [POINTER(FT_Outline), POINTER(FT_BBox)]),
+    'FT_Outline_EmboldenXY'          : (FT_Error, [POINTER(FT_Outline), FT_Pos, FT_Pos]),
+    'FT_Stroker_New'                 : (FT_Error, [FT_Library, POINTER(FT_Stroker)]),
+    'FT_Stroker_Set'                 : (None, [FT_Stroker, FT_Fixed, c_int, c_int,
+                                               FT_Fixed]),
+    'FT_Stroker_Rewind'              : (None, [FT_Stroker]),
+    'FT_Stroker_ParseOutline'        : (FT_Error, [FT_Stroker, POINTER(FT_Outline),
+                                                   _FT_Bool_Arg]),
+    'FT_Stroker_BeginSubPath'        : (FT_Error, [FT_Stroker, POINTER(FT_Vector),
+                                                   _FT_Bool_Arg]),
+    'FT_Stroker_EndSubPath'          : (FT_Error, [FT_Stroker]),
+    'FT_Stroker_LineTo'              : (FT_Error, [FT_Stroker, POINTER(FT_Vector)]),
+    'FT_Stroker_ConicTo'             : (FT_Error, [FT_Stroker, POINTER(FT_Vector),
+                                                   POINTER(FT_Vector)]),
+    'FT_Stroker_CubicTo'             : (FT_Error, [FT_Stroker, POINTER(FT_Vector),
+                                                   POINTER(FT_Vector),
+                                                   POINTER(FT_Vector)]),
+    'FT_Stroker_GetBorderCounts'     : (FT_Error, [FT_Stroker, c_int,
+                                                   POINTER(FT_UInt), POINTER(FT_UInt)]),
+    'FT_Stroker_ExportBorder'        : (None, [FT_Stroker, c_int, POINTER(FT_Outline)]),
+    'FT_Stroker_GetCounts'           : (FT_Error, [FT_Stroker, POINTER(FT_UInt),
+                                                   POINTER(FT_UInt)]),
+    'FT_Stroker_Export'              : (None, [FT_Stroker, POINTER(FT_Outline)]),
+    'FT_Stroker_Done'                : (None, [FT_Stroker]),
+    'FT_Glyph_Stroke'                : (FT_Error, [POINTER(FT_Glyph), FT_Stroker,
+                                                   _FT_Bool_Arg]),
+    'FT_Glyph_StrokeBorder'          : (FT_Error, [POINTER(FT_Glyph), FT_Stroker,
+                                                   _FT_Bool_Arg, _FT_Bool_Arg]),
+    'FT_Glyph_To_Bitmap'             : (FT_Error, [POINTER(FT_Glyph), c_int,
+                                                   POINTER(FT_Vector), _FT_Bool_Arg]),
+    'FT_Property_Get'                : (FT_Error, [FT_Library, c_char_p, c_char_p,
+                                                   c_void_p]),
+    'FT_Property_Set'                : (FT_Error, [FT_Library, c_char_p, c_char_p,
+                                                   c_void_p]),
+
+    'FT_Get_MM_Var'                  : (FT_Error, [FT_Face,
+                                                   POINTER(POINTER(FT_MM_Var))]),
+    'FT_Get_Var_Axis_Flags'          : (FT_Error, [POINTER(FT_MM_Var), FT_UInt,
+                                                   POINTER(FT_UInt)]),
+    'FT_Get_Var_Blend_Coordinates'   : (FT_Error, [FT_Face, FT_UInt,
+                                                   POINTER(FT_Fixed)]),
+    'FT_Get_Var_Design_Coordinates'  : (FT_Error, [FT_Face, FT_UInt,
+                                                   POINTER(FT_Fixed)]),
+    'FT_Set_Var_Blend_Coordinates'   : (FT_Error, [FT_Face, FT_UInt,
+                                                   POINTER(FT_Fixed)]),
+    'FT_Set_Var_Design_Coordinates'  : (FT_Error, [FT_Face, FT_UInt,
+                                                   POINTER(FT_Fixed)]),
+    'FT_Done_MM_Var'                 : (FT_Error, [FT_Library, POINTER(FT_MM_Var)]),
+    'FT_Set_Named_Instance'          : (FT_Error, [FT_Face, FT_UInt]),
+
+    'FT_Activate_Size'               : (FT_Error, [FT_Size]),
+    'FT_Add_Default_Modules'         : (None, [FT_Library]),
+    'FT_Add_Module'                  : (FT_Error, [FT_Library, c_void_p]),
+    'FT_Angle_Diff'                  : (FT_Angle, [FT_Angle, FT_Angle]),
+    'FT_Atan2'                       : (FT_Angle, [FT_Fixed, FT_Fixed]),
+    'FT_Bitmap_Convert'              : (FT_Error, [FT_Library, POINTER(FT_Bitmap),
+                                                   POINTER(FT_Bitmap), FT_Int]),
+    'FT_Bitmap_Copy'                 : (FT_Error, [FT_Library, POINTER(FT_Bitmap),
+                                                   POINTER(FT_Bitmap)]),
+    'FT_Bitmap_Done'                 : (FT_Error, [FT_Library, POINTER(FT_Bitmap)]),
+    'FT_Bitmap_Embolden'             : (FT_Error, [FT_Library, POINTER(FT_Bitmap),
+                                                   FT_Pos, FT_Pos]),
+    'FT_Bitmap_New'                  : (None, [POINTER(FT_Bitmap)]),
+    'FT_CeilFix'                     : (FT_Fixed, [FT_Fixed]),
+    'FT_ClassicKern_Free'            : (None, [FT_Face, c_void_p]),
+    'FT_ClassicKern_Validate'        : (FT_Error, [FT_Face, FT_UInt, c_void_p]),
+    'FT_Cos'                         : (FT_Fixed, [FT_Angle]),
+    'FT_DivFix'                      : (FT_Long, [FT_Long, FT_Long]),
+    'FT_Done_Library'                : (FT_Error, [FT_Library]),
+    'FT_Done_Size'                   : (FT_Error, [FT_Size]),
+    'FT_FloorFix'                    : (FT_Fixed, [FT_Fixed]),
+    'FT_Get_BDF_Charset_ID'          : (FT_Error, [FT_Face, POINTER(c_char_p),
+                                                   POINTER(c_char_p)]),
+    'FT_Get_BDF_Property'            : (FT_Error, [FT_Face, c_char_p, c_void_p]),
+    'FT_Get_Module'                  : (c_void_p, [FT_Library, c_char_p]),
+    'FT_Get_Multi_Master'            : (FT_Error, [FT_Face, c_void_p]),
+    'FT_Get_PFR_Advance'             : (FT_Error, [FT_Face, FT_UInt, POINTER(FT_Pos)]),
+    'FT_Get_PFR_Kerning'             : (FT_Error, [FT_Face, FT_UInt, FT_UInt,
+                                                   POINTER(FT_Vector)]),
+    'FT_Get_PFR_Metrics'             : (FT_Error, [FT_Face, POINTER(FT_UInt),
+                                                   POINTER(FT_UInt), POINTER(FT_Fixed),
+                                                   POINTER(FT_Fixed)]),
+    'FT_Get_PS_Font_Info'            : (FT_Error, [FT_Face, c_void_p]),
+    'FT_Get_PS_Font_Private'         : (FT_Error, [FT_Face, c_void_p]),
+    'FT_Get_Renderer'                : (c_void_p, [FT_Library, FT_Glyph_Format]),
+    'FT_Get_Sfnt_Table'              : (c_void_p, [FT_Face, c_int]),
+    'FT_Get_TrueType_Engine_Type'    : (c_int, [FT_Library]),
+    'FT_Get_WinFNT_Header'           : (FT_Error, [FT_Face, c_void_p]),
+    'FT_Glyph_Copy'                  : (FT_Error, [FT_Glyph, POINTER(FT_Glyph)]),
+    'FT_GlyphSlot_Embolden'          : (None, [FT_GlyphSlot]),
+    'FT_GlyphSlot_Oblique'           : (None, [FT_GlyphSlot]),
+    'FT_GlyphSlot_Own_Bitmap'        : (FT_Error, [FT_GlyphSlot]),
+    'FT_Glyph_Transform'             : (FT_Error, [FT_Glyph, POINTER(FT_Matrix),
+                                                   POINTER(FT_Vector)]),
+    'FT_Has_PS_Glyph_Names'          : (FT_Int, [FT_Face]),
+    'FT_List_Add'                    : (None, [c_void_p, c_void_p]),
+    'FT_List_Finalize'               : (None, [c_void_p, c_void_p, c_void_p,
+                                               c_void_p]),
+    'FT_List_Find'                   : (c_void_p, [c_void_p, c_void_p]),
+    'FT_List_Insert'                 : (None, [c_void_p, c_void_p]),
+    'FT_List_Iterate'                : (FT_Error, [c_void_p, c_void_p, c_void_p]),
+    'FT_List_Remove'                 : (None, [c_void_p, c_void_p]),
+    'FT_List_Up'                     : (None, [c_void_p, c_void_p]),
+    'FT_Load_Sfnt_Table'             : (FT_Error, [FT_Face, FT_ULong, FT_Long,
+                                                   c_void_p, POINTER(FT_ULong)]),
+    'FT_Matrix_Invert'               : (FT_Error, [POINTER(FT_Matrix)]),
+    'FT_Matrix_Multiply'             : (None, [POINTER(FT_Matrix),
+                                               POINTER(FT_Matrix)]),
+    'FT_MulDiv'                      : (FT_Long, [FT_Long, FT_Long, FT_Long]),
+    'FT_MulFix'                      : (FT_Long, [FT_Long, FT_Long]),
+    'FT_New_Library'                 : (FT_Error, [c_void_p, POINTER(FT_Library)]),
+    'FT_New_Size'                    : (FT_Error, [FT_Face, POINTER(FT_Size)]),
+    'FT_OpenType_Free'               : (None, [FT_Face, c_void_p]),
+    'FT_OpenType_Validate'           : (FT_Error, [FT_Face, FT_UInt, c_void_p,
+                                                   c_void_p, c_void_p, c_void_p,
+                                                   c_void_p]),
+    'FT_Outline_Check'               : (FT_Error, [POINTER(FT_Outline)]),
+    'FT_Outline_Copy'                : (FT_Error, [POINTER(FT_Outline),
+                                                   POINTER(FT_Outline)]),
+    # The user data is given to the (py_object) callbacks of FT_Outline_Funcs
+    'FT_Outline_Decompose'           : (FT_Error, [POINTER(FT_Outline),
+                                                   POINTER(FT_Outline_Funcs),
+                                                   py_object]),
+    'FT_Outline_Done'                : (FT_Error, [FT_Library, POINTER(FT_Outline)]),
+    'FT_Outline_Embolden'            : (FT_Error, [POINTER(FT_Outline), FT_Pos]),
+    'FT_Outline_Get_Bitmap'          : (FT_Error, [FT_Library, POINTER(FT_Outline),
+                                                   POINTER(FT_Bitmap)]),
+    'FT_Outline_Get_Orientation'     : (c_int, [POINTER(FT_Outline)]),
+    'FT_Outline_New'                 : (FT_Error, [FT_Library, FT_UInt, FT_Int,
+                                                   POINTER(FT_Outline)]),
+    'FT_Outline_Render'              : (FT_Error, [FT_Library, POINTER(FT_Outline),
+                                                   c_void_p]),
+    'FT_Outline_Reverse'             : (None, [POINTER(FT_Outline)]),
+    'FT_Outline_Transform'           : (None, [POINTER(FT_Outline),
+                                               POINTER(FT_Matrix)]),
+    'FT_Outline_Translate'           : (None, [POINTER(FT_Outline), FT_Pos, FT_Pos]),
+    'FT_Remove_Module'               : (FT_Error, [FT_Library, c_void_p]),
+    'FT_RoundFix'                    : (FT_Fixed, [FT_Fixed]),
+    'FT_Set_Debug_Hook'              : (None, [FT_Library, FT_UInt, c_void_p]),
+    'FT_Set_MM_Blend_Coordinates'    : (FT_Error, [FT_Face, FT_UInt,
+                                                   POINTER(FT_Fixed)]),
+    'FT_Set_MM_Design_Coordinates'   : (FT_Error, [FT_Face, FT_UInt,
+                                                   POINTER(FT_Long)]),
+    'FT_Set_Renderer'                : (FT_Error, [FT_Library, c_void_p, FT_UInt,
+                                                   FT_Parameter_p]),
+    'FT_Sfnt_Table_Info'             : (FT_Error, [FT_Face, FT_UInt,
+                                                   POINTER(FT_ULong),
+                                                   POINTER(FT_ULong)]),
+    'FT_Sin'                         : (FT_Fixed, [FT_Angle]),
+    'FT_Stream_OpenGzip'             : (FT_Error, [FT_Stream, FT_Stream]),
+    'FT_Stream_OpenLZW'              : (FT_Error, [FT_Stream, FT_Stream]),
+    'FT_Tan'                         : (FT_Fixed, [FT_Angle]),
+    'FT_TrueTypeGX_Free'             : (None, [FT_Face, c_void_p]),
+    'FT_TrueTypeGX_Validate'         : (FT_Error, [FT_Face, FT_UInt, c_void_p,
+                                                   FT_UInt]),
+    'FT_Vector_From_Polar'           : (None, [POINTER(FT_Vector), FT_Fixed,
+                                               FT_Angle]),
+    'FT_Vector_Length'               : (FT_Fixed, [POINTER(FT_Vector)]),
+    'FT_Vector_Polarize'             : (None, [POINTER(FT_Vector), POINTER(FT_Fixed),
+                                               POINTER(FT_Angle)]),
+    'FT_Vector_Rotate'               : (None, [POINTER(FT_Vector), FT_Angle]),
+    'FT_Vector_Transform'            : (None, [POINTER(FT_Vector),
+                                               POINTER(FT_Matrix)]),
+    'FT_Vector_Unit'                 : (None, [POINTER(FT_Vector), FT_Angle]),
+}
+
+for _name, (_restype, _argtypes) in _prototypes.items():
+    _function = globals().get(_name)
+    if isinstance(_function, _lib._FuncPtr):
+        _function.restype = _restype
+        if _name not in _per_glyph_functions:
+            _function.argtypes = _argtypes
+del _name, _restype, _argtypes, _function
+
+
+# -----------------------------------------------------------------------------
+# The TT_* enum tables are imported on first use, see freetype.ft_enums
+# -----------------------------------------------------------------------------
+def __getattr__(name):
+    if name == '__all__':
+        # "from freetype.raw import *" gets all the enums
+        return [n for n in globals() if not n.startswith('_')] + \
+               _ft_enums._load_all()
+    try:
+        return getattr(_ft_enums, name)
+    except AttributeError:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(
+            __name__, name))
+
+def __dir__():
+    return sorted(set(globals()) | set(_ft_enums._load_all()))
@@ -0,0 +1,123 @@
+import os
+import random
+
+import freetype
+import pytest
+from freetype.atlas import GlyphAtlas, SkylinePacker, generate_sdf_atlas
+
+test_folder = os.path.realpath(os.path.dirname(__file__))
+font_path = os.path.join(test_folder, "..", "examples", "Vera.ttf")
+
+
+def test_skyline_packer():
+    packer = SkylinePacker(256, 256)
+    random.seed(0)
+    rects = []
+    while True:
+        width, height = random.randint(1, 40), random.randint(1, 40)
+        position = packer.pack(width, height)
+        if position is None:
+            break
+        rects.append(position + (width, height))
+    covered = set()
+    for x, y, width, height in rects:
+        assert x + width <= 256 and y + height <= 256
+        pixels = {(i, j) for i in range(x, x + width)
+                  for j in range(y, y + height)}
+        assert not pixels & covered
+        covered |= pixels
+    assert packer.used == len(covered)
+    assert packer.occupancy > 0.75
+
+
+def test_glyph_atlas():
+    face = freetype.Face(font_path)
+    face.set_pixel_sizes(0, 32)
+    atlas = GlyphAtlas(128, 128, padding=2, bleed=1)
+    glyphs = atlas.add_text(face, "Hello World")
+    assert len(atlas) == 8  # distinct glyphs
+    assert atlas.add_glyph(face, face.get_char_index("H")) is glyphs[0]
+
+    space = glyphs[5]
+    assert space.page == -1 and space.width == 0 and space.advance[0] > 0
+
+    glyph = glyphs[0]
+    snapshot = face.load_and_snapshot(face.get_char_index("H"))
+    data = atlas.pages[glyph.page].data
+
+    def pixels(x, y, count=1):
+        return bytes(data[y * 128 + x:y * 128 + x + count])
+
+    assert (glyph.width, glyph.height) == (snapshot.width, snapshot.rows)
+    rows = [snapshot.buffer[i * snapshot.pitch:][:snapshot.width]
+            for i in range(snapshot.rows)]
+    for i, row in enumerate(rows):
+        assert pixels(glyph.x, glyph.y + i, glyph.width) == row
+        # bleed, then blank padding
+        assert pixels(glyph.x - 1, glyph.y + i) == row[:1]
+        assert pixels(glyph.x - 2, glyph.y + i) == b"\0"
+    assert pixels(glyph.x, glyph.y - 1, glyph.width) == rows[0]
+    assert atlas.pages[0].to_memoryview().shape == (128, 128)
+    assert (glyph.u0, glyph.v0) == (glyph.x / 128.0, glyph.y / 128.0)
+
+    dirty = atlas.take_dirty()
+    assert [index for index, _ in dirty] == [0]
+    x, y, width, height = dirty[0][1]
+    assert (x, y) == (glyph.x - 1, glyph.y - 1)
+    assert atlas.take_dirty() == []
+
+    # more glyphs than a page can hold
+    face.set_pixel_sizes(0, 48)
+    atlas.add_text(face, "ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+    assert len(atlas.pages) > 1
+    assert {index for index, _ in atlas.take_dirty()} == set(
+        range(len(atlas.pages)))
+
+    uvs, metrics = atlas.uv_table(), atlas.metrics_table()
+    assert len(uvs) == 4 * len(atlas) and len(metrics) == 9 * len(atlas)
+    last = atlas[atlas.keys()[-1]]
+    assert list(uvs[-4:]) == [last.u0, last.v0, last.u1, last.v1]
+    assert list(metrics[-9:]) == list(last[1:8]) + list(last.advance)
+
+    small = GlyphAtlas(32, 32, max_pages=1)
+    # the atlas is full
+    with pytest.raises(ValueError):
+        small.add_text(face, "WWWW")
+
+
+def test_sdf_atlas(monkeypatch):
+    if freetype.version() < (2, 11, 0):
+        pytest.skip("FT_RENDER_MODE_SDF requires FreeType 2.11+")
+    face = freetype.Face(font_path)
+    face.set_pixel_sizes(0, 20)
+    atlas = generate_sdf_atlas(face, "Hello World", 32, spread=4,
+                               width=128, height=128)
+    assert face.size.y_ppem == 20
+    assert freetype.get_property("sdf", "spread") == 8
+    assert sorted(atlas.keys()) == sorted(set(face.get_char_indices("HeloWrd ")))
+
+    face.set_pixel_sizes(0, 32)
+    flags = freetype.FT_LOAD_NO_HINTING | freetype.FT_LOAD_NO_BITMAP
+    glyph = atlas[face.get_char_index("H")]
+    face.load_char("H", flags)
+    face.glyph.render(freetype.FT_RENDER_MODE_NORMAL)
+    assert glyph.width == face.glyph.bitmap.width + 2 * 4
+    assert glyph.bitmap_left == face.glyph.bitmap_left - 4
+
+    opened = []
+
+    class RecordedFace(freetype.Face):
+        def __init__(self, *args, **kwargs):
+            super(RecordedFace, self).__init__(*args, **kwargs)
+            opened.append(self)
+
+    monkeypatch.setattr(freetype, "Face", RecordedFace)
+    parallel = generate_sdf_atlas(font_path, "Hello World", 32, spread=4,
+                                  width=128, height=128, workers=2,
+                                  executor="thread")
+    # the faces opened for the charmap and by the workers are closed, not
+    # left to the garbage collector
+    assert opened and all(face.closed for face in opened)
+    assert parallel.keys() == atlas.keys()
+    assert [bytes(page.data) for page in parallel.pages] == \
+        [bytes(page.data) for page in atlas.pages]
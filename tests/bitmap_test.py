@@ -0,0 +1,144 @@
+import os
+
+import freetype
+import pytest
+
+test_folder = os.path.realpath(os.path.dirname(__file__))
+
+
+def _rendered_face(char="S"):
+    p = os.path.join(test_folder, "..", "examples", "Vera.ttf")
+    face = freetype.Face(p)
+    face.set_char_size(48 * 64)
+    face.load_char(char)
+    return face
+
+
+def test_bitmap_memoryview_matches_buffer():
+    face = _rendered_face()
+    bitmap = face.glyph.bitmap
+    view = bitmap.to_memoryview()
+    assert view.shape == (bitmap.rows, bitmap.pitch)
+    assert view.tobytes() == bytes(bitmap.buffer)
+
+
+def test_bitmap_memoryview_copy_survives_reload():
+    face = _rendered_face("S")
+    expected = bytes(face.glyph.bitmap.buffer)
+    view = face.glyph.bitmap.to_memoryview(copy=True)
+    face.load_char("A")
+    assert view.tobytes() == expected
+
+
+def test_bitmap_empty():
+    face = _rendered_face(" ")
+    bitmap = face.glyph.bitmap
+    assert bitmap.buffer == []
+    assert len(bitmap.to_memoryview()) == 0
+
+
+def test_bitmap_to_numpy():
+    np = pytest.importorskip("numpy")
+    face = _rendered_face()
+    bitmap = face.glyph.bitmap
+    array = bitmap.to_numpy(copy=True)
+    assert array.shape == (bitmap.rows, bitmap.width)
+    assert array.dtype == np.uint8
+    assert array.tobytes() == bytes(bitmap.buffer)
+
+
+def test_render_text():
+    np = pytest.importorskip("numpy")
+    face = _rendered_face()
+    text = "AV\nSa"
+    ink, _ = face.measure_text(text)
+    shape = ((ink.yMax - ink.yMin) >> 6, (ink.xMax - ink.xMin) >> 6)
+    origin = (-ink.xMin >> 6, ink.yMax >> 6)
+    canvas = np.zeros(shape, dtype=np.uint8)
+    assert freetype.render_text(face, text, canvas, origin) is canvas
+    # the ink box is exactly covered
+    assert canvas[0].any() and canvas[-1].any()
+    assert canvas[:, 0].any() and canvas[:, -1].any()
+
+    # a single glyph is copied as it is
+    face.load_char("S")
+    glyph = face.glyph.bitmap.to_numpy()
+    single = np.zeros((100, 100), dtype=np.uint8)
+    left, top = face.glyph.bitmap_left, face.glyph.bitmap_top
+    freetype.render_text(face, "S", single, (10, 80), blend_mode="over")
+    assert (single[80 - top:80 - top + glyph.shape[0],
+                   10 + left:10 + left + glyph.shape[1]] == glyph).all()
+    assert single.sum() == glyph.sum()
+
+    # clipping, and any writable buffer of the right shape
+    clipped = bytearray(20 * 20)
+    freetype.render_text(face, text, memoryview(clipped).cast("B", (20, 20)),
+                         (-5, 30))
+    assert any(clipped)
+
+    rgba = np.zeros(shape + (4,), dtype=np.uint8)
+    freetype.render_text(face, text, rgba, origin, color=(255, 0, 0, 255))
+    assert (rgba[..., 3] == canvas).all()
+    assert (rgba[..., 0][canvas > 0] == 255).all()
+    assert not rgba[..., 1:3].any()
+
+    # colors and alpha below 255 scale the coverage, without wrapping around
+    face.load_char("S")
+    glyph = face.glyph.bitmap.to_numpy().copy()
+    expected = (glyph.astype(np.uint32) * 128 + 127) // 255
+    box = (slice(80 - top, 80 - top + glyph.shape[0]),
+           slice(10 + left, 10 + left + glyph.shape[1]))
+    gray = np.zeros((100, 100), dtype=np.uint8)
+    freetype.render_text(face, "S", gray, (10, 80), color=128)
+    assert gray.max() == 128
+    assert (gray[box] == expected).all()
+    over = np.full((100, 100), 255, dtype=np.uint8)
+    freetype.render_text(face, "S", over, (10, 80), blend_mode="over",
+                         color=0)
+    assert (over[box] == 255 - glyph).all()
+    colored = np.zeros((100, 100, 4), dtype=np.uint8)
+    freetype.render_text(face, "S", colored, (10, 80),
+                         color=(255, 64, 0, 128))
+    assert colored[..., 3].max() == 128
+    assert (colored[box + (3,)] == expected).all()
+    assert (colored[box + (1,)][glyph > 0] == 64).all()
+
+    with pytest.raises(ValueError):
+        freetype.render_text(face, text, canvas, origin, blend_mode="add")
+    with pytest.raises(ValueError):
+        freetype.render_text(face, text, canvas.astype(np.float32), origin)
+
+
+def test_render_sdf():
+    if freetype.version() < (2, 11, 0):
+        pytest.skip("FT_RENDER_MODE_SDF requires FreeType 2.11+")
+    library = freetype.Library()
+    face = freetype.Face(
+        os.path.join(test_folder, "..", "examples", "Vera.ttf"), 0, library)
+    face.set_pixel_sizes(0, 64)
+    face.load_char("l", freetype.FT_LOAD_NO_HINTING)
+    face.glyph.render(freetype.FT_RENDER_MODE_NORMAL)
+    width, left = face.glyph.bitmap.width, face.glyph.bitmap_left
+
+    for spread in (8, 16):
+        freetype.set_sdf_spread(spread, library)
+        assert freetype.get_property("sdf", "spread", library=library) == spread
+        assert freetype.get_property(b"bsdf", b"spread",
+                                     library=library) == spread
+        face.load_char("l", freetype.FT_LOAD_NO_HINTING)
+        face.glyph.render(freetype.FT_RENDER_MODE_SDF)
+        bitmap = face.glyph.bitmap
+        assert bitmap.pixel_mode == freetype.FT_PIXEL_MODE_GRAY
+        assert bitmap.width == width + 2 * spread
+        assert face.glyph.bitmap_left == left - spread
+        # across the stem: rising to the middle, then falling, 128 per spread
+        middle = bitmap.rows // 2 * bitmap.pitch
+        row = bytes(bitmap.buffer[middle:middle + bitmap.width])
+        assert max(row) > 128 > row[0]
+        assert row[1] - row[0] == 128 // spread
+    assert freetype.get_property("sdf", "spread") == 8  # global library
+
+    with pytest.raises(freetype.FT_Exception):
+        freetype.set_sdf_spread(100, library)
+    with pytest.raises(freetype.FT_Exception):
+        freetype.set_property("no-such-module", "spread", 8, library)
@@ -0,0 +1,140 @@
+import os
+
+import freetype
+import pytest
+
+test_folder = os.path.realpath(os.path.dirname(__file__))
+font_path = os.path.join(test_folder, "..", "examples", "Vera.ttf")
+
+
+def test_cache_manager_lookups():
+    manager = freetype.CacheManager(max_faces=1)
+    face_id = manager.register_face(font_path)
+    with open(font_path, mode="rb") as f:
+        memory_face_id = manager.register_face(f.read())
+
+    face = freetype.Face(font_path)
+    gindex = manager.get_char_index(face_id, "A")
+    assert gindex == face.get_char_index("A")
+    assert manager.get_char_index(memory_face_id, "A") == gindex
+
+    face.set_pixel_sizes(32, 32)
+    face.load_glyph(gindex)
+    sbit = manager.lookup_sbit(face_id, gindex, 32)
+    assert (sbit.width, sbit.height) == (face.glyph.bitmap.width,
+                                         face.glyph.bitmap.rows)
+    assert sbit.buffer == bytes(face.glyph.bitmap.buffer)
+
+    glyph = manager.lookup_glyph(memory_face_id, gindex, 32)
+    assert glyph.format == freetype.FT_GLYPH_FORMAT_OUTLINE
+
+    manager.reset()
+    assert manager.lookup_sbit(face_id, gindex, 32).buffer == sbit.buffer
+    manager.remove_face(face_id)
+
+
+def test_glyph_cache_hits_and_evictions():
+    face = freetype.Face(font_path)
+    face.set_char_size(24 * 64)
+    cache = freetype.GlyphCache()
+
+    first = cache.load_char(face, "A")
+    face.load_char("A")
+    assert first.buffer == bytes(face.glyph.bitmap.buffer)
+    assert first.advance == (face.glyph.advance.x, face.glyph.advance.y)
+    assert first.metrics.horiAdvance == face.glyph.metrics.horiAdvance
+
+    assert cache.load_char(face, "A") is first
+    face.set_char_size(48 * 64)
+    assert cache.load_char(face, "A") is not first
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+    cache.max_bytes = 0
+    cache.load_char(face, "B")
+    assert len(cache) == 1
+    assert cache.evictions == 2
+
+
+def test_face_pool():
+    import threading
+
+    other_path = os.path.join(test_folder, "..", "examples", "VeraMono.ttf")
+    pool = freetype.FacePool(max_faces=1)
+
+    with pool.lease(font_path) as face:
+        face.set_pixel_sizes(0, 16)
+        first = face
+    with pool.lease(font_path) as face:
+        assert face is first
+    assert pool.stats()["hits"] == 1
+
+    with pool.lease(font_path, 0) as face:
+        with pool.lease(other_path) as other:
+            # Leased faces are not evicted, the pool is trimmed on release
+            assert len(pool) == 2
+    assert len(pool) == 1
+    assert other.closed and not first.closed
+    assert pool.stats()["evictions"] == 1
+
+    def render():
+        for _ in range(20):
+            with pool.lease(font_path) as face:
+                face.set_pixel_sizes(0, 24)
+                face.load_char("S")
+
+    threads = [threading.Thread(target=render) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = pool.stats()
+    assert stats["leased"] == 0
+    assert stats["hits"] + stats["misses"] == 84
+    # faces are found by identity, evicted ones are forgotten
+    with pytest.raises(ValueError):
+        pool.release(freetype.Face(font_path))
+    with pytest.raises(ValueError):
+        pool.release(other)
+    assert list(pool._keys.values()) == list(pool._entries)
+    pool.clear()
+    assert len(pool) == 0 and pool.nbytes == 0 and not pool._keys
+
+
+def test_face_pool_concurrent_misses(monkeypatch):
+    import threading
+
+    other_path = os.path.join(test_folder, "..", "examples", "VeraMono.ttf")
+    pool = freetype.FacePool()
+    with pool.lease(font_path):
+        pass
+
+    opening, proceed = threading.Event(), threading.Event()
+
+    class SlowFace(freetype.Face):
+        def __init__(self, path, *args, **kwargs):
+            if path.endswith("VeraMono.ttf"):
+                opening.set()
+                assert proceed.wait(10)
+            super(SlowFace, self).__init__(path, *args, **kwargs)
+
+    def lease_other():
+        with pool.lease(other_path) as face:
+            faces.append(face)
+
+    monkeypatch.setattr(freetype, "Face", SlowFace)
+    faces = []
+    threads = [threading.Thread(target=lease_other) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    assert opening.wait(10)
+    # a miss being opened does not block hits on other faces
+    with pool.lease(font_path) as face:
+        assert not face.closed
+    proceed.set()
+    for thread in threads:
+        thread.join(10)
+    # the face was opened once, and leased in turn
+    assert len(faces) == 2 and faces[0] is faces[1]
+    assert pool.stats() == dict(hits=2, misses=2, evictions=0, entries=2,
+                                leased=0, bytes=pool.nbytes)
@@ -0,0 +1,198 @@
+import gc
+import os
+import pickle
+
+import freetype
+import pytest
+
+test_folder = os.path.realpath(os.path.dirname(__file__))
+font_path = os.path.join(test_folder, "..", "examples", "Vera.ttf")
+
+
+def _face(size=24):
+    face = freetype.Face(font_path)
+    face.set_char_size(size * 64)
+    return face
+
+
+def test_get_advances(monkeypatch):
+    face = _face()
+    expected = [face.get_advance(i, 0) for i in range(3, 13)]
+    assert list(face.get_advances(3, 0, count=10)) == expected
+    assert list(face.get_advances(range(3, 13), 0)) == expected
+    assert list(face.get_advances([12, 3, 7], 0)) == [
+        expected[9], expected[0], expected[4]]
+    assert len(face.get_advances(3, 0, count=0)) == 0
+
+    # builds without FT_Get_Advances measure ranges glyph by glyph
+    monkeypatch.setattr(freetype, "FT_Get_Advances", None)
+    assert list(face.get_advances(3, 0, count=10)) == expected
+    assert list(face.get_advances(range(3, 13), 0)) == expected
+
+
+def test_get_char_indices():
+    face = _face()
+    text = u"Hello, wörld! \U0001F600"
+    expected = [face.get_char_index(c) for c in text]
+    assert list(face.get_char_indices(text)) == expected
+    # second call is served from the memo tables
+    assert list(face.get_char_indices(text)) == expected
+    assert list(face.get_char_indices([ord(c) for c in text])) == expected
+    # negative codes are not looked up at the end of the BMP table
+    with pytest.raises(ValueError):
+        face.get_char_indices([ord("H"), -1])
+
+
+def test_glyph_kerning_and_pairs():
+    face = _face(48)
+    text = "AVATAR To"
+    gindices = face.get_char_indices(text)
+    expected = [0] + [face.get_kerning(a, b).x for a, b in zip(text, text[1:])]
+    assert list(face.get_kerning_pairs(gindices)) == expected
+    assert face.get_glyph_kerning(gindices[0], gindices[1]) == (expected[1], 0)
+
+    # the pair cache must not survive a size change
+    face.set_char_size(12 * 64)
+    assert face.get_glyph_kerning(gindices[0], gindices[1]) == (
+        face.get_kerning("A", "V").x, 0)
+    assert face.get_glyph_kerning(gindices[0], gindices[1])[0] != expected[1]
+
+
+def test_build_kerning_table():
+    face = _face(48)
+    glyphs = range(0, 120)
+    table = face.build_kerning_table(glyphs)
+    for left in glyphs:
+        for right in glyphs:
+            assert table.get(left, right) == face.get_glyph_kerning(left, right)[0]
+    assert 0 not in table.pairs.values()
+
+    restored = freetype.KerningTable.from_bytes(table.to_bytes())
+    assert restored.pairs == table.pairs
+    assert restored.mode == table.mode
+
+
+def test_multiple_sizes():
+    face = _face(12)
+    large = face.new_size(48 * 64)
+    assert face.size.y_ppem == 12
+    assert large.metrics.y_ppem == 48
+
+    face.load_char("A")
+    small_rows = face.glyph.bitmap.rows
+    with large:
+        assert face.size.y_ppem == 48
+        face.load_char("A")
+        assert face.glyph.bitmap.rows > small_rows
+        large_kerning = face.get_kerning("A", "V").x
+    assert face.size.y_ppem == 12
+    assert face.get_kerning("A", "V").x != large_kerning
+
+    large.activate()
+    assert face.size.y_ppem == 48
+
+    # destroying the active size drops its caches along with it
+    gindices = face.get_char_indices("AV")
+    assert face.get_glyph_kerning(*gindices)[0] == large_kerning
+    assert face.measure_text("AV")[1].xMax > 0
+    del large
+    gc.collect()
+    assert face.size.y_ppem == 12
+    small = _face(12)
+    assert face.get_glyph_kerning(*gindices) == \
+        small.get_glyph_kerning(*gindices)
+    assert face.measure_text("AV") == small.measure_text("AV")
+
+
+def test_records():
+    face = _face(48)
+    face.load_char("A")
+    metrics = face.glyph.metrics
+    width = metrics.width
+    face.load_char("i")
+    # records are copies: loading another glyph does not change them
+    assert metrics.width == width != face.glyph.metrics.width
+
+    records = [metrics, face.bbox, face.size, face.charmap,
+               face.get_sfnt_name(1)]
+    for record in records:
+        restored = pickle.loads(pickle.dumps(record))
+        assert restored == record
+        assert hash(restored) == hash(record)
+        assert not hasattr(record, "__dict__")
+    assert len(set(records + records)) == len(records)
+    assert freetype.BBox((0, 1, 2, 3)) != freetype.BBox((0, 1, 2, 4))
+
+    # records are read-only
+    with pytest.raises(AttributeError):
+        metrics.width = 0
+
+    # a pickled charmap has no handle, but a live one can still be selected
+    charmap = face.charmaps[0]
+    face.set_charmap(charmap)
+    assert face.charmap == charmap
+    assert pickle.loads(pickle.dumps(charmap)).index == -1
+
+
+def test_glyph_snapshot():
+    face = _face(48)
+    index = face.get_char_index("g")
+    snapshot = face.load_and_snapshot(index)
+    slot = face.glyph
+    assert snapshot == slot.snapshot()
+    assert snapshot.glyph_index == index
+    assert snapshot.buffer == bytes(slot.bitmap.buffer)
+    assert (snapshot.width, snapshot.rows, snapshot.pitch) == (
+        slot.bitmap.width, slot.bitmap.rows, slot.bitmap.pitch)
+    assert (snapshot.bitmap_left, snapshot.bitmap_top) == (
+        slot.bitmap_left, slot.bitmap_top)
+    assert snapshot.advance == (slot.advance.x, slot.advance.y)
+    assert snapshot.linearHoriAdvance == slot.linearHoriAdvance
+    assert snapshot.metrics == slot.metrics
+
+    # snapshots do not follow the slot
+    face.load_char("A")
+    assert slot.snapshot() != snapshot
+    assert slot.snapshot(7).glyph_index == 7
+    assert snapshot.glyph_index == index
+
+
+def test_measure_text():
+    face = _face(13)
+
+    def rendered_extents(text):
+        # ink box of the rendered bitmaps, and pen position
+        x, xs, ys = 0, [], []
+        for i, c in enumerate(text):
+            face.load_char(c, freetype.FT_LOAD_RENDER)
+            slot, bitmap = face.glyph, face.glyph.bitmap
+            if i:
+                x += face.get_kerning(text[i - 1], c).x
+            if bitmap.width and bitmap.rows:
+                xs += [x + slot.bitmap_left * 64,
+                       x + (slot.bitmap_left + bitmap.width) * 64]
+                ys += [(slot.bitmap_top - bitmap.rows) * 64,
+                       slot.bitmap_top * 64]
+            x += slot.advance.x
+        return (min(xs), min(ys), max(xs), max(ys)), x
+
+    texts = ["File", "AVATAR To", "Hello, World!", "Quit"]
+    results = face.measure_texts(texts)
+    for text, (ink, logical) in zip(texts, results):
+        assert (ink, logical) == face.measure_text(text)
+        box, advance = rendered_extents(text)
+        assert (ink.xMin, ink.yMin, ink.xMax, ink.yMax) == box
+        assert (logical.xMin, logical.xMax) == (0, advance)
+        assert logical.yMax == face.size.ascender
+        assert logical.yMin == face.size.descender
+
+    ink, logical = face.measure_text("A\nA")
+    assert logical.yMin == face.size.descender - face.size.height
+    assert ink.yMin == face.measure_text("A")[0].yMin - face.size.height
+    assert face.measure_text(" ")[0] == freetype.BBox((0, 0, 0, 0))
+
+    # glyph boxes are cached per size
+    large = face.new_size(48 * 64)
+    with large:
+        assert face.measure_text("File")[1].xMax > results[0][1].xMax
+    assert face.measure_text("File") == results[0]
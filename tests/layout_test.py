@@ -0,0 +1,42 @@
+import os
+
+import freetype
+from freetype.layout import GLYPH_STRIDE, layout_text
+
+test_folder = os.path.realpath(os.path.dirname(__file__))
+font_path = os.path.join(test_folder, "..", "examples", "Vera.ttf")
+
+
+def test_layout_text():
+    face = freetype.Face(font_path)
+    face.set_pixel_sizes(0, 12)
+    text = "AVATAR"
+    run = layout_text(face, text, 48)
+    assert len(run) == GLYPH_STRIDE * len(text)
+    assert list(run[0::4]) == list(face.get_char_indices(text))
+    assert set(run[2::4]) == {0}
+    # the active size of the face is left alone
+    assert face.size.y_ppem == 12
+
+    # positions are the scaled sums of the unscaled advances and kerning
+    scale = 48 * 64.0 / face.units_per_EM
+    x = 0
+    previous = None
+    for i, c in enumerate(text):
+        if previous is not None:
+            x += face.get_kerning(previous, c, freetype.FT_KERNING_UNSCALED).x
+        advance = face.get_advance(face.get_char_index(c),
+                                   freetype.FT_LOAD_NO_SCALE)
+        assert run[4 * i + 1] == int(round(x * scale))
+        assert run[4 * i + 3] == int(round(advance * scale))
+        x += advance
+        previous = c
+
+    unkerned = layout_text(face, text, 48, features=())
+    assert unkerned[5] > run[5]  # "AV" is kerned
+
+    lines = layout_text(face, "A\nA", 48)
+    assert len(lines) == 2 * GLYPH_STRIDE
+    assert list(lines[4:6]) == [run[0], 0]
+    assert lines[6] == -int(round(face.height * scale))
+    assert len(layout_text(face, "", 48)) == 0
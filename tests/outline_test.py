@@ -0,0 +1,19 @@
+import os
+
+import freetype
+
+test_folder = os.path.realpath(os.path.dirname(__file__))
+
+
+def test_outline_as_arrays():
+    p = os.path.join(test_folder, "..", "examples", "Vera.ttf")
+    face = freetype.Face(p)
+    face.set_char_size(48 * 64)
+    face.load_char("B", freetype.FT_LOAD_NO_BITMAP)
+    outline = face.glyph.outline
+
+    points, tags, contours = outline.as_arrays()
+    assert len(points) == 2 * outline.n_points
+    assert list(zip(points[::2], points[1::2])) == outline.points
+    assert list(tags) == outline.tags
+    assert list(contours) == outline.contours
@@ -0,0 +1,83 @@
+import os
+
+import freetype
+import pytest
+from freetype.parallel import render_glyphs
+
+test_folder = os.path.realpath(os.path.dirname(__file__))
+font_path = os.path.join(test_folder, "..", "examples", "Vera.ttf")
+
+
+def test_render_glyphs():
+    glyph_ids = range(30, 50)
+    sizes = [16, 32]
+    results = list(render_glyphs(font_path, glyph_ids, sizes, workers=2,
+                                 executor="thread", chunk_size=8))
+    assert [size for size, _ in results] == [16] * 20 + [32] * 20
+
+    face = freetype.Face(font_path)
+    for size, snapshot in results:
+        face.set_pixel_sizes(0, size)
+        face.load_glyph(snapshot.glyph_index, freetype.FT_LOAD_RENDER)
+        bitmap = face.glyph.bitmap
+        assert snapshot.buffer == bytes(bitmap.buffer)
+        assert (snapshot.width, snapshot.rows) == (bitmap.width, bitmap.rows)
+        assert snapshot.advance == (face.glyph.advance.x,
+                                    face.glyph.advance.y)
+
+    inline = list(render_glyphs(font_path, glyph_ids, sizes, workers=1))
+    assert [s.buffer for _, s in inline] == [s.buffer for _, s in results]
+
+
+def test_render_glyphs_reopens_fonts(tmp_path):
+    # Faces opened in the calling thread or in pool threads are not kept
+    # across calls: a font replaced on disk is picked up
+    path = str(tmp_path / "font.ttf")
+    results = {}
+    for name in ("Vera.ttf", "VeraMono.ttf"):
+        with open(os.path.join(test_folder, "..", "examples", name),
+                  "rb") as source, open(path, "wb") as target:
+            target.write(source.read())
+        for workers in (1, 2):
+            snapshots = render_glyphs(path, [36], [24], workers=workers,
+                                      executor="thread")
+            results[name, workers] = [s.advance for _, s in snapshots]
+    assert results["Vera.ttf", 1] == results["Vera.ttf", 2]
+    assert results["VeraMono.ttf", 1] == results["VeraMono.ttf", 2]
+    assert results["Vera.ttf", 1] != results["VeraMono.ttf", 1]
+
+
+def test_render_glyphs_properties():
+    if freetype.version() < (2, 11, 0):
+        pytest.skip("FT_RENDER_MODE_SDF requires FreeType 2.11+")
+    flags = freetype.FT_LOAD_RENDER | freetype.FT_RENDER_MODE_SDF << 16
+    library = freetype.get_thread_library()
+    default = freetype.get_property("sdf", "spread", library=library)
+    widths = {}
+    for spread in (4, 16):
+        snapshots = render_glyphs(font_path, [36], [24], flags, workers=1,
+                                  properties=[("sdf", "spread", spread)])
+        widths[spread] = [s.width for _, s in snapshots][0]
+        # the calling thread renders with its own settings afterwards
+        assert freetype.get_property("sdf", "spread",
+                                     library=library) == default
+    assert widths[16] - widths[4] == 2 * (16 - 4)
+
+
+def test_render_glyphs_stops_early(monkeypatch):
+    import time
+    from freetype import parallel
+
+    def slow_render_chunk(task, faces):
+        time.sleep(0.02)
+        return [task[-1][0]]
+
+    monkeypatch.setattr(parallel, "_render_chunk", slow_render_chunk)
+    start = time.time()
+    # 400 chunks, about 4 seconds of work for 2 workers
+    for size, glyph_id in render_glyphs(font_path, range(400), [16],
+                                        workers=2, executor="thread",
+                                        chunk_size=1):
+        break
+    assert (size, glyph_id) == (16, 0)
+    assert time.time() - start < 1
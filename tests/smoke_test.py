@@ -55,3 +55,174 @@ def test_get_ft_face_properties():
     assert f.descender == -483
     assert f.num_glyphs == 268
     assert f.style_name == b"Roman"
+
+
+def test_load_ft_face_from_stream_and_mmap():
+    p = os.path.join(test_folder, "..", "examples", "Vera.ttf")
+    reference = freetype.Face(p)
+    reference.set_char_size(48 * 64)
+    reference.load_char("S")
+    expected = bytes(reference.glyph.bitmap.buffer)
+
+    with open(p, mode="rb") as f:
+        faces = [freetype.Face.from_stream(p),
+                 freetype.Face.from_stream(f),
+                 freetype.Face.from_mmap(p)]
+        for face in faces:
+            assert face.family_name == b"Bitstream Vera Sans"
+            face.set_char_size(48 * 64)
+            face.load_char("S")
+            assert bytes(face.glyph.bitmap.buffer) == expected
+        del faces, face
+        # a caller-provided stream is left open
+        assert not f.closed
+
+
+def test_shared_font_blobs():
+    import gc
+    import weakref
+
+    p = os.path.join(test_folder, "..", "examples", "Vera.ttf")
+    blob = freetype.FontBlob.open(p)
+    assert blob is freetype.FontBlob.open(p)
+    first = freetype.Face(blob)
+    second = freetype.Face(freetype.FontBlob.open(p))
+    assert first._filebodys[0] is second._filebodys[0]
+
+    shared = first.reference()
+    del first
+    gc.collect()
+    assert shared.family_name == b"Bitstream Vera Sans"
+
+    ref = weakref.ref(blob)
+    del blob, second, shared
+    gc.collect()
+    assert ref() is None
+
+
+def test_per_thread_libraries():
+    import threading
+
+    p = os.path.join(test_folder, "..", "examples", "Vera.ttf")
+    results = {}
+
+    def render(name):
+        library = freetype.get_thread_library()
+        assert library is freetype.get_thread_library()
+        face = freetype.Face(p, library=library)
+        face.set_char_size(48 * 64)
+        face.load_char("S")
+        freetype.Stroker(library=library)
+        results[name] = (library, bytes(face.glyph.bitmap.buffer))
+
+    threads = [threading.Thread(target=render, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(id(library) for library, _ in results.values())) == 4
+    assert len(set(buffer for _, buffer in results.values())) == 1
+
+
+def test_explicit_close():
+    p = os.path.join(test_folder, "..", "examples", "Vera.ttf")
+    with freetype.Face(p) as face:
+        face.set_char_size(48 * 64)
+        face.load_char("S", freetype.FT_LOAD_DEFAULT)
+        with face.glyph.get_glyph() as glyph:
+            assert glyph.format == freetype.FT_GLYPH_FORMAT_OUTLINE
+        assert glyph._FT_Glyph is None
+    assert face.closed
+    face.close()
+
+    with freetype.Library() as library:
+        face = freetype.Face(p, library=library)
+        other = face.reference()
+        size = face.new_size()
+        face.load_char("S")
+        glyph = face.glyph.get_glyph()
+        stroker = freetype.Stroker(library=library)
+        manager = freetype.CacheManager(library=library)
+        manager.register_face(p)
+    assert library.closed
+    assert face.closed and other.closed
+    assert glyph._FT_Glyph is None and stroker._FT_Stroker is None
+    del size, glyph
+
+    freetype.shutdown()
+    face = freetype.Face(p)
+    face.load_char("S")
+
+
+def test_raw_prototypes():
+    from freetype import raw
+
+    for function in (raw.FT_Get_Sfnt_Table, raw.FT_Outline_Get_CBox,
+                     raw.FT_Set_Pixel_Sizes):
+        assert function.argtypes is not None
+    # per-glyph functions skip argument conversion, but keep their restype
+    for function in (raw.FT_Load_Glyph, raw.FT_Get_Char_Index,
+                     raw.FT_Get_Kerning):
+        assert function.argtypes is None
+    assert raw.FT_Get_Char_Index.restype is freetype.FT_UInt
+    assert raw.FT_Get_CMap_Format.restype is freetype.FT_Long
+
+    p = os.path.join(test_folder, "..", "examples", "Vera.ttf")
+    face = freetype.Face(p)
+    face.set_char_size(48 * 64)
+    face.load_char("S", freetype.FT_LOAD_DEFAULT)
+    glyph = face.glyph.get_glyph()
+    # 0 is still accepted as a null origin
+    bitmap = glyph.to_bitmap(freetype.FT_RENDER_MODE_NORMAL, 0)
+    assert bitmap.bitmap.width > 0
+
+
+def test_lazy_import():
+    import subprocess
+    import sys
+
+    code = "\n".join([
+        "import sys, freetype",
+        "assert 'freetype.ft_enums.tt_ms_langids' not in sys.modules",
+        "assert freetype._library is None",
+        "assert freetype.TT_MS_LANGID_ENGLISH_UNITED_STATES == 0x0409",
+        "assert freetype.ft_enums.TT_PLATFORM_MICROSOFT == 3",
+        "namespace = {}",
+        "exec('from freetype import *', namespace)",
+        "assert 'TT_NAME_ID_FONT_FAMILY' in namespace",
+        "assert 'FT_LOAD_RENDER' in namespace and 'Face' in namespace",
+        "assert freetype.raw.TT_PLATFORM_MICROSOFT == 3",
+        "for module in ('freetype.ft_enums', 'freetype.raw'):",
+        "    namespace = {}",
+        "    exec('from %s import *' % module, namespace)",
+        "    assert namespace['TT_PLATFORM_MICROSOFT'] == 3",
+        "    assert namespace['TT_MS_LANGID_ENGLISH_UNITED_STATES'] == 0x0409",
+        "    assert 'FT_LOAD_RENDER' in namespace",
+        "assert 'FT_Load_Glyph' in namespace",
+    ])
+    subprocess.check_call([sys.executable, "-c", code])
+
+
+def test_library_finalizer():
+    import subprocess
+    import sys
+
+    p = os.path.join(test_folder, "..", "examples", "Vera.ttf")
+    code = "\n".join([
+        "import gc, os, sys, freetype",
+        "done = freetype.FT_Done_FreeType",
+        "def record(handle):",
+        "    os.write(1, b'exit ' if sys.is_finalizing() else b'gc ')",
+        "    return done(handle)",
+        "freetype.FT_Done_FreeType = record",
+        "library = freetype.Library()",
+        "del library",
+        "gc.collect()",
+        "kept = freetype.Library()",
+        "face = freetype.Face(%r, library=kept)" % p,
+        "face.load_char('S')",
+    ])
+    output = subprocess.check_output([sys.executable, "-c", code])
+    # collected libraries are destroyed, the ones left at exit are not
+    assert output == b"gc "
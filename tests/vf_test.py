@@ -90,3 +90,31 @@ def test_vf_set_named_instance():
         face.set_var_named_instance(inst.name)
         dcoords = face.get_var_design_coords()
         assert dcoords == inst.coords
+
+
+def test_vf_variation_info_is_cached():
+    ft_vt, ft_vs = _ft_ver()
+    if ft_vt < (2, 8, 1):
+        pytest.skip("Incomplete VF support in FreeType lib {} (need 2.8.1 or later)".format(ft_vs))
+        return
+
+    font_path = os.path.join(
+        test_folder,
+        "..",
+        "examples",
+        "SourceSansVariable-Roman.otf")
+
+    face = freetype.Face(font_path)
+    vsi = face.get_variation_info()
+    cached = face._variation_info
+    face.set_var_design_coords((373,))
+    assert face._variation_info is cached
+    assert face.get_var_design_coords() == (373,)
+
+    # callers get copies, changing them does not affect the face
+    default = vsi.axes[0].default
+    vsi.axes[0].default = vsi.axes[0].minimum = 0.0
+    vsi.axes = ()
+    assert face.get_variation_info().axes[0].default == default
+    face.set_var_design_coords(None, reset=True)
+    assert face.get_var_design_coords() == (default,)